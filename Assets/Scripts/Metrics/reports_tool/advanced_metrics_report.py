@@ -20,6 +20,7 @@ import sys
 import json
 import subprocess
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
 # Configurações centralizadas
@@ -29,9 +30,66 @@ CONFIG = {
     "meshopt_variant": "meshopt",
     "default_last_n": 20,
     "default_pdf_engine": "chrome",
-    "outlier_threshold": 2.0,  # Z-score para detecção de outliers
+    "outlier_threshold": 3.5,  # z-score modificado (MAD) para detecção de outliers
+    "outlier_iqr_k": 1.5,  # cercas de Tukey: q1 - k·IQR, q3 + k·IQR
+    "outlier_method": "mad",  # mad, iqr ou both (qualquer um dos dois)
+    "outlier_min_runs": 5,  # variantes com menos execuções não têm outliers marcados
+    # Frame time (fps_samples)
+    "frame_time_percentiles": (0.5, 0.95, 0.99, 0.999),
+    "stutter_factor": 2.0,  # frame com frame time > fator × mediana da execução conta como stutter
+    "frame_time_bins": 40,  # bins do histograma (o último acumula a cauda)
+    "stream_recent_rows": 200,  # linhas usadas nos gráficos do modo --stream --last-n 0
+    "bootstrap_samples": 2000,  # reamostragens do IC das diferenças (0 = só teste de Welch)
+    "confidence": 0.95,  # nível de confiança do IC e do teste de significância
+    "bootstrap_seed": 0,  # semente fixa: ICs reprodutíveis entre execuções
+    "bootstrap_max_rows": 5000,  # acima disso por variante, IC pela aproximação normal (método delta)
+    # Conselheiro de amostragem (--advise-runs)
+    "advice_file": "sample_size.json",
+    "advice_target_ci_pct": 5.0,  # meia-largura do IC da média, em % da média (0 = ignora)
+    "advice_target_mde_pct": 5.0,  # menor diferença vs base a detectar, em % (0 = ignora)
+    "advice_power": 0.8,  # poder do teste para detectar a diferença mínima
+    "advice_min_runs": 3,  # mínimo por variante antes de confiar na variância
+    "advice_max_runs": 200,  # teto do total recomendado por variante
 }
 
+# Métricas usadas nas comparações e nas estatísticas detalhadas
+COMPARISON_METRICS = ["load_ms", "mem_mb", "fps_avg"]
+LOWER_IS_BETTER = {"load_ms", "mem_mb", "file_mb"}  # nas demais (FPS), maior é melhor
+REGRESSION_METRICS = ["load_ms", "mem_mb", "fps_1pc_low"]
+STATS_METRICS = ["load_ms", "mem_mb", "fps_avg", "fps_min", "fps_max", "fps_median"]
+TREND_METRICS = ["fps_avg", "load_ms", "mem_mb"]
+
+# Gráficos de barras: (métrica, título no HTML, unidade, título no PNG, arquivo do PNG)
+BAR_CHARTS = [("load_ms", "Tempo de Carregamento", "ms", "Tempo de Carregamento", "bars_load"),
+              ("mem_mb", "Memória (média)", "MB", "Uso de Memória", "bars_mem"),
+              ("fps_avg", "FPS (média)", "FPS", "Performance FPS", "bars_fps")]
+
+# Estilo dos PNGs de preview (override sobre a mesma figura do HTML)
+PNG_LAYOUT = dict(plot_bgcolor='white', paper_bgcolor='white', font=dict(size=14),
+                  margin=dict(l=50, r=50, t=80, b=50))
+
+# Colunas que cada etapa do report lê dos CSVs; só a união delas é carregada
+STAGE_COLUMNS = {
+    "filter": ["timestamp", "variant"],
+    "comparisons": COMPARISON_METRICS,
+    "trends": ["timestamp", "model", "run_id", "test_number"] + TREND_METRICS,
+    "stats": STATS_METRICS,
+    "charts": ["timestamp", "load_ms", "mem_mb", "fps_avg", "fps_min", "fps_max"],
+    "frame_times": ["variant", "fps_samples"],
+}
+
+# Colunas do modo --check-regressions (o run_id separa o último run da baseline)
+REGRESSION_COLUMNS = ["timestamp", "run_id", "model", "variant"] + REGRESSION_METRICS
+
+
+def required_columns(stages=None, extra=()):
+    """União das colunas das etapas (todas por padrão) e de `extra`, sem repetição"""
+    columns = []
+    for col in [c for stage in (stages or STAGE_COLUMNS) for c in STAGE_COLUMNS[stage]] + list(extra):
+        if col not in columns:
+            columns.append(col)
+    return columns
+
 # Verificar dependências
 try:
     import pandas as pd
@@ -52,6 +110,19 @@ except ImportError as e:
     print("[py] Instale com: pip install plotly")
     sys.exit(1)
 
+from metrics_ingest import (FLOAT_COLUMNS, load_benchmark_csv, concat_frames, load_csvs_parallel, read_recent_rows,
+                            project_columns)
+from metrics_stream import StreamingAggregator, TailBuffer, stream_csvs
+from metrics_stats import (DEFAULT_PERCENTILES, grouped_summaries, grouped_outliers, percentile_key,
+                           compare_significance, summary_significance, runs_for_ci_width, runs_for_effect)
+from metrics_trends import grouped_trends, grouped_change_points
+from fps_samples import decode_fps_samples, fps_to_frame_ms
+from metrics_regression import (REGRESSION_CONFIG, parse_thresholds, check_regressions, write_verdict,
+                                print_verdict, missing_inputs, failed_inputs)
+from metrics_render import (ChartRenderer, FigureRegistry, scatter_class, display_indices, PLOTLYJS_MODES,
+                            plotlyjs_script, lazy_loader_script)
+from metrics_export import StaticExporter
+
 
 # =====================================================================
 # ESTRUTURAS DE DADOS
@@ -94,6 +165,24 @@ class VariantStats:
             self.p1 = float(data.quantile(0.01))
             self.p99 = float(data.quantile(0.99))
             self.count = len(data)
+        self.extra = {}  # percentis adicionais (--percentiles), quantil -> valor
+    
+    @classmethod
+    def from_summary(cls, summary, extra_percentiles=()):
+        """Cria a partir de um resumo já calculado (grouped_summaries ou modo --stream)"""
+        stats = cls([])
+        stats.mean = summary["mean"]
+        stats.median = summary["q0.5"]
+        stats.std = summary["std"]
+        stats.min = summary["min"]
+        stats.max = summary["max"]
+        stats.q25 = summary["q0.25"]
+        stats.q75 = summary["q0.75"]
+        stats.p1 = summary["q0.01"]
+        stats.p99 = summary["q0.99"]
+        stats.count = summary["count"]
+        stats.extra = {q: summary[percentile_key(q)] for q in extra_percentiles}
+        return stats
     
     def to_dict(self):
         return {
@@ -106,7 +195,8 @@ class VariantStats:
             "q75": self.q75,
             "p1": self.p1,
             "p99": self.p99,
-            "count": self.count
+            "count": self.count,
+            **{f"p{q * 100:g}": v for q, v in self.extra.items()}
         }
 
 
@@ -120,12 +210,55 @@ def parse_args():
     ap.add_argument("--out", required=True, help="Diretório de saída")
     ap.add_argument("--model", required=True, help="Nome do modelo")
     ap.add_argument("--variants", default=f"{CONFIG['base_variant']},{CONFIG['draco_variant']},{CONFIG['meshopt_variant']}")
-    ap.add_argument("--last-n", type=int, default=CONFIG["default_last_n"])
+    ap.add_argument("--last-n", type=int, default=CONFIG["default_last_n"],
+                    help="Execuções mais recentes (N × variantes); 0 = histórico completo")
     ap.add_argument("--html", action="store_true", help="Gerar HTML")
     ap.add_argument("--pdf", action="store_true", help="Gerar PDF")
     ap.add_argument("--pdf-engine", default=CONFIG["default_pdf_engine"])
     ap.add_argument("--pdf-engine-path", default="")
     ap.add_argument("--file-info", action="append", default=[], help="Informações de arquivos (variant:size:path)")
+    ap.add_argument("--no-cache", action="store_true", help="Ignora o cache colunar e refaz o parse dos CSVs")
+    ap.add_argument("--workers", type=int, default=0, help="Workers para carregar os CSVs em paralelo (0 = automático)")
+    ap.add_argument("--stream", action="store_true", help="Lê os CSVs em blocos com memória limitada (históricos muito grandes)")
+    ap.add_argument("--chunk-mb", type=float, default=None, help="Tamanho dos blocos no modo --stream (MB)")
+    ap.add_argument("--base-variant", default=CONFIG["base_variant"], help="Variante de referência nas comparações")
+    ap.add_argument("--compare-metrics", default=",".join(COMPARISON_METRICS),
+                    help="Métricas comparadas contra a base (ex.: load_ms,mem_mb,fps_avg,fps_1pc_low,file_mb)")
+    ap.add_argument("--percentiles", default="",
+                    help="Percentis adicionais nas estatísticas, em %% (ex.: 5,95,99.9)")
+    ap.add_argument("--bootstrap-samples", type=int, default=CONFIG["bootstrap_samples"],
+                    help="Reamostragens bootstrap do IC das diferenças (0 = só teste de Welch)")
+    ap.add_argument("--confidence", type=float, default=CONFIG["confidence"],
+                    help="Nível de confiança do IC e do teste de significância (ex.: 0.95)")
+    ap.add_argument("--advise-runs", action="store_true",
+                    help=f"Só estima quantas execuções faltam por variante e grava {CONFIG['advice_file']} (sem HTML)")
+    ap.add_argument("--target-ci-pct", type=float, default=CONFIG["advice_target_ci_pct"],
+                    help="--advise-runs: meia-largura alvo do IC da média, em %% da média (0 = ignora)")
+    ap.add_argument("--target-mde-pct", type=float, default=CONFIG["advice_target_mde_pct"],
+                    help="--advise-runs: menor diferença vs base a detectar, em %% (0 = ignora)")
+    ap.add_argument("--power", type=float, default=CONFIG["advice_power"],
+                    help="--advise-runs: poder do teste para a diferença mínima")
+    ap.add_argument("--check-regressions", action="store_true",
+                    help="Compara o último run_id de cada variante com a baseline e sai com código "
+                         f"{REGRESSION_CONFIG['exit_code']} se houver regressão (sem gráficos)")
+    ap.add_argument("--baseline-runs", type=int, default=REGRESSION_CONFIG["baseline_runs"],
+                    help="--check-regressions: run_ids anteriores que formam a baseline")
+    ap.add_argument("--regression-thresholds", default="",
+                    help="--check-regressions: piora máxima em %% (ex.: load_ms=10,mem_mb=5,fps_1pc_low=10)")
+    ap.add_argument("--exclude-outliers", action="store_true",
+                    help="Remove as execuções atípicas das estatísticas e comparações")
+    ap.add_argument("--outlier-method", choices=["mad", "iqr", "both"], default=CONFIG["outlier_method"],
+                    help="Critério de outlier: z-score modificado (mad), cercas IQR (iqr) ou qualquer um (both)")
+    ap.add_argument("--outlier-metrics", default=",".join(COMPARISON_METRICS),
+                    help="Métricas verificadas na detecção de outliers (separadas por vírgula)")
+    ap.add_argument("--render-workers", type=int, default=0,
+                    help="Processos que constroem e serializam os gráficos (0 = automático, 1 = sequencial)")
+    ap.add_argument("--plotlyjs", choices=PLOTLYJS_MODES, default="cdn",
+                    help="Origem do plotly.js: cdn, inline (embutido, offline) ou shared (cópia em cache na pasta acima de --out)")
+    ap.add_argument("--lazy-charts", action="store_true",
+                    help="Gráficos como JSON, criados só quando entram na tela (abre relatórios grandes mais rápido)")
+    ap.add_argument("--full-scan", action="store_true",
+                    help="Carrega o histórico inteiro mesmo com --last-n (desativa a leitura reversa)")
     return ap.parse_args()
 
 
@@ -133,25 +266,49 @@ def parse_args():
 # CARREGAMENTO E PROCESSAMENTO DE DADOS
 # =====================================================================
 
-def load_multiple_csvs(csv_paths):
-    """Carrega e combina múltiplos CSVs"""
+def load_multiple_csvs(csv_paths, use_cache=True, workers=0, columns=None):
+    """Carrega (em paralelo) e combina múltiplos CSVs, lendo só as colunas usadas"""
+    loader = partial(load_benchmark_csv, columns=columns or required_columns(), use_cache=use_cache)
+    loaded, failures = load_csvs_parallel(csv_paths, loader, workers=workers)
+    
     dfs = []
-    for path in csv_paths:
-        try:
-            df = pd.read_csv(path)
-            dfs.append(df)
-            print(f"[py] CSV carregado: {path} ({len(df)} linhas)")
-        except Exception as e:
-            print(f"[py] ⚠️ Erro ao carregar {path}: {e}")
+    for path, df in loaded:
+        dfs.append(df)
+        print(f"[py] CSV carregado: {path} ({len(df)} linhas)")
+    for path, e in failures:
+        print(f"[py] ⚠️ Erro ao carregar {path}: {e}")
     
     if not dfs:
         raise ValueError("Nenhum CSV foi carregado com sucesso")
     
-    combined_df = pd.concat(dfs, ignore_index=True)
+    combined_df = concat_frames(dfs)
     print(f"[py] Total de linhas combinadas: {len(combined_df)}")
     return combined_df
 
 
+def load_recent(csv_paths, variants, last_n, workers=0, columns=None):
+    """
+    Últimas last_n × variantes linhas das variantes pedidas (mesmo recorte do
+    df.tail do carregamento completo), lendo cada CSV de trás para frente
+    """
+    limit = last_n * len(variants)
+    columns = columns or required_columns()
+    loader = partial(read_recent_rows, last_n=limit,
+                     row_filter=lambda chunk: chunk[chunk['variant'].isin(variants)],
+                     columns=columns)
+    loaded, failures = load_csvs_parallel(csv_paths, loader, workers=workers)
+    for path, df in loaded:
+        print(f"[py] CSV lido do fim: {path} ({len(df)} linhas recentes)")
+    for path, e in failures:
+        print(f"[py] ⚠️ Erro ao carregar {path}: {e}")
+    
+    if not loaded:
+        raise ValueError("Nenhum CSV foi carregado com sucesso")
+    
+    df = concat_frames([df for _, df in loaded], project_columns(columns))
+    return df.tail(limit)
+
+
 def parse_file_info(file_info_list):
     """Parseia informações de arquivos do formato variant:size:path"""
     file_infos = []
@@ -173,94 +330,339 @@ def parse_file_info(file_info_list):
 # ANÁLISES COMPLEXAS
 # =====================================================================
 
-def compare_variants(df, variants, base_variant="original"):
-    """Compara variantes e calcula ganhos/perdas percentuais"""
+def compare_variants(df, variants, base_variant="original", metrics=None,
+                     n_boot=CONFIG["bootstrap_samples"], confidence=CONFIG["confidence"]):
+    """
+    Compara variantes e calcula ganhos/perdas percentuais (uma tabela de médias agrupada)
+
+    Cada comparação inclui o IC bootstrap de diff_pct e o p-valor do teste de Welch.
+    """
+    metrics = [m for m in (metrics or COMPARISON_METRICS) if m in df.columns]
+    scoped = df[df['variant'].isin(variants)]
+    means = scoped[metrics].astype(np.float64).groupby(scoped['variant'], observed=True).mean()
+    comparisons = compare_variant_means(means, variants, base_variant, metrics)
+    significance = compare_significance(scoped, 'variant', base_variant, variants, metrics,
+                                        n_boot=n_boot, confidence=confidence, seed=CONFIG["bootstrap_seed"],
+                                        max_bootstrap_rows=CONFIG["bootstrap_max_rows"])
+    return add_significance(comparisons, significance, confidence)
+
+
+def add_significance(comparisons, significance, confidence=CONFIG["confidence"]):
+    """
+    Anexa a incerteza às comparações: ci_low/ci_high (IC de diff_pct, em %),
+    p_value, significant (p < 1 - confidence), confidence, n_base e n
+    """
+    for (variant, metric), sig in significance.items():
+        comp = comparisons.get(f"{variant}_{metric}")
+        if comp is not None:
+            comp.update(sig, confidence=confidence)
+    return comparisons
+
+
+def compare_variant_means(means, variants, base_variant="original", metrics=None):
+    """
+    Calcula ganhos/perdas de todas as variantes × métricas contra a base
+
+    Args:
+        means: Tabela de médias (variante × métrica) ou dict {variante: {métrica: média}}
+        variants: Ordem das variantes na saída
+        base_variant: Variante de referência
+        metrics: Métricas a comparar (padrão: COMPARISON_METRICS)
+
+    Returns:
+        {"<variante>_<métrica>": {variant, metric, base, value, diff_abs, diff_pct, better}}
+    """
     comparisons = {}
-    metrics = ["load_ms", "mem_mb", "fps_avg"]
+    if isinstance(means, dict):
+        means = pd.DataFrame.from_dict(means, orient="index")
+    metrics = [m for m in (metrics or COMPARISON_METRICS) if m in means.columns]
     
-    # Calcula médias para a variante base
-    base_data = df[df['variant'] == base_variant]
-    if len(base_data) == 0:
+    # Médias da variante base
+    if base_variant not in means.index:
         print(f"[py] ⚠️ Variante base '{base_variant}' não encontrada")
         return comparisons
     
-    for metric in metrics:
-        base_value = base_data[metric].mean()
-        
-        for variant in variants:
-            if variant == base_variant:
-                continue
-            
-            variant_data = df[df['variant'] == variant]
-            if len(variant_data) == 0:
-                continue
-            
-            variant_value = variant_data[metric].mean()
-            diff_abs = variant_value - base_value
-            diff_pct = (diff_abs / base_value) * 100 if base_value != 0 else 0
-            
-            # Para load_ms e mem_mb, menor é melhor (negative diff é better)
-            # Para fps_avg, maior é melhor (positive diff é better)
-            better = diff_pct < 0 if metric in ["load_ms", "mem_mb"] else diff_pct > 0
-            
+    others = [v for v in variants if v != base_variant and v in means.index]
+    values = means.loc[others, metrics].to_numpy(dtype=np.float64)
+    base = means.loc[base_variant, metrics].to_numpy(dtype=np.float64)
+    diff_abs = values - base
+    with np.errstate(divide="ignore", invalid="ignore"):
+        diff_pct = np.where(base != 0, diff_abs / base * 100, 0.0)
+    # Menor é melhor (load_ms, mem_mb, file_mb): diferença negativa é melhora
+    lower = np.array([m in LOWER_IS_BETTER for m in metrics])
+    better = np.where(lower, diff_pct < 0, diff_pct > 0)
+    
+    for j, metric in enumerate(metrics):
+        for i, variant in enumerate(others):
             comparisons[f"{variant}_{metric}"] = {
                 "variant": variant,
                 "metric": metric,
-                "base": base_value,
-                "value": variant_value,
-                "diff_abs": diff_abs,
-                "diff_pct": diff_pct,
-                "better": int(better)  # Convert boolean to int for JSON serialization
+                "base": float(base[j]),
+                "value": float(values[i, j]),
+                "diff_abs": float(diff_abs[i, j]),
+                "diff_pct": float(diff_pct[i, j]),
+                "better": int(better[i, j])  # Convert boolean to int for JSON serialization
             }
     
     return comparisons
 
 
+def advise_sample_size(summaries, comparisons, variants, base_variant, metrics, target_ci_pct, target_mde_pct,
+                       confidence=CONFIG["confidence"], power=CONFIG["advice_power"]):
+    """
+    Estima quantas execuções ainda faltam em cada variante
+
+    Usa a variância atual de cada (variante, métrica) para dois alvos:
+    - IC da média com meia-largura de ±target_ci_pct% da média
+    - detectar uma diferença de target_mde_pct% contra a base; pares que já
+      são significativamente diferentes (comparisons[...]["significant"])
+      não pedem mais execuções
+
+    Args:
+        summaries: {variante: {métrica: {"count", "mean", "std", ...}}}
+        comparisons: Saída de compare_variants/compare_variant_means + add_significance
+
+    Returns:
+        {"done", "additional_runs", "variants": {variante: {"runs", "required_runs",
+        "additional_runs", "metrics": {métrica: {...}}}}}
+    """
+    present = [v for v in variants if v in summaries]
+    metrics = [m for m in metrics if all(m in summaries[v] for v in present)]
+    if not present or not metrics:
+        return {"done": False, "additional_runs": CONFIG["advice_min_runs"], "variants": {}}
+
+    def table(key):
+        return np.array([[summaries[v][m][key] for m in metrics] for v in present], dtype=np.float64)
+
+    runs, mean, std = table("count"), table("mean"), table("std")
+    min_runs, max_runs = CONFIG["advice_min_runs"], CONFIG["advice_max_runs"]
+
+    # Alvo 1: largura do IC de cada média
+    if target_ci_pct > 0:
+        for_ci = runs_for_ci_width(std, mean, target_ci_pct, confidence)
+    else:
+        for_ci = np.zeros_like(mean)
+
+    # Alvo 2: diferença mínima detectável de cada variante contra a base
+    for_mde = np.zeros_like(mean)
+    separated = np.zeros(mean.shape, dtype=bool)
+    if target_mde_pct > 0 and base_variant in present:
+        b = present.index(base_variant)
+        for_mde = runs_for_effect(std[b], std, mean[b], target_mde_pct, confidence, power)
+        separated = np.array([[bool(comparisons.get(f"{v}_{m}", {}).get("significant", 0)) for m in metrics]
+                              for v in present])
+        for_mde[separated] = 0
+        for_mde[b] = 0
+        # A base participa de todos os pares ainda não separados
+        for_mde[b] = np.nanmax(np.where(np.isnan(for_mde), max_runs, for_mde), axis=0)
+
+    # Variância desconhecida (< 2 execuções): pede o mínimo
+    required = np.fmax(for_ci, for_mde)
+    required = np.where(np.isnan(required), min_runs, required)
+    required = np.clip(required, min_runs, max_runs)
+    additional = np.maximum(required - runs, 0).astype(np.int64)
+    
+    advice = {}
+    for i, variant in enumerate(present):
+        per_metric = {}
+        for j, metric in enumerate(metrics):
+            per_metric[metric] = {
+                "runs": int(runs[i, j]),
+                "mean": float(mean[i, j]),
+                "std": float(std[i, j]),
+                "runs_for_ci": float(for_ci[i, j]),
+                "runs_for_mde": float(for_mde[i, j]),
+                "separated": int(separated[i, j]),
+                "required_runs": int(required[i, j]),
+                "additional_runs": int(additional[i, j]),
+            }
+        advice[variant] = {
+            "runs": int(runs[i].max()),
+            "required_runs": int(required[i].max()),
+            "additional_runs": int(additional[i].max()),
+            "capped": int(bool((required[i] >= max_runs).any())),
+            "metrics": per_metric,
+        }
+    missing = [v for v in variants if v not in summaries]
+    for variant in missing:
+        advice[variant] = {"runs": 0, "required_runs": min_runs, "additional_runs": min_runs,
+                           "capped": 0, "metrics": {}}
+    
+    total = max(a["additional_runs"] for a in advice.values())
+    return {"done": total == 0, "additional_runs": total, "variants": advice}
+
+
 def analyze_temporal_evolution(df):
-    """Analisa como as métricas evoluíram ao longo dos testes"""
-    df_sorted = df.sort_values('timestamp').copy()
+    """
+    Analisa como as métricas evoluíram ao longo dos testes
+
+    Para cada métrica: a tendência da série combinada (slope, improving,
+    first_value, last_value, total_change) e, em "groups", a tendência e os
+    pontos de mudança (run_id/timestamp onde a média mudou) de cada
+    (model, variant). Retas em forma fechada, todas as séries de uma vez.
+    """
+    group_cols = [c for c in ("model", "variant") if c in df.columns]
+    combined = grouped_trends(df, [], TREND_METRICS).get((), {})
+    per_group = grouped_trends(df, group_cols, TREND_METRICS)
+    change_points = grouped_change_points(df, group_cols, TREND_METRICS)
     trends = {}
     
-    for metric in ["fps_avg", "load_ms", "mem_mb"]:
-        if len(df_sorted) > 1:
-            x = np.arange(len(df_sorted))
-            y = df_sorted[metric].values
-            
-            # Calcula tendência linear
-            coeffs = np.polyfit(x, y, 1)
-            slope = coeffs[0]
-            
-            # Para load_ms e mem_mb, slope negativo é improving
-            # Para fps_avg, slope positivo é improving
-            improving = slope < 0 if metric in ["load_ms", "mem_mb"] else slope > 0
-            
-            trends[metric] = {
-                "slope": float(slope),
-                "improving": int(improving),  # Convert boolean to int for JSON serialization
-                "first_value": float(y[0]),
-                "last_value": float(y[-1]),
-                "total_change": float(y[-1] - y[0])
-            }
+    for metric in TREND_METRICS:
+        if metric not in combined:
+            continue
+        
+        # Para load_ms e mem_mb, slope negativo é improving
+        # Para fps_avg, slope positivo é improving
+        def improving(slope):
+            return int(slope < 0 if metric in LOWER_IS_BETTER else slope > 0)
+        
+        overall = combined[metric]
+        groups = []
+        for key, metrics in per_group.items():
+            if metric not in metrics:
+                continue
+            trend = metrics[metric]
+            groups.append({
+                **dict(zip(group_cols, key)),
+                **trend,
+                "improving": improving(trend["slope"]),
+                "change_points": change_points.get(key, {}).get(metric, []),
+            })
+        
+        trends[metric] = {
+            "slope": overall["slope"],
+            "improving": improving(overall["slope"]),  # Convert boolean to int for JSON serialization
+            "first_value": overall["first_value"],
+            "last_value": overall["last_value"],
+            "total_change": overall["total_change"],
+            "groups": groups,
+        }
     
     return trends
 
 
-def detect_outliers(df, metric, threshold=2.0):
-    """Detecta outliers usando z-score"""
-    if len(df) < 3:
-        return pd.DataFrame()
-    
-    mean = df[metric].mean()
-    std = df[metric].std()
-    
-    if std == 0:
-        return pd.DataFrame()
+def change_points_by_variant(trends, metric):
+    """
+    Pontos de mudança de uma métrica por série ({(model, variant): [pontos]})
+
+    Cada modelo tem a sua série: com um CSV de vários modelos, as mudanças de
+    um não sobrescrevem as de outro. Sem coluna model, a chave é (None, variante).
+    """
+    return {(g.get("model"), g["variant"]): g["change_points"] for g in trends.get(metric, {}).get("groups", [])
+            if g.get("change_points")}
+
+
+def detect_outliers(df, metrics=None, method=CONFIG["outlier_method"], threshold=CONFIG["outlier_threshold"],
+                    iqr_k=CONFIG["outlier_iqr_k"]):
+    """
+    Detecta execuções atípicas de todas as métricas e variantes em uma passada
+
+    Critérios robustos (grouped_outliers): z-score modificado pela MAD e/ou
+    cercas IQR, calculados dentro de cada (model, variant).
+
+    Returns:
+        (mask, outliers) - mask: array booleano por linha de df (atípica em
+        alguma métrica); outliers: registros {variant, run_id, test_number,
+        timestamp, metric, value, median, score, rule}
+    """
+    metrics = list(metrics or COMPARISON_METRICS)
+    absent = [m for m in metrics if m not in df.columns]
+    if absent and not df.empty:
+        print(f"[py] ⚠️ Outliers: métricas ausentes nos dados, não verificadas: {', '.join(absent)}")
+    metrics = [m for m in metrics if m in df.columns]
+    flags = grouped_outliers(df, ["model", "variant"], metrics, mad_threshold=threshold, iqr_k=iqr_k,
+                             min_count=CONFIG["outlier_min_runs"])
+    if method == "mad":
+        flagged = flags["mad"]
+    elif method == "iqr":
+        flagged = flags["iqr"]
+    else:
+        flagged = flags["mad"] | flags["iqr"]
+    
+    outliers = []
+    for i, j in zip(*np.nonzero(flagged)):
+        row = df.iloc[i]
+        rule = "+".join(r for r in ("mad", "iqr") if flags[r][i, j])
+        outliers.append({
+            "variant": str(row["variant"]),
+            "run_id": str(row["run_id"]) if "run_id" in df.columns else None,
+            "test_number": int(row["test_number"]) if "test_number" in df.columns and pd.notna(row["test_number"]) else None,
+            "timestamp": str(row["timestamp"]),
+            "metric": metrics[j],
+            "value": float(row[metrics[j]]),
+            "median": float(flags["median"][i, j]),
+            "score": float(flags["score"][i, j]),
+            "rule": rule,
+        })
+    
+    return flagged.any(axis=1), outliers
+
+
+def analyze_frame_times(df, variants):
+    """
+    Frame time a partir de fps_samples (um valor 1/dt por frame) de todas as
+    execuções em lote
+
+    As amostras de todas as execuções de cada variante são reunidas, então os
+    percentis (e os 1%/0.1% lows) vêm dos frames reais, não de um único índice
+    do array ordenado de cada execução. Stutter: frames com frame time acima
+    de stutter_factor × a mediana da própria execução.
+
+    Returns:
+        {"percentiles", "stutter_factor", "variants": {variante: {"runs",
+        "frames", "frame_ms_p<q>", "fps_1pc_low", "fps_0.1pc_low",
+        "stutter_frames", "stutter_pct"}}, "histogram": {"edges", "counts"}}
+        ou {} sem amostras
+    """
+    if df.empty or "fps_samples" not in df.columns:
+        return {}
+    scoped = df[df['variant'].isin(variants)]
+    codes = pd.Categorical(scoped['variant'].astype(str), categories=variants).codes.astype(np.int64)
+    qs = np.asarray(CONFIG["frame_time_percentiles"], dtype=np.float64)
     
-    z_scores = (df[metric] - mean) / std
-    outliers = df[abs(z_scores) > threshold].copy()
-    outliers['z_score'] = z_scores[outliers.index]
+    frame_ms = decode_fps_samples(scoped['fps_samples']).map(fps_to_frame_ms).dropna()
+    if frame_ms.counts.sum() == 0:
+        return {}
     
-    return outliers
+    # Stutter por execução (mediana da própria execução), somado por variante
+    run_median = frame_ms.quantiles([0.5])[:, 0]
+    stutter = frame_ms.count_above(CONFIG["stutter_factor"] * run_median)
+    stutter_by_variant = np.bincount(codes, weights=stutter, minlength=len(variants))
+    runs_by_variant = np.bincount(codes, weights=frame_ms.counts > 0, minlength=len(variants))
+    
+    # Todos os frames de cada variante juntos
+    pooled = frame_ms.regroup(codes, len(variants))
+    quantiles = pooled.quantiles(qs)
+    lows = 1000.0 / pooled.quantiles([0.99, 0.999])  # 1% e 0.1% frames mais lentos, em FPS
+    
+    # Bordas comuns a todas as variantes; a cauda além de 1.25 × o maior p99.9 vai para o último bin
+    upper = 1000.0 / np.nanmin(lows[:, 1]) * 1.25
+    edges = np.linspace(0.0, upper, CONFIG["frame_time_bins"] + 1)
+    histogram = pooled.histogram(edges)
+    
+    result = {}
+    for i, variant in enumerate(variants):
+        frames = int(pooled.counts[i])
+        if frames == 0:
+            continue
+        stats = {"runs": int(runs_by_variant[i]), "frames": frames}
+        for q, v in zip(qs.tolist(), quantiles[i].tolist()):
+            stats[f"frame_ms_p{q * 100:g}"] = float(v)
+        stats["fps_1pc_low"] = float(lows[i, 0])
+        stats["fps_0.1pc_low"] = float(lows[i, 1])
+        stats["stutter_frames"] = int(stutter_by_variant[i])
+        stats["stutter_pct"] = float(stutter_by_variant[i] / frames * 100.0)
+        result[variant] = stats
+    
+    return {
+        "percentiles": qs.tolist(),
+        "stutter_factor": CONFIG["stutter_factor"],
+        "variants": result,
+        "histogram": {
+            "edges": edges.tolist(),
+            "counts": {v: histogram[i].tolist() for i, v in enumerate(variants) if v in result},
+        },
+    }
 
 
 def calculate_compression_ratios(file_infos):
@@ -287,41 +689,97 @@ def calculate_compression_ratios(file_infos):
     return ratios
 
 
-def calculate_all_stats(df, variants):
-    """Calcula estatísticas para todas as variantes e métricas"""
-    all_stats = {}
-    metrics = ["load_ms", "mem_mb", "fps_avg", "fps_min", "fps_max", "fps_median"]
+def calculate_all_stats(df, variants, extra_percentiles=()):
+    """
+    Calcula estatísticas para todas as variantes e métricas
+
+    Uma única passada agrupada (grouped_summaries): cada grupo é ordenado uma
+    vez e todos os percentis, inclusive os extras, saem do array ordenado.
+    """
+    percentiles = tuple(DEFAULT_PERCENTILES) + tuple(extra_percentiles)
+    summaries = grouped_summaries(df[df['variant'].isin(variants)], 'variant', STATS_METRICS, percentiles)
     
+    all_stats = {}
     for variant in variants:
-        variant_data = df[df['variant'] == variant]
-        if len(variant_data) == 0:
+        if variant not in summaries:
             continue
-        
-        all_stats[variant] = {}
-        for metric in metrics:
-            if metric in variant_data.columns:
-                all_stats[variant][metric] = VariantStats(variant_data[metric])
+        all_stats[variant] = {metric: VariantStats.from_summary(summary, extra_percentiles)
+                              for metric, summary in summaries[variant].items()}
     
     return all_stats
 
 
+def stream_analysis(csv_paths, variants, last_n, chunk_mb=None, extra_percentiles=(), compare_metrics=None,
+                    columns=None):
+    """
+    Modo --stream: lê os CSVs em blocos sem carregar o histórico inteiro
+
+    - last_n > 0: mantém só as últimas last_n × variantes linhas (mesmo recorte
+      do modo normal); todas as análises seguem iguais
+    - last_n <= 0: estatísticas e comparações do histórico completo vêm de
+      acumuladores mescláveis (quantis aproximados, erro relativo <= 0.5%);
+      os gráficos usam as execuções mais recentes
+
+    Returns:
+        (df, all_stats, summaries) - all_stats/summaries são None quando devem
+        ser calculados a partir de df; summaries traz o resumo das métricas de
+        comparação por variante ({variante: {métrica: resumo}})
+    """
+    compare_metrics = compare_metrics or COMPARISON_METRICS
+    
+    def row_filter(chunk):
+        return chunk[chunk['variant'].isin(variants)]
+    
+    if last_n > 0:
+        tail = TailBuffer(last_n * len(variants))
+        aggregator = None
+    else:
+        tail = TailBuffer(CONFIG["stream_recent_rows"])
+        aggregator = StreamingAggregator(["variant"], sorted(set(STATS_METRICS) | set(compare_metrics)))
+    
+    consumers = [tail] + ([aggregator] if aggregator is not None else [])
+    total, failures = stream_csvs(csv_paths, consumers, row_filter=row_filter, chunk_mb=chunk_mb,
+                                  columns=columns or required_columns(extra=compare_metrics))
+    for path, e in failures:
+        print(f"[py] ⚠️ Erro ao carregar {path}: {e}")
+    print(f"[py] Linhas lidas em streaming: {total}")
+    
+    if aggregator is None:
+        return tail.result(), None, None
+    
+    percentiles = tuple(DEFAULT_PERCENTILES) + tuple(extra_percentiles)
+    summaries = {key[0]: accs for key, accs in aggregator.summaries(percentiles).items()}
+    all_stats, compare_summaries = {}, {}
+    for variant in variants:
+        if variant not in summaries:
+            continue
+        all_stats[variant] = {m: VariantStats.from_summary(summaries[variant][m], extra_percentiles)
+                              for m in STATS_METRICS if m in summaries[variant]}
+        compare_summaries[variant] = {m: summaries[variant][m] for m in compare_metrics if m in summaries[variant]}
+    return tail.result(), all_stats, compare_summaries
+
+
 # =====================================================================
 # VISUALIZAÇÕES
 # =====================================================================
 
-def create_bar_chart(df, variants, metric, title, unit, color_map):
-    """Cria gráfico de barras comparativo melhorado"""
+def variant_means(df, variants, metrics):
+    """Média e desvio de cada (variante, métrica) num groupby só; colunas (métrica, "mean"/"std")"""
+    metrics = [m for m in metrics if m in df.columns]
+    rows = df[df['variant'].isin(variants)]
+    return rows.groupby('variant', observed=True)[metrics].agg(['mean', 'std'])
+
+
+def create_bar_chart(means, variants, metric, title, unit, color_map):
+    """Cria gráfico de barras comparativo melhorado (a partir de variant_means)"""
     values = []
     colors = []
     errors = []
     
     for variant in variants:
-        variant_data = df[df['variant'] == variant]
-        if len(variant_data) > 0:
-            mean_val = variant_data[metric].mean()
-            std_val = variant_data[metric].std()
-            values.append(mean_val)
-            errors.append(std_val)
+        if variant in means.index and metric in means.columns.get_level_values(0):
+            values.append(means.at[variant, (metric, 'mean')])
+            errors.append(means.at[variant, (metric, 'std')])
             colors.append(color_map.get(variant, '#999'))
         else:
             values.append(0)
@@ -397,7 +855,7 @@ def create_scatter_plot(df, variants, x_metric, y_metric, title, color_map):
     for variant in variants:
         variant_data = df[df['variant'] == variant]
         if len(variant_data) > 0:
-            fig.add_trace(go.Scatter(
+            fig.add_trace(scatter_class(len(variant_data))(
                 x=variant_data[x_metric],
                 y=variant_data[y_metric],
                 mode='markers',
@@ -408,11 +866,11 @@ def create_scatter_plot(df, variants, x_metric, y_metric, title, color_map):
                     opacity=0.7,
                     line=dict(width=2, color='white')
                 ),
-                text=[f"Teste {i+1}" for i in range(len(variant_data))],
+                customdata=np.arange(1, len(variant_data) + 1),
                 hovertemplate=f"<b>{variant}</b><br>" +
                             f"{x_metric}: %{{x}}<br>" +
                             f"{y_metric}: %{{y}}<br>" +
-                            "Teste: %{text}<extra></extra>"
+                            "Teste: %{customdata}<extra></extra>"
             ))
     
     fig.update_layout(
@@ -458,26 +916,55 @@ def create_heatmap(df, metrics):
     return fig
 
 
-def create_timeline_chart(df, variants, metric, title, unit, color_map):
-    """Cria gráfico melhorado de evolução temporal"""
-    df_sorted = df.sort_values('timestamp').copy()
+def create_timeline_chart(df, variants, metric, title, unit, color_map, change_points=None):
+    """Cria gráfico melhorado de evolução temporal, com os pontos de mudança marcados"""
+    df_sorted = df.sort_values('timestamp', kind='stable').copy()
+    change_points = change_points or {}
     fig = go.Figure()
     
     for variant in variants:
         variant_data = df_sorted[df_sorted['variant'] == variant]
         if len(variant_data) > 0:
-            fig.add_trace(go.Scatter(
-                x=variant_data['timestamp'],
-                y=variant_data[metric],
+            # Série exibida reduzida por LTTB (picos preservados); o número do teste é o da série completa
+            shown = display_indices(variant_data['timestamp'], variant_data[metric])
+            fig.add_trace(scatter_class(len(shown))(
+                x=variant_data['timestamp'].iloc[shown],
+                y=variant_data[metric].iloc[shown],
                 mode='lines+markers',
                 name=variant,
                 line=dict(color=color_map.get(variant, '#999'), width=3),
                 marker=dict(size=8, color=color_map.get(variant, '#999')),
-                text=[f"Teste {i+1}" for i in range(len(variant_data))],
+                customdata=shown + 1,
                 hovertemplate=f"<b>{variant}</b><br>" +
                             f"Timestamp: %{{x}}<br>" +
                             f"{metric}: %{{y}}<br>" +
-                            "Teste: %{text}<extra></extra>"
+                            "Teste: %{customdata}<extra></extra>"
+            ))
+        
+        # Primeira execução depois de cada mudança de média; os índices são
+        # da série (model, variant) em que a mudança foi detectada
+        series_keys = [key for key in change_points if key[1] == variant]
+        for model, _ in series_keys:
+            series = variant_data
+            if model is not None and 'model' in variant_data.columns:
+                series = variant_data[variant_data['model'] == model]
+            points = [p for p in change_points[(model, variant)] if p["index"] < len(series)]
+            if not points:
+                continue
+            label = f"{variant} ({model})" if model is not None and len(series_keys) > 1 else variant
+            rows = series.iloc[[p["index"] for p in points]]
+            fig.add_trace(go.Scatter(
+                x=rows['timestamp'],
+                y=rows[metric],
+                mode='markers',
+                name=f"{label}: mudança",
+                marker=dict(size=18, symbol='diamond-open', color=color_map.get(variant, '#999'),
+                            line=dict(width=3)),
+                text=[f"run {p.get('run_id')}: {p['before']:.1f} → {p['after']:.1f} ({p['shift_pct']:+.1f}%)"
+                      for p in points],
+                hovertemplate=f"<b>{label} - mudança</b><br>" +
+                            "Timestamp: %{x}<br>" +
+                            "%{text}<extra></extra>"
             ))
     
     fig.update_layout(
@@ -494,6 +981,41 @@ def create_timeline_chart(df, variants, metric, title, unit, color_map):
     return fig
 
 
+def create_frame_time_histogram(frame_times, color_map):
+    """Histograma de frame time por variante (% dos frames de cada uma)"""
+    edges = np.asarray(frame_times["histogram"]["edges"])
+    centers = (edges[:-1] + edges[1:]) / 2
+    fig = go.Figure()
+    
+    for variant, counts in frame_times["histogram"]["counts"].items():
+        counts = np.asarray(counts, dtype=np.float64)
+        fig.add_trace(go.Bar(
+            x=centers,
+            y=counts / counts.sum() * 100.0,
+            name=variant,
+            marker_color=color_map.get(variant, '#999'),
+            opacity=0.6,
+            hovertemplate=f"<b>{variant}</b><br>" +
+                        "Frame time: %{x:.1f} ms<br>" +
+                        "Frames: %{y:.1f}%<extra></extra>"
+        ))
+    
+    fig.update_layout(
+        title=dict(text="Distribuição de Frame Time", font=dict(size=16, color='#2c3e50')),
+        xaxis=dict(title=dict(text="Frame time (ms)", font=dict(size=14))),
+        yaxis=dict(title=dict(text="% dos frames", font=dict(size=14))),
+        barmode='overlay',
+        bargap=0.05,
+        template='plotly_white',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=50, r=50, t=60, b=50),
+        height=400
+    )
+    
+    return fig
+
+
 def create_file_size_chart(file_infos, color_map):
     """Cria gráfico melhorado de tamanho de arquivos"""
     variants = [f.variant for f in file_infos]
@@ -567,7 +1089,7 @@ def create_executive_summary(model, df, variants, comparisons, file_infos):
     return create_html_section("Resumo Executivo", content)
 
 
-def create_performance_comparison_table(comparisons):
+def create_performance_comparison_table(comparisons, base_variant="original"):
     """Cria tabela organizada de comparação de performance"""
     if not comparisons:
         return ""
@@ -576,10 +1098,30 @@ def create_performance_comparison_table(comparisons):
     fps_comparisons = {k: v for k, v in comparisons.items() if 'fps' in v['metric']}
     load_comparisons = {k: v for k, v in comparisons.items() if 'load' in v['metric']}
     mem_comparisons = {k: v for k, v in comparisons.items() if 'mem' in v['metric']}
+    other_comparisons = {k: v for k, v in comparisons.items()
+                         if k not in fps_comparisons and k not in load_comparisons and k not in mem_comparisons}
+    
+    confidence = next((c['confidence'] for c in comparisons.values() if 'confidence' in c), CONFIG["confidence"])
+    confidence_label = f"{confidence * 100:g}%"
+    
+    def format_significance(comp):
+        """Células do IC de diff_pct e do p-valor (Welch)"""
+        if 'p_value' not in comp:
+            return "<td>-</td><td>-</td>"
+        ci = (f"[{comp['ci_low']:+.1f}%, {comp['ci_high']:+.1f}%]"
+              if not np.isnan(comp['ci_low']) else "-")
+        if np.isnan(comp['p_value']):
+            verdict = "<small>(amostras insuficientes)</small>"
+        elif comp['significant']:
+            verdict = f"p = {comp['p_value']:.3g} <small>(significativa)</small>"
+        else:
+            verdict = f"p = {comp['p_value']:.3g} <small>(inconclusiva)</small>"
+        return f"<td>{ci}</td><td>{verdict}</td>"
     
     def create_metric_table(comparisons_dict, title, icon):
         if not comparisons_dict:
             return ""
+        show_metric = len({c['metric'] for c in comparisons_dict.values()}) > 1
         
         rows = []
         for key, comp in comparisons_dict.items():
@@ -587,15 +1129,17 @@ def create_performance_comparison_table(comparisons):
             color = "#28a745" if comp['better'] else "#dc3545"
             improvement = "Melhora" if comp['better'] else "Piora"
             
+            metric_label = f"<small>{comp['metric']}</small>" if show_metric else ""
             rows.append(f"""
             <tr>
-                <td><span class="variant-badge variant-{comp['variant']}">{comp['variant']}</span></td>
+                <td><span class="variant-badge variant-{comp['variant']}">{comp['variant']}</span> {metric_label}</td>
                 <td>{comp['base']:.1f}</td>
                 <td>{comp['value']:.1f}</td>
                 <td style="color: {color}; font-weight: bold;">
                     <span class="arrow">{arrow}</span> {comp['diff_pct']:.1f}%
                     <small>({improvement})</small>
                 </td>
+                {format_significance(comp)}
             </tr>
             """)
         
@@ -606,9 +1150,11 @@ def create_performance_comparison_table(comparisons):
                 <thead>
                     <tr>
                         <th>Variante</th>
-                        <th>Original</th>
+                        <th>{base_variant.title()}</th>
                         <th>Valor</th>
                         <th>Diferença</th>
+                        <th>IC {confidence_label}</th>
+                        <th>Significância</th>
                     </tr>
                 </thead>
                 <tbody>
@@ -621,18 +1167,151 @@ def create_performance_comparison_table(comparisons):
     fps_table = create_metric_table(fps_comparisons, "Performance FPS", "🎯")
     load_table = create_metric_table(load_comparisons, "Tempo de Carregamento", "⏱️")
     mem_table = create_metric_table(mem_comparisons, "Uso de Memória", "💾")
+    other_table = create_metric_table(other_comparisons, "Outras Métricas", "📦")
     
     combined_tables = f"""
     <div class="comparison-grid">
         {fps_table}
         {load_table}
         {mem_table}
+        {other_table}
     </div>
     """
     
     return create_html_section("📊 Comparação de Performance", combined_tables)
 
 
+def create_change_points_table(trends):
+    """Tabela das mudanças de média detectadas (quando load_ms/FPS mudaram)"""
+    rows = []
+    for metric in TREND_METRICS:
+        for group in trends.get(metric, {}).get("groups", []):
+            for p in group["change_points"]:
+                worse = p["shift"] > 0 if metric in LOWER_IS_BETTER else p["shift"] < 0
+                color = "#dc3545" if worse else "#28a745"
+                rows.append(f"""
+                <tr>
+                    <td><span class="variant-badge variant-{group.get('variant', '')}">{group.get('variant', '')}</span></td>
+                    <td>{metric}</td>
+                    <td>{p.get('run_id', '-')}</td>
+                    <td>{p.get('timestamp', '-')}</td>
+                    <td>{p['before']:.1f} → {p['after']:.1f}</td>
+                    <td style="color: {color}; font-weight: bold;">{p['shift_pct']:+.1f}%</td>
+                </tr>
+                """)
+    if not rows:
+        return "<p>Nenhuma mudança de média detectada nas execuções analisadas.</p>"
+    return f"""
+    <div class="metric-table">
+        <h3>📍 Pontos de Mudança</h3>
+        <table class="comparison-table">
+            <thead>
+                <tr>
+                    <th>Variante</th>
+                    <th>Métrica</th>
+                    <th>Run</th>
+                    <th>Timestamp</th>
+                    <th>Média antes → depois</th>
+                    <th>Mudança</th>
+                </tr>
+            </thead>
+            <tbody>
+                {''.join(rows)}
+            </tbody>
+        </table>
+    </div>
+    """
+
+
+def create_frame_time_table(frame_times):
+    """Tabela de percentis de frame time, lows e stutter por variante"""
+    percentile_keys = [f"frame_ms_p{q * 100:g}" for q in frame_times["percentiles"]]
+    rows = []
+    for variant, stats in frame_times["variants"].items():
+        cells = "".join(f"<td>{stats[k]:.2f}</td>" for k in percentile_keys)
+        rows.append(f"""
+        <tr>
+            <td><span class="variant-badge variant-{variant}">{variant}</span></td>
+            <td>{stats['frames']} <small>({stats['runs']} execuções)</small></td>
+            {cells}
+            <td>{stats['fps_1pc_low']:.1f}</td>
+            <td>{stats['fps_0.1pc_low']:.1f}</td>
+            <td>{stats['stutter_frames']} <small>({stats['stutter_pct']:.1f}%)</small></td>
+        </tr>
+        """)
+    
+    headers = "".join(f"<th>p{q * 100:g} (ms)</th>" for q in frame_times["percentiles"])
+    return f"""
+    <div class="metric-table">
+        <h3>🎞️ Frame Time por Variante</h3>
+        <table class="comparison-table">
+            <thead>
+                <tr>
+                    <th>Variante</th>
+                    <th>Frames</th>
+                    {headers}
+                    <th>1% low (FPS)</th>
+                    <th>0.1% low (FPS)</th>
+                    <th>Stutter (&gt; {frame_times['stutter_factor']:g}× mediana)</th>
+                </tr>
+            </thead>
+            <tbody>
+                {''.join(rows)}
+            </tbody>
+        </table>
+    </div>
+    """
+
+
+def create_outliers_section(outliers, excluded, method):
+    """Lista as execuções atípicas (e se foram excluídas das estatísticas)"""
+    if not outliers:
+        return ""
+    
+    rows = []
+    for o in outliers:
+        rows.append(f"""
+        <tr>
+            <td><span class="variant-badge variant-{o['variant']}">{o['variant']}</span></td>
+            <td>{o['run_id'] or '-'}</td>
+            <td>{o['test_number'] if o['test_number'] is not None else '-'}</td>
+            <td>{o['timestamp']}</td>
+            <td>{o['metric']}</td>
+            <td>{o['value']:.2f}</td>
+            <td>{o['median']:.2f}</td>
+            <td>{o['score']:+.1f} <small>({o['rule']})</small></td>
+        </tr>
+        """)
+    
+    runs = len({(o['variant'], o['run_id'], o['test_number'], o['timestamp']) for o in outliers})
+    status = ("removidas das estatísticas e comparações" if excluded
+              else "mantidas nas estatísticas (use --exclude-outliers para removê-las)")
+    content = f"""
+    <p>{runs} execução(ões) atípica(s) pelo critério <b>{method}</b>, {status}.</p>
+    <div class="metric-table">
+        <table class="comparison-table">
+            <thead>
+                <tr>
+                    <th>Variante</th>
+                    <th>Run</th>
+                    <th>Teste</th>
+                    <th>Timestamp</th>
+                    <th>Métrica</th>
+                    <th>Valor</th>
+                    <th>Mediana</th>
+                    <th>Z modificado</th>
+                </tr>
+            </thead>
+            <tbody>
+                {''.join(rows)}
+            </tbody>
+        </table>
+    </div>
+    """
+    title = "🚫 Execuções Excluídas (Outliers)" if excluded else "⚠️ Execuções Atípicas (Outliers)"
+    return create_html_section(title, content)
+
+
 def create_detailed_stats_tables(all_stats):
     """Cria tabelas detalhadas de estatísticas organizadas por variante"""
     if not all_stats:
@@ -752,8 +1431,8 @@ def create_file_info_section(file_infos, compression_ratios):
     return create_html_section("📁 Informações dos Arquivos", table)
 
 
-def build_html(model, sections):
-    """Constrói HTML completo"""
+def build_html(model, sections, plotlyjs="", lazy=False):
+    """Constrói HTML completo (plotlyjs: <script> do plotly.js; lazy: inclui o carregador dos gráficos)"""
     
     html = f"""
 <!DOCTYPE html>
@@ -1039,7 +1718,7 @@ def build_html(model, sections):
             }}
         }}
     </style>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    {plotlyjs}
 </head>
 <body>
     <div class="container">
@@ -1054,6 +1733,7 @@ def build_html(model, sections):
             </div>
         </div>
     </div>
+    {lazy_loader_script() if lazy else ""}
 </body>
 </html>
 """
@@ -1065,6 +1745,89 @@ def build_html(model, sections):
 # MAIN
 # =====================================================================
 
+def regression_changes(latest, baseline, metrics):
+    """
+    Médias do último run e da baseline de cada (model, variant), comparadas
+    com compare_variant_means (a baseline faz o papel da variante base)
+    """
+    frame = concat_frames([latest.assign(window="latest"), baseline.assign(window="baseline")])
+    rows = []
+    for (model, variant), group in frame.groupby(["model", "variant"], observed=True):
+        means = group[metrics].astype(np.float64).groupby(group["window"]).mean()
+        if "baseline" not in means.index or "latest" not in means.index:
+            continue
+        for comp in compare_variant_means(means, ["baseline", "latest"], "baseline", metrics).values():
+            rows.append({"model": str(model), "variant": str(variant), "metric": comp["metric"],
+                         "baseline": comp["base"], "latest": comp["value"]})
+    return pd.DataFrame(rows, columns=["model", "variant", "metric", "baseline", "latest"])
+
+
+def run_regression_check(args, variants):
+    """
+    Modo --check-regressions: sem gráficos nem HTML
+
+    Lê o histórico do modelo (só as colunas necessárias), compara o último
+    run_id de cada variante com os --baseline-runs anteriores e grava o
+    veredito em --out, ao lado do data.json. Retorna o código de saída.
+    """
+    thresholds = parse_thresholds(args.regression_thresholds)
+    if missing_inputs(args.csv_files):
+        return 1
+    columns = REGRESSION_COLUMNS + [m for m in thresholds if m not in REGRESSION_COLUMNS]
+    loader = partial(load_benchmark_csv, columns=columns, use_cache=not args.no_cache)
+    loaded, failures = load_csvs_parallel(args.csv_files, loader, workers=args.workers)
+    if failed_inputs(failures):
+        return 1
+    df = concat_frames([df for _, df in loaded], project_columns(columns))
+    if not df.empty:
+        df = df[df['variant'].isin(variants)]
+    if df.empty:
+        print("[py] ❌ Nenhum dado para verificar regressões")
+        return 1
+    
+    if "model" not in df.columns:
+        df = df.assign(model=args.model)
+    df = df.assign(model=df["model"].astype(str), variant=df["variant"].astype(str))
+    verdict = check_regressions(df, ["model", "variant"], list(thresholds), regression_changes, thresholds,
+                                LOWER_IS_BETTER, args.baseline_runs)
+    verdict["model"] = args.model
+    print_verdict(verdict, write_verdict(args.out, verdict))
+    return verdict["exit_code"]
+
+
+def write_sample_size_advice(args, df, variants, base_variant, metrics, comparisons, summaries=None):
+    """Modo --advise-runs: grava o JSON lido pelo loop de benchmark e encerra"""
+    if summaries is None:
+        summaries = grouped_summaries(df[df['variant'].isin(variants)], 'variant', metrics, percentiles=())
+    advice = advise_sample_size(summaries, comparisons, variants, base_variant, metrics,
+                                args.target_ci_pct, args.target_mde_pct, args.confidence, args.power)
+    advice = {
+        "model": args.model,
+        "timestamp": datetime.now().isoformat(),
+        "base_variant": base_variant,
+        "metrics": metrics,
+        "confidence": args.confidence,
+        "power": args.power,
+        "target_ci_pct": args.target_ci_pct,
+        "target_mde_pct": args.target_mde_pct,
+        **advice,
+    }
+    
+    path = os.path.join(args.out, CONFIG["advice_file"])
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(advice, f, indent=2)
+    
+    for variant, info in advice["variants"].items():
+        print(f"[py] {variant}: {info['runs']} execuções, faltam {info['additional_runs']}"
+              + (" (teto atingido)" if info["capped"] else ""))
+    if advice["done"]:
+        print("[py] ✓ Amostra suficiente: nenhuma execução adicional necessária")
+    else:
+        print(f"[py] ⚠️ Recomendado: mais {advice['additional_runs']} execuções por variante")
+    print(f"[py] JSON gerado: {path}")
+    return 0
+
+
 def main():
     print("[py] ========================================")
     print("[py] ADVANCED METRICS REPORT GENERATOR")
@@ -1082,25 +1845,77 @@ def main():
     
     os.makedirs(args.out, exist_ok=True)
     
-    # Carregar dados
-    df = load_multiple_csvs(args.csv_files)
     variants = [v.strip().lower() for v in args.variants.split(",") if v.strip()]
-    
-    # Filtrar dados
-    df = df[df['variant'].isin(variants)]
-    df = df.tail(args.last_n * len(variants)) if args.last_n > 0 else df
+    extra_percentiles = [float(p) / 100.0 for p in args.percentiles.split(",") if p.strip()]
+    base_variant = args.base_variant.strip().lower()
+    compare_metrics = [m.strip() for m in args.compare_metrics.split(",") if m.strip()]
+    outlier_metrics = [m.strip() for m in args.outlier_metrics.split(",") if m.strip()]
+    unknown = [m for m in outlier_metrics if m not in FLOAT_COLUMNS]
+    if unknown:
+        print(f"[py] ⚠️ --outlier-metrics: métricas desconhecidas ignoradas: {', '.join(unknown)}")
+        outlier_metrics = [m for m in outlier_metrics if m not in unknown]
+    columns = required_columns(extra=compare_metrics + outlier_metrics)
+    stream_stats = stream_summaries = None
+    
+    if args.check_regressions:
+        return run_regression_check(args, variants)
+    
+    if args.stream:
+        # Carregar e filtrar em blocos, com memória limitada (vale também com --last-n)
+        df, stream_stats, stream_summaries = stream_analysis(args.csv_files, variants, args.last_n, args.chunk_mb,
+                                                             extra_percentiles, compare_metrics, columns)
+    elif args.last_n > 0 and not args.full_scan:
+        # Filtro e limite aplicados na leitura: só as linhas recentes são lidas
+        df = load_recent(args.csv_files, variants, args.last_n, workers=args.workers, columns=columns)
+    else:
+        # Carregar dados
+        df = load_multiple_csvs(args.csv_files, use_cache=not args.no_cache, workers=args.workers,
+                                columns=columns)
+        
+        # Filtrar dados
+        df = df[df['variant'].isin(variants)]
+        df = df.tail(args.last_n * len(variants)) if args.last_n > 0 else df
     
     print(f"[py] Dados filtrados: {len(df)} linhas")
     
     # Parsear informações de arquivos
     file_infos = parse_file_info(args.file_info)
     
+    # Outliers: detectados nas execuções carregadas; com --exclude-outliers
+    # saem das estatísticas e comparações (os gráficos continuam mostrando tudo)
+    outlier_mask, outliers = detect_outliers(df, outlier_metrics, args.outlier_method)
+    exclude_outliers = args.exclude_outliers and stream_summaries is None
+    if args.exclude_outliers and stream_summaries is not None:
+        print("[py] ⚠️ --exclude-outliers não se aplica ao histórico completo do modo --stream")
+    analysis_df = df[~outlier_mask] if exclude_outliers else df
+    if outliers:
+        print(f"[py] Outliers ({args.outlier_method}): {int(outlier_mask.sum())} execuções"
+              + (" excluídas" if exclude_outliers else ""))
+    
     # Análises
     print("[py] Executando análises...")
-    comparisons = compare_variants(df, variants)
+    if stream_summaries is not None:
+        # Histórico completo sem as execuções: médias e teste de Welch vêm dos resumos
+        stream_means = {v: {m: per[m]["mean"] if m in per else float("nan") for m in compare_metrics}
+                        for v, per in stream_summaries.items()}
+        comparisons = compare_variant_means(stream_means, variants, base_variant, compare_metrics)
+        add_significance(comparisons, summary_significance(stream_summaries, base_variant, variants,
+                                                           compare_metrics, args.confidence), args.confidence)
+    else:
+        # O conselheiro só usa o p-valor: dispensa o bootstrap
+        comparisons = compare_variants(analysis_df, variants, base_variant, compare_metrics,
+                                       n_boot=0 if args.advise_runs else args.bootstrap_samples,
+                                       confidence=args.confidence)
+    
+    if args.advise_runs:
+        return write_sample_size_advice(args, analysis_df, variants, base_variant, compare_metrics,
+                                        comparisons, stream_summaries)
+    
     trends = analyze_temporal_evolution(df)
+    frame_times = analyze_frame_times(analysis_df, variants)
     compression_ratios = calculate_compression_ratios(file_infos)
-    all_stats = calculate_all_stats(df, variants)
+    all_stats = stream_stats if stream_stats is not None else calculate_all_stats(analysis_df, variants,
+                                                                                    extra_percentiles)
     
     # Color map
     color_map = {
@@ -1109,9 +1924,24 @@ def main():
         "meshopt": "#4CAF50"
     }
     
-    # Criar visualizações
+    # Criar visualizações: os gráficos entram como marcadores e são construídos
+    # em paralelo no fim (o DataFrame vai uma vez para cada worker)
     print("[py] Criando visualizações...")
     sections = []
+    chart_df = df[[c for c in ["variant"] + STAGE_COLUMNS["charts"] if c in df.columns]]
+    charts = ChartRenderer({"df": chart_df}, workers=args.render_workers, n_rows=len(chart_df),
+                           lazy=args.lazy_charts)
+    data = charts.ref("df")
+    
+    # Médias por variante e barras: calculadas uma vez e reaproveitadas por HTML, PNG e PDF
+    figures = FigureRegistry()
+    bar_metrics = [metric for metric, *_ in BAR_CHARTS]
+    means = figures.get(("variant_means", tuple(variants), tuple(bar_metrics)), variant_means,
+                        chart_df, variants, bar_metrics, data=chart_df)
+    
+    def bar_chart(metric, title, unit, layout=None):
+        return figures.styled(("bar", metric, title, unit), create_bar_chart, means, variants, metric, title, unit,
+                              color_map, layout=layout, data=chart_df)
     
     # 1. Resumo Executivo
     sections.append(create_executive_summary(args.model, df, variants, comparisons, file_infos))
@@ -1119,43 +1949,61 @@ def main():
     # 2. Informações de Arquivos
     if file_infos:
         sections.append(create_file_info_section(file_infos, compression_ratios))
-        fig = create_file_size_chart(file_infos, color_map)
-        sections.append(create_html_section("Tamanho dos Arquivos", f'<div class="chart">{fig.to_html(include_plotlyjs=False, div_id="file_size")}</div>'))
+        chart = charts.chart("file_size", create_file_size_chart, file_infos, color_map)
+        sections.append(create_html_section("Tamanho dos Arquivos", f'<div class="chart">{chart}</div>'))
     
     # 3. Tabelas de Comparação Organizadas
-    sections.append(create_performance_comparison_table(comparisons))
+    sections.append(create_performance_comparison_table(comparisons, base_variant))
     
     # 4. Estatísticas Detalhadas por Variante
     sections.append(create_detailed_stats_tables(all_stats))
+    sections.append(create_outliers_section(outliers, exclude_outliers, args.outlier_method))
+    
+    # Frame time (fps_samples): percentis, lows e stutter que a média de FPS esconde
+    if frame_times:
+        chart = charts.chart("frame_time_hist", create_frame_time_histogram, frame_times, color_map)
+        sections.append(create_html_section("Frame Time e Stutter", create_frame_time_table(frame_times) +
+                                            f'<div class="chart">{chart}</div>'))
     
     # 5. Gráficos de Barras
-    for metric, title, unit in [("load_ms", "Tempo de Carregamento", "ms"), 
-                                  ("mem_mb", "Memória (média)", "MB"),
-                                  ("fps_avg", "FPS (média)", "FPS")]:
-        fig = create_bar_chart(df, variants, metric, title, unit, color_map)
-        sections.append(create_html_section(title, f'<div class="chart">{fig.to_html(include_plotlyjs=False, div_id=f"bar_{metric}")}</div>'))
+    for metric, title, unit, _, _ in BAR_CHARTS:
+        chart = charts.figure(f"bar_{metric}", bar_chart(metric, title, unit))
+        sections.append(create_html_section(title, f'<div class="chart">{chart}</div>'))
     
     # 6. Box Plots
     for metric, title, unit in [("fps_avg", "Distribuição de FPS", "FPS"),
                                   ("load_ms", "Distribuição de Tempo de Carregamento", "ms")]:
-        fig = create_box_plots(df, variants, metric, title, unit, color_map)
-        sections.append(create_html_section(f"{title} (Box Plot)", f'<div class="chart">{fig.to_html(include_plotlyjs=False, div_id=f"box_{metric}")}</div>'))
+        chart = charts.chart(f"box_{metric}", create_box_plots, data, variants, metric, title, unit, color_map)
+        sections.append(create_html_section(f"{title} (Box Plot)", f'<div class="chart">{chart}</div>'))
     
     # 7. Scatter Plots
-    fig = create_scatter_plot(df, variants, "load_ms", "fps_avg", "FPS vs Tempo de Carregamento", color_map)
-    sections.append(create_html_section("Relação FPS vs Load Time", f'<div class="chart">{fig.to_html(include_plotlyjs=False, div_id="scatter_fps_load")}</div>'))
+    chart = charts.chart("scatter_fps_load", create_scatter_plot, data, variants, "load_ms", "fps_avg",
+                         "FPS vs Tempo de Carregamento", color_map)
+    sections.append(create_html_section("Relação FPS vs Load Time", f'<div class="chart">{chart}</div>'))
     
     # 8. Heatmap
     metrics_for_corr = ["load_ms", "mem_mb", "fps_avg", "fps_min", "fps_max"]
-    fig = create_heatmap(df, metrics_for_corr)
-    sections.append(create_html_section("Correlação entre Métricas", f'<div class="chart">{fig.to_html(include_plotlyjs=False, div_id="heatmap")}</div>'))
+    chart = charts.chart("heatmap", create_heatmap, data, metrics_for_corr)
+    sections.append(create_html_section("Correlação entre Métricas", f'<div class="chart">{chart}</div>'))
     
     # 9. Evolução Temporal
-    fig = create_timeline_chart(df, variants, "fps_avg", "Evolução de FPS ao Longo do Tempo", "FPS", color_map)
-    sections.append(create_html_section("Evolução Temporal", f'<div class="chart">{fig.to_html(include_plotlyjs=False, div_id="timeline_fps")}</div>'))
+    chart = charts.chart("timeline_fps", create_timeline_chart, data, variants, "fps_avg",
+                         "Evolução de FPS ao Longo do Tempo", "FPS", color_map,
+                         change_points_by_variant(trends, "fps_avg"))
+    timeline_html = f'<div class="chart">{chart}</div>'
+    chart = charts.chart("timeline_load", create_timeline_chart, data, variants, "load_ms",
+                         "Evolução do Tempo de Carregamento", "ms", color_map,
+                         change_points_by_variant(trends, "load_ms"))
+    timeline_html += f'<div class="chart">{chart}</div>'
+    sections.append(create_html_section("Evolução Temporal", timeline_html + create_change_points_table(trends)))
+    
+    # Construir e serializar os gráficos, depois preencher as seções na ordem acima
+    charts.render()
+    charts.print_timings()
+    sections = charts.fill(sections)
     
     # Construir HTML
-    html = build_html(args.model, sections)
+    html = build_html(args.model, sections, plotlyjs_script(args.plotlyjs, args.out), args.lazy_charts)
     
     # Salvar HTML
     html_path = os.path.join(args.out, "report.html")
@@ -1173,7 +2021,10 @@ def main():
         "all_stats": {v: {m: s.to_dict() for m, s in metrics.items()} for v, metrics in all_stats.items()},
         "trends": trends,
         "total_tests": len(df),
-        "variants": variants
+        "variants": variants,
+        "outliers": {"method": args.outlier_method, "excluded": int(exclude_outliers), "runs": outliers},
+        "frame_times": frame_times,
+        "render_timings": charts.timings_dict()
     }
     
     json_path = os.path.join(args.out, "data.json")
@@ -1181,63 +2032,26 @@ def main():
         json.dump(json_data, f, indent=2)
     print(f"[py] JSON gerado: {json_path}")
     
-    # PNG Previews (sempre gerar)
+    # Imagens estáticas: PNGs de preview (sempre) e PDF (se solicitado) saem
+    # num único lote, com uma sessão do Kaleido para todas
     print("[py] Gerando previews PNG...")
     images_dir = os.path.join(args.out, "images")
     os.makedirs(images_dir, exist_ok=True)
+    exporter = StaticExporter()
     
-    try:
-        # 1. Tempo de carregamento
-        load_chart = create_bar_chart(df, variants, "load_ms", "Tempo de Carregamento", "ms", color_map)
-        load_chart.update_layout(
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(size=14),
-            margin=dict(l=50, r=50, t=80, b=50)
-        )
-        load_png_path = os.path.join(images_dir, "bars_load.png")
-        load_chart.write_image(load_png_path, width=1200, height=600, scale=1, engine="kaleido")
-        print(f"[py] PNG: {load_png_path}")
-        
-        # 2. Uso de memória
-        mem_chart = create_bar_chart(df, variants, "mem_mb", "Uso de Memória", "MB", color_map)
-        mem_chart.update_layout(
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(size=14),
-            margin=dict(l=50, r=50, t=80, b=50)
-        )
-        mem_png_path = os.path.join(images_dir, "bars_mem.png")
-        mem_chart.write_image(mem_png_path, width=1200, height=600, scale=1, engine="kaleido")
-        print(f"[py] PNG: {mem_png_path}")
-        
-        # 3. FPS médio
-        fps_chart = create_bar_chart(df, variants, "fps_avg", "Performance FPS", "FPS", color_map)
-        fps_chart.update_layout(
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(size=14),
-            margin=dict(l=50, r=50, t=80, b=50)
-        )
-        fps_png_path = os.path.join(images_dir, "bars_fps.png")
-        fps_chart.write_image(fps_png_path, width=1200, height=600, scale=1, engine="kaleido")
-        print(f"[py] PNG: {fps_png_path}")
-        
-        print("[py] ✓ Previews PNG gerados com sucesso!")
-        
-    except Exception as e:
-        print(f"[py] ⚠️ Erro ao gerar PNGs: {e}")
-        print("[py] ⚠️ Continuando sem previews PNG...")
+    png_paths = []
+    for metric, title, unit, png_title, name in BAR_CHARTS:
+        chart = bar_chart(metric, title, unit, layout=dict(PNG_LAYOUT, title=dict(text=png_title)))
+        png_path = os.path.join(images_dir, f"{name}.png")
+        exporter.add(chart, png_path, width=1200, height=600, scale=1)
+        png_paths.append(png_path)
     
-    # PDF (se solicitado)
+    pdf_path = None
     if args.pdf:
         pdf_path = os.path.join(args.out, "report.pdf")
         print(f"[py] Gerando PDF: {pdf_path}")
         
         try:
-            # Criar figura combinada com todos os gráficos principais
-            from plotly.subplots import make_subplots
-            
             # Criar subplots 2x2
             fig_combined = make_subplots(
                 rows=2, cols=2,
@@ -1252,12 +2066,11 @@ def main():
                 col = (i % 2) + 1
                 
                 for variant in variants:
-                    variant_data = df[df['variant'] == variant]
-                    if len(variant_data) > 0:
+                    if variant in means.index:
                         fig_combined.add_trace(
                             go.Bar(
                                 x=[variant],
-                                y=[variant_data[metric].mean()],
+                                y=[means.at[variant, (metric, 'mean')]],
                                 name=f"{variant} ({metric})",
                                 marker_color=color_map.get(variant, "#666666"),
                                 showlegend=False
@@ -1289,14 +2102,33 @@ def main():
                 showlegend=False,
                 template='plotly_white'
             )
-            
-            # Gerar PDF
-            fig_combined.write_image(pdf_path, width=1200, height=800, scale=2)
-            print(f"[py] ✓ PDF gerado: {pdf_path}")
+            exporter.add(fig_combined, pdf_path, width=1200, height=800, scale=2)
             
         except Exception as e:
             print(f"[py] ⚠️ Erro ao gerar PDF: {e}")
             print(f"[py] ⚠️ Continuando sem PDF...")
+            pdf_path = None
+    
+    written, failures = exporter.export()
+    print(f"[py] Figuras reaproveitadas entre HTML/PNG/PDF: {figures.hits} (construídas: {figures.misses})")
+    errors = dict(failures)
+    for path in written:
+        print(f"[py] {'PDF' if path == pdf_path else 'PNG'}: {path}")
+    if exporter.jobs:
+        print(f"[py] Exportação estática: {len(written)}/{len(exporter.jobs)} imagens em {exporter.elapsed_s:.2f}s"
+              + (f" ({exporter.method})" if exporter.method else ""))
+    
+    png_errors = [errors[p] for p in png_paths if p in errors]
+    if png_errors:
+        print(f"[py] ⚠️ Erro ao gerar PNGs: {png_errors[0]}")
+        print("[py] ⚠️ Continuando sem previews PNG...")
+    else:
+        print("[py] ✓ Previews PNG gerados com sucesso!")
+    if pdf_path in errors:
+        print(f"[py] ⚠️ Erro ao gerar PDF: {errors[pdf_path]}")
+        print(f"[py] ⚠️ Continuando sem PDF...")
+    elif pdf_path:
+        print(f"[py] ✓ PDF gerado: {pdf_path}")
     
     print("[py] ✓ Report gerado com sucesso!")
     return 0
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+FPS Samples - Decodificação e reduções vetorizadas da coluna fps_samples
+
+O Metrics.WriteCsv grava as amostras de FPS de cada execução como uma string
+"v1;v2;...;vn" (até MetricsConfig.MAX_FPS_SAMPLES_IN_CSV valores). Este módulo
+decodifica a coluna inteira de uma vez para um array "ragged":
+
+- values:  array plano float64 com todas as amostras de todas as execuções
+- offsets: array int64 (n_execuções + 1); as amostras da execução i ficam em
+           values[offsets[i]:offsets[i + 1]]
+
+As reduções por execução (média, variância, percentis, contagem de stutter)
+rodam em lote sobre todas as execuções, sem loop Python por linha.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+# =====================================================================
+# DECODIFICAÇÃO
+# =====================================================================
+
+def _row_value_counts(strings):
+    """Conta os valores de cada string "a;b;c" varrendo os bytes uma única vez"""
+    blob = ("\n".join(strings) + "\n").encode("ascii", errors="replace")
+    buf = np.frombuffer(blob, dtype=np.uint8)
+    row_ends = np.flatnonzero(buf == ord("\n"))
+    seps = np.cumsum(buf == ord(";"))[row_ends]
+    seps_per_row = np.diff(np.concatenate(([0], seps)))
+    lengths = np.diff(np.concatenate(([-1], row_ends))) - 1
+    return np.where(lengths > 0, seps_per_row + 1, 0).astype(np.int64)
+
+
+def decode_fps_samples(column):
+    """
+    Decodifica a coluna fps_samples inteira para um RaggedArray
+
+    Args:
+        column: Series (ou iterável) de strings "v1;v2;..."; vazios/NA viram execuções sem amostras
+
+    Returns:
+        RaggedArray com uma linha por elemento de `column`
+    """
+    strings = pd.Series(column, dtype="string").fillna("").str.strip().to_numpy(dtype=object)
+    if len(strings) == 0:
+        return RaggedArray(np.empty(0, dtype=np.float64), np.zeros(1, dtype=np.int64))
+
+    counts = _row_value_counts(strings)
+    offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+    joined = ";".join(strings[counts > 0])
+    try:
+        with warnings.catch_warnings():
+            # numpy avisa (DeprecationWarning) quando encontra um token inválido
+            warnings.simplefilter("ignore", DeprecationWarning)
+            values = np.fromstring(joined, dtype=np.float64, sep=";") if joined else np.empty(0)
+    except ValueError:
+        values = None
+    if values is None or len(values) != offsets[-1]:
+        # Algum token inválido: parse tolerante (NaN no lugar do valor inválido)
+        values = pd.to_numeric(pd.Series(joined.split(";")), errors="coerce").to_numpy(dtype=np.float64)
+    return RaggedArray(values, offsets)
+
+
+# =====================================================================
+# ARRAY RAGGED
+# =====================================================================
+
+class RaggedArray:
+    """Amostras de várias execuções em um array plano + offsets"""
+    def __init__(self, values, offsets):
+        self.values = np.asarray(values, dtype=np.float64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.counts = np.diff(self.offsets)
+        self.row_ids = np.repeat(np.arange(len(self.counts)), self.counts)
+        self._sorted = None
+
+    def __len__(self):
+        return len(self.counts)
+
+    def map(self, func):
+        """Aplica uma transformação elemento a elemento (ex.: FPS -> frame time)"""
+        return RaggedArray(func(self.values), self.offsets)
+
+    def sorted_values(self):
+        """Valores ordenados dentro de cada execução (NaN no fim de cada uma)"""
+        if self._sorted is None:
+            width = int(self.counts.max()) if len(self) else 0
+            if len(self) and width * len(self) <= 2 * len(self.values):
+                # Linhas curtas e parecidas (ex.: 50 amostras por execução):
+                # matriz preenchida com NaN ordenada por linha, bem mais rápida
+                # que o lexsort global
+                grid = np.full((len(self), width), np.nan)
+                mask = np.arange(width)[None, :] < self.counts[:, None]
+                grid[mask] = self.values
+                grid.sort(axis=1)
+                self._sorted = grid[mask]
+            else:
+                order = np.lexsort((self.values, self.row_ids))
+                self._sorted = self.values[order]
+        return self._sorted
+
+    def sum(self):
+        return np.bincount(self.row_ids, weights=self.values, minlength=len(self))
+
+    def mean(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.sum() / self.counts
+
+    def var(self, ddof=0):
+        """Variância por execução (duas passadas, numericamente estável)"""
+        mean = self.mean()
+        dev = self.values - mean[self.row_ids]
+        ss = np.bincount(self.row_ids, weights=dev * dev, minlength=len(self))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.counts > ddof, ss / (self.counts - ddof), np.nan)
+
+    def std(self, ddof=0):
+        return np.sqrt(self.var(ddof))
+
+    def min(self):
+        return self.quantiles([0.0])[:, 0]
+
+    def max(self):
+        return self.quantiles([1.0])[:, 0]
+
+    def quantiles(self, qs):
+        """
+        Percentis por execução com interpolação linear (como numpy/pandas)
+
+        Args:
+            qs: Lista de quantis em [0, 1]
+
+        Returns:
+            Array (n_execuções, len(qs)); NaN para execuções sem amostras
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        sorted_vals = self.sorted_values()
+        result = np.full((len(self), len(qs)), np.nan)
+        has = self.counts > 0
+        if not has.any() or len(qs) == 0:
+            return result
+
+        starts = self.offsets[:-1][has][:, None]
+        pos = qs[None, :] * (self.counts[has][:, None] - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        frac = pos - lo
+        v_lo = sorted_vals[starts + lo]
+        v_hi = sorted_vals[starts + hi]
+        result[has] = v_lo + (v_hi - v_lo) * frac
+        return result
+
+    def count_where(self, mask):
+        """Conta por execução os elementos em que `mask` (mesmo tamanho de values) é verdadeiro"""
+        return np.bincount(self.row_ids[mask], minlength=len(self)).astype(np.int64)
+
+    def count_above(self, thresholds):
+        """Conta por execução os valores acima de um limiar por execução"""
+        return self.count_where(self.values > np.asarray(thresholds)[self.row_ids])
+
+    def dropna(self):
+        """Remove os NaN (ex.: FPS <= 0 convertido em frame time) mantendo as linhas"""
+        keep = ~np.isnan(self.values)
+        counts = np.bincount(self.row_ids[keep], minlength=len(self))
+        return RaggedArray(self.values[keep], np.concatenate(([0], np.cumsum(counts))))
+
+    def regroup(self, codes, n_groups):
+        """
+        Junta as amostras das execuções por grupo (ex.: variante)
+
+        Args:
+            codes: Grupo de cada execução (0..n_groups-1; negativo = descartada)
+            n_groups: Número de grupos
+
+        Returns:
+            RaggedArray com uma linha por grupo (ordem das execuções preservada)
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        sample_codes = codes[self.row_ids]
+        keep = sample_codes >= 0
+        order = np.argsort(sample_codes[keep], kind="stable")
+        counts = np.bincount(sample_codes[keep], minlength=n_groups)
+        return RaggedArray(self.values[keep][order], np.concatenate(([0], np.cumsum(counts))))
+
+    def histogram(self, edges):
+        """
+        Histograma de cada linha com bordas comuns, em uma única contagem
+
+        Valores acima da última borda caem no último bin; NaN são ignorados.
+
+        Returns:
+            Array (n_linhas, len(edges) - 1) de contagens
+        """
+        n_bins = len(edges) - 1
+        valid = ~np.isnan(self.values)
+        bins = np.clip(np.searchsorted(edges, self.values[valid], side="right") - 1, 0, n_bins - 1)
+        flat = np.bincount(self.row_ids[valid] * n_bins + bins, minlength=len(self) * n_bins)
+        return flat.reshape(len(self), n_bins)
+
+
+# =====================================================================
+# CONVERSÕES
+# =====================================================================
+
+def fps_to_frame_ms(fps):
+    """Converte FPS em frame time (ms); FPS <= 0 vira NaN"""
+    with np.errstate(divide="ignore"):
+        return np.where(fps > 0, 1000.0 / fps, np.nan)
+
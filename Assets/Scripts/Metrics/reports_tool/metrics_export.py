@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Metrics Export - Exportação estática (PNG/SVG/PDF) em lote com uma sessão do Kaleido
+
+Cada write_image isolado pode subir um navegador headless novo. Aqui todas as
+imagens de um run entram numa fila e saem num único lote:
+
+1. Kaleido v1: um navegador, várias abas exportando em paralelo
+2. plotly.io.write_images: uma sessão, imagens em sequência
+3. plotly.io.write_image por figura (último recurso)
+
+Processos que geram vários reports (ex.: um script que percorre o catálogo)
+podem chamar start_session() uma vez: enquanto a sessão estiver aberta, os
+lotes reaproveitam o mesmo navegador entre runs.
+"""
+
+import os
+import time
+from pathlib import Path
+
+# Configurações da exportação estática
+EXPORT_CONFIG = {
+    "tabs": 0,          # abas do navegador exportando em paralelo (0 = automático)
+    "max_tabs": 4,
+    "timeout_s": 90,    # por imagem
+}
+
+# Sessão persistente (start_session/stop_session)
+_session = {"open": False}
+
+
+def _kaleido():
+    """Módulo kaleido, ou None se não estiver instalado"""
+    try:
+        import kaleido
+    except ImportError:
+        return None
+    return kaleido
+
+
+def resolve_tabs(tabs, n_jobs):
+    """Abas efetivas: 0/None = automático (núcleos, limitado por max_tabs)"""
+    if not tabs or tabs <= 0:
+        tabs = min(EXPORT_CONFIG["max_tabs"], os.cpu_count() or 1)
+    return max(1, min(tabs, n_jobs))
+
+
+def start_session(tabs=None):
+    """
+    Abre um navegador do Kaleido que sobrevive entre lotes (processos longos)
+
+    Returns:
+        True se a sessão foi aberta (Kaleido v1 com servidor síncrono)
+    """
+    kaleido = _kaleido()
+    start = getattr(kaleido, "start_sync_server", None)
+    if start is None:
+        return False
+    try:
+        start(n=resolve_tabs(tabs or EXPORT_CONFIG["tabs"], EXPORT_CONFIG["max_tabs"]), silence_warnings=True)
+    except TypeError:
+        start()
+    _session["open"] = True
+    return True
+
+
+def stop_session():
+    """Fecha o navegador aberto por start_session()"""
+    if not _session["open"]:
+        return
+    stop = getattr(_kaleido(), "stop_sync_server", None)
+    if stop is not None:
+        stop()
+    _session["open"] = False
+
+
+class StaticExporter:
+    """
+    Fila de imagens estáticas de um run
+
+    add() só registra; export() grava tudo num lote e devolve
+    (caminhos gravados, [(caminho, erro)]).
+    """
+    def __init__(self, tabs=None):
+        self.tabs = EXPORT_CONFIG["tabs"] if tabs is None else tabs
+        self.jobs = []  # [(figura, caminho, opções)]
+        self.elapsed_s = 0.0
+        self.method = None
+
+    def add(self, fig, path, width=None, height=None, scale=1, fmt=None):
+        """Agenda a figura; o formato vem da extensão do caminho (png, svg, pdf...)"""
+        fmt = (fmt or Path(path).suffix.lstrip(".") or "png").lower()
+        self.jobs.append((fig, str(path), {"format": fmt, "width": width, "height": height, "scale": scale}))
+
+    def _written(self, jobs, since):
+        """Separa os jobs cujo arquivo foi (re)gravado depois de `since`"""
+        done, pending = [], []
+        for job in jobs:
+            path = job[1]
+            ok = os.path.exists(path) and os.path.getmtime(path) >= since and os.path.getsize(path) > 0
+            (done if ok else pending).append(job)
+        return done, pending
+
+    def _export_kaleido_batch(self, kaleido, jobs):
+        """Kaleido v1: um navegador, `tabs` abas exportando em paralelo (ou o da sessão aberta)"""
+        specs = [{"fig": fig.to_dict(), "path": path, "opts": {k: v for k, v in opts.items() if v is not None}}
+                 for fig, path, opts in jobs]
+        if _session["open"]:
+            kaleido.write_fig_from_object_sync(specs)
+        else:
+            kaleido.write_fig_from_object_sync(specs, kopts={"n": resolve_tabs(self.tabs, len(specs)),
+                                                             "timeout": EXPORT_CONFIG["timeout_s"]})
+
+    def _export_plotly_batch(self, jobs):
+        """plotly.io.write_images: uma sessão para a lista inteira"""
+        import plotly.io as pio
+        # Os lotes agrupam figuras com as mesmas opções (write_images aceita listas)
+        by_opts = {}
+        for job in jobs:
+            by_opts.setdefault(tuple(sorted(job[2].items())), []).append(job)
+        for opts, group in by_opts.items():
+            opts = dict(opts)
+            pio.write_images([fig for fig, _, _ in group], [path for _, path, _ in group],
+                             format=opts["format"], width=opts["width"], height=opts["height"],
+                             scale=opts["scale"])
+
+    def export(self):
+        """Grava todas as imagens agendadas; falhas de um método caem para o próximo"""
+        start = time.perf_counter()
+        since = time.time() - 1.0
+        pending, failures = list(self.jobs), []
+        kaleido = _kaleido()
+
+        if kaleido is None:
+            failures = [(path, "kaleido não instalado (pip install kaleido)") for _, path, _ in pending]
+            pending = []
+
+        methods = []
+        if pending and hasattr(kaleido, "write_fig_from_object_sync"):
+            methods.append(("kaleido", lambda jobs: self._export_kaleido_batch(kaleido, jobs)))
+        if pending:
+            import plotly.io as pio
+            if hasattr(pio, "write_images"):
+                methods.append(("write_images", self._export_plotly_batch))
+
+        errors = {}
+        for name, method in methods:
+            if not pending:
+                break
+            try:
+                method(pending)
+            except Exception as e:
+                for _, path, _ in pending:
+                    errors[path] = str(e)
+            done, pending = self._written(pending, since)
+            if done and self.method is None:
+                self.method = name
+
+        # Último recurso: figura a figura
+        import plotly.io as pio
+        for fig, path, opts in pending:
+            try:
+                pio.write_image(fig, path, format=opts["format"], width=opts["width"], height=opts["height"],
+                                scale=opts["scale"])
+                self.method = self.method or "write_image"
+            except Exception as e:
+                failures.append((path, str(e) or errors.get(path, "")))
+
+        failed = {path for path, _ in failures}
+        written = [path for _, path, _ in self.jobs if path not in failed]
+        self.elapsed_s = time.perf_counter() - start
+        return written, failures
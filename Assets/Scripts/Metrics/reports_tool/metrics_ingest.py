@@ -0,0 +1,685 @@
+#!/usr/bin/env python3
+"""
+Metrics Ingest - Camada de carregamento dos CSVs de benchmark
+
+Compartilhada por metrics_report.py e advanced_metrics_report.py.
+
+Funcionalidades:
+- Cache colunar persistente por CSV (sidecar em <Benchmark>/.cache/)
+  invalidado por caminho, tamanho e mtime do arquivo
+- Ingestão incremental: guarda o offset consumido e só faz parse das linhas
+  anexadas desde o último report
+- Registro de schemas (V1/V2/V3, os mesmos layouts do MetricsStore.ParseCsvEntry)
+  com parse tipado em uma passada e normalização para um frame canônico
+- Carregamento paralelo de vários CSVs (um por modelo) com relato de falhas por arquivo
+- Projeção de colunas: cada report declara as colunas que usa e só elas são
+  lidas do CSV e guardadas no cache
+- Run logs binários (.runlog, ver metrics_runlog.py) aceitos no lugar de
+  qualquer CSV
+- Leitura reversa: filtro de linhas e limite de N por grupo aplicados na
+  leitura, varrendo o CSV (append-only) do fim para o início só até ter as
+  N linhas mais recentes de cada grupo
+"""
+
+import os
+import io
+import json
+import hashlib
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Parquet quando pyarrow estiver disponível; caso contrário, pickle do pandas
+try:
+    import pyarrow  # noqa: F401
+    _HAS_ARROW = True
+except ImportError:
+    _HAS_ARROW = False
+
+# Configurações do cache
+CACHE_CONFIG = {
+    "dir_name": ".cache",  # pastas com "." são ignoradas pelo Unity
+    "version": 5,          # incrementar quando o parsing ou a assinatura mudarem
+    "hash_block_bytes": 1 << 20,  # blocos de leitura no hash do prefixo
+}
+
+# Configurações da leitura reversa (últimas N linhas)
+RECENT_CONFIG = {
+    "block_kb": 64,        # primeiro bloco lido a partir do fim do arquivo
+    "max_block_mb": 8,     # os blocos dobram de tamanho até este limite
+}
+
+
+RUNLOG_EXTENSION = ".runlog"
+
+
+def is_runlog(path):
+    """Run log binário (metrics_runlog) em vez de CSV"""
+    return str(path).lower().endswith(RUNLOG_EXTENSION)
+
+
+def read_runlog(path, columns=None):
+    # Import tardio: metrics_runlog depende deste módulo
+    from metrics_runlog import read_runlog as _read_runlog
+    return _read_runlog(path, columns)
+
+
+# =====================================================================
+# REGISTRO DE SCHEMAS
+# =====================================================================
+
+# Layouts históricos escritos pelo Metrics.WriteCsv (mais novo primeiro).
+# O número de colunas bate com MetricsConfig.V1/V2/V3_COLUMN_COUNT no C#.
+CSV_SCHEMAS = [
+    {
+        "version": 3,
+        "columns": ("timestamp", "run_id", "test_number", "platform", "unity_version", "scene",
+                    "model", "variant", "file_mb", "load_ms", "mem_mb", "fps_avg", "fps_min",
+                    "fps_max", "fps_median", "fps_1pc_low", "fps_samples", "fps_window_s", "ok"),
+    },
+    {
+        "version": 2,
+        "columns": ("timestamp", "run_id", "platform", "unity_version", "scene", "model", "variant",
+                    "file_mb", "load_ms", "mem_mb", "fps_avg", "fps_1pc_low", "fps_window_s", "ok"),
+    },
+    {
+        "version": 1,
+        "columns": ("timestamp", "platform", "unity_version", "scene", "model", "variant",
+                    "file_mb", "load_ms", "mem_mb", "fps_avg", "fps_1pc_low", "ok"),
+    },
+]
+
+CANONICAL_COLUMNS = CSV_SCHEMAS[0]["columns"]
+
+CATEGORY_COLUMNS = ("run_id", "platform", "unity_version", "scene", "model", "variant")
+FLOAT_COLUMNS = ("file_mb", "load_ms", "mem_mb", "fps_avg", "fps_min", "fps_max",
+                 "fps_median", "fps_1pc_low", "fps_window_s")
+
+# Dtypes explícitos de cada coluna (o parse não infere nada)
+COLUMN_DTYPES = {
+    "timestamp": "string",
+    "test_number": "Int32",
+    "fps_samples": "string",
+    "ok": "boolean",
+    **{c: "category" for c in CATEGORY_COLUMNS},
+    **{c: "float32" for c in FLOAT_COLUMNS},
+}
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"  # horário local do Unity, sem o offset "zzz"
+DEFAULT_FPS_WINDOW_S = 5.0              # MetricsConfig.DEFAULT_FPS_WINDOW_SECONDS
+
+
+def detect_schema(header_fields):
+    """Identifica o layout pelo cabeçalho (ou pelo número de colunas, se não bater)"""
+    fields = tuple(f.strip().strip('"') for f in header_fields)
+    for schema in CSV_SCHEMAS:
+        if fields == schema["columns"]:
+            return schema
+    return schema_for_field_count(len(fields))
+
+
+def schema_for_field_count(n_fields):
+    for schema in CSV_SCHEMAS:
+        if n_fields == len(schema["columns"]):
+            return schema
+    return None
+
+
+def _lower_categorical(cat):
+    """Normaliza as categorias para minúsculas, juntando duplicatas ("Draco"/"draco")"""
+    lowered = cat.cat.categories.str.lower()
+    uniques = pd.Index(lowered.unique())
+    codes = uniques.get_indexer(lowered)
+    new_codes = np.where(cat.cat.codes.to_numpy() >= 0, codes[cat.cat.codes.to_numpy()], -1)
+    return pd.Series(pd.Categorical.from_codes(new_codes, categories=uniques), index=cat.index, name=cat.name)
+
+
+def concat_frames(frames, columns=CANONICAL_COLUMNS):
+    """Concatena frames canônicos mantendo as colunas categóricas como categóricas"""
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        return pd.DataFrame(columns=list(columns))
+    if len(frames) == 1:
+        return frames[0]
+    frames = [f.copy() for f in frames]
+    for col in CATEGORY_COLUMNS:
+        if all(col in f.columns and isinstance(f[col].dtype, pd.CategoricalDtype) for f in frames):
+            unified = union_categoricals([f[col] for f in frames]).categories
+            for f in frames:
+                f[col] = f[col].cat.set_categories(unified)
+    return pd.concat(frames, ignore_index=True)
+
+
+def project_columns(columns):
+    """Normaliza uma projeção: ordem canônica, sempre com timestamp (usado no filtro de linhas)"""
+    if columns is None:
+        return CANONICAL_COLUMNS
+    wanted = set(columns) | {"timestamp"}
+    return tuple(c for c in CANONICAL_COLUMNS if c in wanted)
+
+
+def _read_layout(data, schema, columns=CANONICAL_COLUMNS):
+    """Parse tipado de linhas (sem cabeçalho) de um único layout, lendo só `columns`"""
+    names = schema["columns"]
+    usecols = [c for c in names if c in columns]
+    return pd.read_csv(
+        io.BytesIO(data),
+        header=None,
+        names=list(names),
+        usecols=usecols,
+        dtype={c: COLUMN_DTYPES[c] for c in usecols},
+        true_values=["true", "True", "TRUE"],
+        false_values=["false", "False", "FALSE"],
+    )
+
+
+def _to_canonical(df, schema, columns=CANONICAL_COLUMNS):
+    """Completa colunas ausentes em layouts antigos com valores padrão tipados"""
+    n = len(df)
+    ts = pd.to_datetime(df["timestamp"].str.slice(0, 19), format=TIMESTAMP_FORMAT, errors="coerce")
+    out = {}
+    for col in columns:
+        if col == "timestamp":
+            out[col] = ts
+        elif col in df.columns:
+            out[col] = df[col]
+        elif col == "run_id":
+            # CSV antigo: run_id por "lote" (timestamp truncado a minuto)
+            out[col] = ts.dt.strftime("%Y%m%d_%H%M").astype("category")
+        elif col == "test_number":
+            out[col] = pd.array(np.ones(n, dtype=np.int32), dtype="Int32")
+        elif col == "fps_samples":
+            out[col] = pd.array([pd.NA] * n, dtype="string")
+        elif col == "fps_window_s":
+            out[col] = np.full(n, DEFAULT_FPS_WINDOW_S, dtype=np.float32)
+        else:
+            out[col] = np.full(n, np.nan, dtype=np.float32)
+    return pd.DataFrame(out, index=df.index)
+
+
+def _line_field_counts(body):
+    """Número de campos de cada linha, calculado de forma vetorizada sobre os bytes.
+
+    Vírgulas e quebras de linha dentro de campos entre aspas (o Metrics.WriteCsv
+    põe aspas em todas as strings, ex.: uma cena "Level, 1") não contam: a
+    paridade acumulada das aspas marca os bytes dentro de um campo; aspas
+    escapadas ("") alternam duas vezes e não mudam a paridade.
+    """
+    buf = np.frombuffer(body, dtype=np.uint8)
+    separators = buf == ord(",")
+    line_ends = buf == ord("\n")
+    if b'"' in body:
+        outside = ~np.logical_xor.accumulate(buf == ord('"'))
+        separators &= outside
+        line_ends &= outside
+    newlines = np.flatnonzero(line_ends)
+    if len(buf) and (len(newlines) == 0 or newlines[-1] != len(buf) - 1):
+        newlines = np.append(newlines, len(buf))
+    commas = np.cumsum(separators)
+    ends = commas[np.maximum(newlines - 1, 0)] if len(commas) else np.zeros(len(newlines), dtype=np.int64)
+    counts = np.diff(np.concatenate(([0], ends))) + 1
+    starts = np.concatenate(([0], newlines[:-1] + 1))
+    return counts, starts, newlines
+
+
+def parse_benchmark_csv(source, columns=None):
+    """
+    Faz o parse de um CSV de benchmark para o frame canônico (layout V3)
+
+    Cada linha é classificada pelo seu número de colunas, como no C#; um arquivo
+    com cabeçalho antigo e linhas novas anexadas é normalizado num único frame.
+
+    Args:
+        source: Caminho do CSV ou buffer binário (usado pela ingestão incremental)
+        columns: Colunas a ler (None = todas); as demais nem passam pelo parser
+
+    Returns:
+        DataFrame com categóricas para run_id/platform/scene/model/variant,
+        métricas float32 e timestamp datetime64
+    """
+    columns = project_columns(columns)
+    if hasattr(source, "read"):
+        data = source.read()
+    else:
+        with open(source, "rb") as f:
+            data = f.read()
+    if data.startswith(b"\xef\xbb\xbf"):
+        data = data[3:]
+
+    body = data
+    header_schema = None
+    if data.startswith(b"timestamp,"):
+        header_end = data.find(b"\n")
+        header = data[:header_end if header_end >= 0 else len(data)].decode("utf-8").strip()
+        header_schema = detect_schema(header.split(","))
+        body = data[header_end + 1:] if header_end >= 0 else b""
+
+    if not body.strip():
+        schema = header_schema or CSV_SCHEMAS[0]
+        return _to_canonical(_read_layout(b"", schema, columns), schema, columns)
+
+    counts, starts, ends = _line_field_counts(body)
+    blank = (ends - starts) <= 1
+    distinct = np.unique(counts[~blank])
+
+    if len(distinct) == 1 and (header_schema is None or distinct[0] == len(header_schema["columns"])):
+        # Caminho rápido: um único layout no arquivo inteiro
+        schema = header_schema or schema_for_field_count(int(distinct[0]))
+        if schema is None:
+            raise ValueError(f"Formato de CSV não suportado: {distinct[0]} colunas")
+        df = _to_canonical(_read_layout(body, schema, columns), schema, columns)
+    else:
+        # Arquivo misto: parse tipado por layout e reordenação pelas linhas originais
+        parts, order = [], []
+        for n_fields in distinct:
+            schema = schema_for_field_count(int(n_fields))
+            idx = np.flatnonzero((counts == n_fields) & ~blank)
+            if schema is None:
+                print(f"[py] ⚠️ {len(idx)} linhas ignoradas - formato não suportado: {n_fields} colunas")
+                continue
+            chunk = b"\n".join(body[starts[i]:ends[i]] for i in idx) + b"\n"
+            parts.append(_to_canonical(_read_layout(chunk, schema, columns), schema, columns))
+            order.append(idx)
+        df = concat_frames(parts, columns)
+        if order:
+            df = df.iloc[np.argsort(np.concatenate(order), kind="stable")].reset_index(drop=True)
+
+    df = df[df["timestamp"].notna()].reset_index(drop=True)
+    if "variant" in df.columns and isinstance(df["variant"].dtype, pd.CategoricalDtype):
+        df["variant"] = _lower_categorical(df["variant"])
+    return df
+
+
+# =====================================================================
+# CACHE COLUNAR
+# =====================================================================
+
+def _cache_paths(csv_path, namespace):
+    """Retorna (arquivo de dados, arquivo de metadados) do cache de um CSV"""
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_CONFIG["dir_name"])
+    base = f"{os.path.basename(csv_path)}.{namespace}"
+    ext = "parquet" if _HAS_ARROW else "pkl"
+    return os.path.join(cache_dir, f"{base}.{ext}"), os.path.join(cache_dir, f"{base}.json")
+
+
+def _bytes_hasher(data=b""):
+    return hashlib.blake2b(data, digest_size=16)
+
+
+def _hash_bytes(data):
+    return _bytes_hasher(data).hexdigest()
+
+
+def _read_complete_lines(csv_path, start):
+    """Lê os bytes a partir de `start` até a última quebra de linha.
+
+    Uma linha parcial no final (Unity ainda escrevendo) fica para o próximo report.
+    """
+    with open(csv_path, "rb") as f:
+        f.seek(start)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    return data[:end]
+
+
+def _prefix_hasher(csv_path, offset):
+    """Hasher dos bytes [0, offset) do CSV, lido em blocos.
+
+    O hasher continua aberto: atualizado com a cauda nova, dá o hash do
+    próximo prefixo sem reler o arquivo.
+    """
+    hasher = _bytes_hasher()
+    block = CACHE_CONFIG["hash_block_bytes"]
+    with open(csv_path, "rb") as f:
+        remaining = offset
+        while remaining > 0:
+            data = f.read(min(block, remaining))
+            if not data:
+                break
+            hasher.update(data)
+            remaining -= len(data)
+    return hasher
+
+
+def _prefix_anchors(csv_path, offset, hasher=None):
+    """Hashes do cabeçalho e de todo o prefixo já consumido do CSV.
+
+    O prefixo inteiro (bytes antes de `offset`) entra no hash, então qualquer
+    reescrita dele é detectada: upsert no meio do arquivo (mesmo com o mesmo
+    tamanho), truncamento, cabeçalho novo. Conferir o prefixo só lê bytes; o
+    parse continua restrito à cauda nova. `hasher` reaproveita um hash do
+    prefixo já calculado (ver _prefix_hasher).
+    """
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+    hasher = hasher or _prefix_hasher(csv_path, offset)
+    return {
+        "header_hash": _hash_bytes(header),
+        "prefix_hash": hasher.hexdigest(),
+    }
+
+
+def csv_signature(csv_path, offset, hasher=None):
+    """Assinatura do CSV consumido até `offset`: caminho, tamanho, mtime e hashes"""
+    st = os.stat(csv_path)
+    signature = {
+        "path": os.path.abspath(csv_path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "offset": offset,
+        "version": CACHE_CONFIG["version"],
+        "format": "parquet" if _HAS_ARROW else "pickle",
+    }
+    signature.update(_prefix_anchors(csv_path, offset, hasher))
+    return signature
+
+
+def _read_meta(csv_path, namespace):
+    data_path, meta_path = _cache_paths(csv_path, namespace)
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except Exception:
+        return None
+    if (meta.get("path") != os.path.abspath(csv_path)
+            or meta.get("version") != CACHE_CONFIG["version"]
+            or meta.get("format") != ("parquet" if _HAS_ARROW else "pickle")):
+        return None
+    return meta
+
+
+def read_cache(csv_path, namespace):
+    """Lê o DataFrame materializado no cache (sem validar contra o CSV)"""
+    data_path, _ = _cache_paths(csv_path, namespace)
+    try:
+        if _HAS_ARROW:
+            return pd.read_parquet(data_path)
+        return pd.read_pickle(data_path)
+    except Exception as e:
+        print(f"[py] ⚠️ Cache inválido para {csv_path}: {e}")
+        return None
+
+
+def write_cache(csv_path, namespace, df, signature):
+    """Grava o DataFrame no cache (escrita atômica via arquivo temporário)"""
+    data_path, meta_path = _cache_paths(csv_path, namespace)
+    try:
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        tmp_path = data_path + ".tmp"
+        if _HAS_ARROW:
+            df.to_parquet(tmp_path, index=False)
+        else:
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, data_path)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(signature, f)
+        os.replace(meta_path + ".tmp", meta_path)
+    except Exception as e:
+        print(f"[py] ⚠️ Não foi possível gravar cache de {csv_path}: {e}")
+
+
+def _parse_bytes(parser, data):
+    return parser(io.BytesIO(data))
+
+
+def load_csv_cached(csv_path, parser, namespace, use_cache=True):
+    """
+    Carrega um CSV usando o cache colunar e ingestão incremental
+
+    - CSV inalterado (tamanho/mtime): lê só o cache, sem parse de texto
+    - CSV cresceu e o prefixo consumido é o mesmo (append do Metrics.WriteCsv):
+      faz parse apenas da cauda nova e junta ao cache
+    - CSV com o mesmo tamanho e mtime novo: confere o hash do conteúdo; se
+      não mudou, continua valendo o cache
+    - CSV reescrito (upsert, truncamento, cabeçalho novo): parse completo
+
+    Args:
+        csv_path: Caminho do CSV
+        parser: Função que recebe caminho ou buffer e retorna o DataFrame processado
+        namespace: Identifica o parser (cada script guarda seu próprio formato)
+        use_cache: False força o parse completo sem ler/gravar cache
+
+    Returns:
+        DataFrame processado
+    """
+    if not use_cache:
+        return parser(csv_path)
+
+    meta = _read_meta(csv_path, namespace)
+    if meta is not None:
+        st = os.stat(csv_path)
+        offset = meta["offset"]
+        unchanged = st.st_size == meta["size"] and st.st_mtime_ns == meta["mtime_ns"]
+        if unchanged:
+            cached = read_cache(csv_path, namespace)
+            if cached is not None:
+                print(f"[py] Cache hit: {csv_path} ({len(cached)} linhas)")
+                return cached
+        elif st.st_size == meta["size"]:
+            print(f"[py] CSV com o mesmo tamanho e mtime novo, conferindo o conteúdo: {csv_path}")
+
+        hasher = _prefix_hasher(csv_path, offset) if not unchanged and st.st_size >= offset else None
+        if hasher is not None and _prefix_anchors(csv_path, offset, hasher) == {
+                "header_hash": meta["header_hash"], "prefix_hash": meta["prefix_hash"]}:
+            cached = read_cache(csv_path, namespace)
+            if cached is not None:
+                with open(csv_path, "rb") as f:
+                    header = f.readline()
+                tail = _read_complete_lines(csv_path, offset)
+                if tail:
+                    tail_df = _parse_bytes(parser, header + tail)
+                    df = concat_frames([cached, tail_df])
+                    print(f"[py] Cache incremental: {csv_path} (+{len(tail_df)} linhas, {len(df)} no total)")
+                else:
+                    df = cached
+                    print(f"[py] Cache hit (conteúdo inalterado): {csv_path} ({len(df)} linhas)")
+                hasher.update(tail)
+                write_cache(csv_path, namespace, df, csv_signature(csv_path, offset + len(tail), hasher))
+                return df
+        elif not unchanged:
+            print(f"[py] CSV reescrito desde o último report, refazendo parse: {csv_path}")
+
+    data = _read_complete_lines(csv_path, 0)
+    df = _parse_bytes(parser, data)
+    write_cache(csv_path, namespace, df,
+                csv_signature(csv_path, len(data), _bytes_hasher(data)))
+    return df
+
+
+def projection_namespace(columns):
+    """Namespace do cache para uma projeção (cada conjunto de colunas tem seu cache)"""
+    columns = project_columns(columns)
+    if columns == CANONICAL_COLUMNS:
+        return "canonical"
+    return "cols-" + _hash_bytes(",".join(columns).encode("utf-8"))[:8]
+
+
+def load_benchmark_csv(csv_path, columns=None, use_cache=True):
+    """Carrega um CSV de benchmark (só as colunas pedidas) via cache incremental.
+
+    Aceita também um run log binário (.runlog), lido direto via mmap, sem cache.
+    """
+    if is_runlog(csv_path):
+        return read_runlog(csv_path, columns)
+    parser = partial(parse_benchmark_csv, columns=columns)
+    return load_csv_cached(csv_path, parser, projection_namespace(columns), use_cache=use_cache)
+
+
+# =====================================================================
+# LEITURA REVERSA (ÚLTIMAS N LINHAS)
+# =====================================================================
+
+def _csv_header(f):
+    """(cabeçalho, offset do corpo) - cabeçalho vazio quando o arquivo não tem um"""
+    first = f.readline()
+    if first.lstrip(b"\xef\xbb\xbf").startswith(b"timestamp,"):
+        return first, len(first)
+    return b"", 3 if first.startswith(b"\xef\xbb\xbf") else 0
+
+
+def _iter_blocks_backwards(f, start, end, block_bytes, max_block_bytes):
+    """Blocos de linhas completas de [start, end), do fim do arquivo para o início"""
+    carry = b""
+    pos = end
+    while pos > start:
+        read_from = max(start, pos - block_bytes)
+        f.seek(read_from)
+        block = f.read(pos - read_from) + carry
+        pos = read_from
+        carry = b""
+        if pos > start:
+            # A primeira linha do bloco pode ter começado antes: fica para o próximo
+            cut = block.find(b"\n")
+            if cut < 0:
+                carry = block
+                continue
+            carry, block = block[:cut + 1], block[cut + 1:]
+        block_bytes = min(block_bytes * 2, max_block_bytes)
+        if block.strip():
+            yield block
+
+
+def _iter_frames_backwards(csv_path, columns):
+    """Frames canônicos de blocos cada vez maiores, do fim do arquivo para o início"""
+    block_bytes = RECENT_CONFIG["block_kb"] * 1024
+    max_block_bytes = RECENT_CONFIG["max_block_mb"] * 1024 * 1024
+
+    if is_runlog(csv_path):
+        # Run log: registros de tamanho fixo, os blocos são só intervalos
+        from metrics_runlog import RunLog
+        with RunLog(csv_path) as log:
+            record_size = log.records.dtype.itemsize
+            rows = max(1, block_bytes // record_size)
+            stop = len(log)
+            while stop > 0:
+                start = max(0, stop - rows)
+                yield log.to_frame(columns, start, stop)
+                stop = start
+                rows = min(rows * 2, max(1, max_block_bytes // record_size))
+        return
+
+    with open(csv_path, "rb") as f:
+        header, start = _csv_header(f)
+        end = os.fstat(f.fileno()).st_size
+        for block in _iter_blocks_backwards(f, start, end, block_bytes, max_block_bytes):
+            yield parse_benchmark_csv(io.BytesIO(header + block), columns=columns)
+
+
+def _expected_groups(group_cols, group_values):
+    """
+    Combinações de grupos a completar, ou None se alguma coluna não tem os
+    valores pedidos: aí os grupos vistos até agora são só parte do arquivo
+    (um modelo mais antigo pode aparecer adiante) e não dá para parar cedo
+    """
+    if any(group_values.get(col) is None for col in group_cols):
+        return None
+    return list(itertools.product(*(list(group_values[col]) for col in group_cols)))
+
+
+def read_recent_rows(csv_path, last_n, row_filter=None, group_cols=None, group_values=None,
+                     columns=None):
+    """
+    Lê só as linhas mais recentes de um CSV de benchmark, do fim para o início
+
+    O Metrics.WriteCsv apenas anexa linhas, então a ordem do arquivo é a ordem
+    das execuções. A varredura para assim que cada grupo tem last_n linhas que
+    passam pelo filtro; o custo depende de N, não do tamanho do histórico.
+
+    Args:
+        csv_path: Caminho do CSV
+        last_n: Linhas a manter por grupo (ou no total, se group_cols for None)
+        row_filter: Função opcional (frame) -> frame filtrado, aplicada a cada bloco
+        group_cols: Colunas que definem os grupos (ex.: ["model", "variant"])
+        group_values: {coluna: valores pedidos}; os grupos esperados são todas
+            as combinações. Só com valores para todas as group_cols a
+            varredura pode parar cedo; sem eles (ex.: todos os modelos) o
+            arquivo é lido inteiro. Um grupo esperado que não existe no
+            arquivo também faz a varredura ir até o início
+        columns: Projeção de colunas (None = todas)
+
+    Returns:
+        DataFrame canônico com as linhas na ordem do arquivo
+    """
+    columns = project_columns(columns)
+    group_cols = list(group_cols) if group_cols else None
+    group_values = group_values or {}
+
+    parts, found, total = [], {}, 0
+    expected = _expected_groups(group_cols, group_values) if group_cols else None
+    for df in _iter_frames_backwards(csv_path, columns):
+        if row_filter is not None:
+            df = row_filter(df)
+        if df.empty:
+            continue
+        parts.append(df)
+        total += len(df)
+
+        if group_cols is None:
+            if total >= last_n:
+                break
+            continue
+        if expected is None:
+            continue
+        for key, n in df.groupby(group_cols, observed=True).size().items():
+            key = key if isinstance(key, tuple) else (key,)
+            found[key] = found.get(key, 0) + int(n)
+        if all(found.get(key, 0) >= last_n for key in expected):
+            break
+
+    df = concat_frames(parts[::-1], columns).reset_index(drop=True)
+    if df.empty:
+        return df
+    if group_cols is None:
+        return df.tail(last_n).reset_index(drop=True)
+    return df.groupby(group_cols, group_keys=False, observed=True).tail(last_n).reset_index(drop=True)
+
+
+# =====================================================================
+# CARREGAMENTO PARALELO
+# =====================================================================
+
+def resolve_workers(workers, n_files):
+    """Número de workers: 0/None = automático (limitado pelos núcleos e por 8)"""
+    if not workers or workers <= 0:
+        workers = min(8, os.cpu_count() or 1)
+    return max(1, min(workers, n_files))
+
+
+def load_csvs_parallel(csv_paths, loader, workers=None):
+    """
+    Carrega vários CSVs em paralelo (thread pool; o parser C do pandas e a
+    leitura de disco liberam o GIL) e devolve os resultados na ordem de entrada
+
+    Args:
+        csv_paths: Lista de caminhos
+        loader: Função (caminho) -> DataFrame
+        workers: Número de workers (0/None = automático)
+
+    Returns:
+        (lista de (caminho, DataFrame), lista de (caminho, exceção))
+    """
+    loaded, failures = [], []
+    n_workers = resolve_workers(workers, len(csv_paths))
+
+    if n_workers == 1:
+        for path in csv_paths:
+            try:
+                loaded.append((path, loader(path)))
+            except Exception as e:
+                failures.append((path, e))
+        return loaded, failures
+
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(loader, path) for path in csv_paths]
+        for path, future in zip(csv_paths, futures):
+            try:
+                loaded.append((path, future.result()))
+            except Exception as e:
+                failures.append((path, e))
+    return loaded, failures
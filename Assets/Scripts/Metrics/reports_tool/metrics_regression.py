@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Metrics Regression - Verificação de regressões para pipelines automatizados
+
+Usado pelo modo --check-regressions dos reports. Para cada (model, variant),
+o run_id mais recente é comparado com a janela dos run_ids anteriores
+(baseline móvel). O resultado vai para um arquivo de veredito em JSON e para
+o código de saída do processo: o benchmark noturno falha assim que load_ms,
+mem_mb ou fps_1pc_low pioram além dos limites.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Configurações da verificação de regressões
+REGRESSION_CONFIG = {
+    "baseline_runs": 5,      # run_ids anteriores que formam a baseline
+    "thresholds_pct": {      # piora máxima tolerada (%) na média do último run
+        "load_ms": 10.0,
+        "mem_mb": 5.0,
+        "fps_1pc_low": 10.0,
+    },
+    "verdict_file": "regression_verdict.json",
+    "exit_code": 3,          # código de saída com regressão (1 continua sendo erro)
+}
+
+
+def parse_thresholds(spec, defaults=None):
+    """
+    "load_ms=10,mem_mb=5" -> {"load_ms": 10.0, "mem_mb": 5.0}
+
+    Métricas omitidas mantêm o padrão; spec vazio devolve os padrões.
+    """
+    thresholds = dict(REGRESSION_CONFIG["thresholds_pct"] if defaults is None else defaults)
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        metric, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Limite inválido '{item}' (use métrica=porcentagem)")
+        thresholds[metric.strip()] = float(value)
+    return thresholds
+
+
+def missing_inputs(csv_paths):
+    """
+    CSVs de entrada que não existem (impressos no log)
+
+    O gate não pode julgar um histórico parcial: com um arquivo faltando, o
+    veredito viria só dos demais (ou de dados antigos no banco).
+    """
+    missing = [p for p in csv_paths if not os.path.isfile(p)]
+    for path in missing:
+        print(f"[py] ❌ CSV não encontrado: {path}")
+    return missing
+
+
+def failed_inputs(failures):
+    """
+    Entradas que não puderam ser lidas ([(caminho, exceção)] dos loaders), impressas no log
+
+    Como em missing_inputs: com um CSV ilegível o veredito viria só dos demais.
+    """
+    for path, e in failures:
+        print(f"[py] ❌ Erro ao carregar {path}: {e}")
+    return [path for path, _ in failures]
+
+
+def split_latest_run(df, group_cols, baseline_runs=None):
+    """
+    Separa o último run_id de cada grupo e os baseline_runs anteriores
+
+    Os run_ids são ordenados pelo último timestamp de cada um dentro do grupo.
+
+    Returns:
+        (latest, baseline) - frames com as execuções do último run e da
+        janela de baseline; grupos com um único run_id ficam só em latest
+    """
+    baseline_runs = REGRESSION_CONFIG["baseline_runs"] if baseline_runs is None else baseline_runs
+    keys = list(group_cols) + ["run_id"]
+    runs = df.groupby(keys, observed=True, sort=False)["timestamp"].max().reset_index()
+    runs["run_rank"] = runs.groupby(list(group_cols), observed=True)["timestamp"].rank(method="first",
+                                                                                      ascending=False)
+    ranked = df.merge(runs[keys + ["run_rank"]], on=keys, how="inner")
+    latest = ranked[ranked["run_rank"] == 1].drop(columns="run_rank")
+    baseline = ranked[(ranked["run_rank"] > 1) & (ranked["run_rank"] <= baseline_runs + 1)].drop(columns="run_rank")
+    return latest, baseline
+
+
+def run_ids_by_group(df, group_cols):
+    """{chave do grupo: [run_ids em ordem cronológica]}"""
+    if df.empty:
+        return {}
+    runs = df.groupby(list(group_cols) + ["run_id"], observed=True)["timestamp"].max().reset_index()
+    runs = runs.sort_values("timestamp", kind="stable")
+    return {key if isinstance(key, tuple) else (key,): [str(r) for r in group["run_id"]]
+            for key, group in runs.groupby(list(group_cols), observed=True, sort=False)}
+
+
+def evaluate_regressions(changes, thresholds, lower_is_better):
+    """
+    Aplica os limites às variações do último run contra a baseline
+
+    Args:
+        changes: DataFrame com model, variant, metric, baseline, latest
+        thresholds: {métrica: piora máxima em %}
+        lower_is_better: Conjunto das métricas em que menor é melhor
+
+    Returns:
+        O mesmo frame (só métricas com limite) com worse_pct (piora em %,
+        negativa quando melhorou), threshold_pct e regression (0/1)
+    """
+    changes = changes[changes["metric"].isin(list(thresholds))].copy()
+    base = changes["baseline"].to_numpy(dtype=np.float64)
+    latest = changes["latest"].to_numpy(dtype=np.float64)
+    sign = np.where(changes["metric"].isin(list(lower_is_better)).to_numpy(), 1.0, -1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        worse_pct = np.where(base != 0, sign * (latest - base) / np.abs(base) * 100.0, np.nan)
+    changes["worse_pct"] = worse_pct
+    changes["threshold_pct"] = changes["metric"].map(thresholds).astype(np.float64)
+    changes["regression"] = (worse_pct > changes["threshold_pct"].to_numpy()).astype(int)
+    return changes
+
+
+def build_verdict(changes, skipped, thresholds, baseline_runs, latest_runs, baseline_run_ids):
+    """
+    Monta o veredito (status, código de saída, regressões e detalhes por grupo)
+
+    Args:
+        changes: Saída de evaluate_regressions
+        skipped: [(model, variant)] sem baseline (um único run_id)
+        latest_runs / baseline_run_ids: {(model, variant): run_id(s)}
+    """
+    regressions = changes[changes["regression"] == 1]
+    if changes.empty:
+        status, code = "no_baseline", 0
+    elif len(regressions):
+        status, code = "fail", REGRESSION_CONFIG["exit_code"]
+    else:
+        status, code = "pass", 0
+
+    def record(row):
+        return {
+            "model": str(row.model),
+            "variant": str(row.variant),
+            "metric": row.metric,
+            "latest_run_id": latest_runs.get((row.model, row.variant)),
+            "baseline": float(row.baseline),
+            "latest": float(row.latest),
+            "worse_pct": float(row.worse_pct),
+            "threshold_pct": float(row.threshold_pct),
+            "regression": int(row.regression),
+        }
+
+    groups = {}
+    for row in changes.itertuples(index=False):
+        key = (row.model, row.variant)
+        group = groups.setdefault(key, {
+            "model": str(row.model),
+            "variant": str(row.variant),
+            "latest_run_id": latest_runs.get(key),
+            "baseline_run_ids": baseline_run_ids.get(key, []),
+            "regression": 0,
+            "metrics": {},
+        })
+        entry = record(row)
+        group["metrics"][row.metric] = {k: entry[k] for k in ("baseline", "latest", "worse_pct", "threshold_pct",
+                                                               "regression")}
+        group["regression"] = max(group["regression"], entry["regression"])
+
+    return {
+        "status": status,
+        "exit_code": code,
+        "timestamp": datetime.now().isoformat(),
+        "baseline_runs": baseline_runs,
+        "thresholds_pct": thresholds,
+        "checked": len(groups),
+        "regressions": [record(row) for row in regressions.itertuples(index=False)],
+        "groups": list(groups.values()),
+        "skipped": [{"model": str(m), "variant": str(v), "reason": "sem run_id anterior para a baseline"}
+                    for m, v in skipped],
+    }
+
+
+def write_verdict(out_dir, verdict):
+    """Grava o veredito em out_dir (ao lado do data.json) e devolve o caminho"""
+    path = os.path.join(out_dir, REGRESSION_CONFIG["verdict_file"])
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(verdict, f, indent=2)
+    return path
+
+
+def print_verdict(verdict, path):
+    """Resumo do veredito no log, no mesmo formato [py] dos reports"""
+    for reg in verdict["regressions"]:
+        print(f"[py] ❌ Regressão: {reg['model']}/{reg['variant']} {reg['metric']} "
+              f"{reg['baseline']:.2f} → {reg['latest']:.2f} (piora de {reg['worse_pct']:.1f}%, "
+              f"limite {reg['threshold_pct']:g}%) no run {reg['latest_run_id']}")
+    for s in verdict["skipped"]:
+        print(f"[py] ⚠️ {s['model']}/{s['variant']}: {s['reason']}")
+    if verdict["status"] == "pass":
+        print(f"[py] ✓ Nenhuma regressão em {verdict['checked']} grupos")
+    elif verdict["status"] == "no_baseline":
+        print("[py] ⚠️ Nenhum grupo com baseline para comparar")
+    print(f"[py] Veredito: {verdict['status']} (código {verdict['exit_code']}) → {path}")
+
+
+def check_regressions(df, group_cols, metrics, changes_fn, thresholds, lower_is_better, baseline_runs=None):
+    """
+    Fluxo comum do --check-regressions
+
+    Args:
+        df: Execuções com timestamp, run_id, grupos e métricas
+        changes_fn: (latest, baseline, metrics) -> DataFrame com model,
+            variant, metric, baseline e latest (médias de cada janela),
+            calculado com o agregador do próprio report
+        thresholds / lower_is_better: Ver evaluate_regressions
+
+    Returns:
+        Veredito (ver build_verdict)
+    """
+    baseline_runs = REGRESSION_CONFIG["baseline_runs"] if baseline_runs is None else baseline_runs
+    latest, baseline = split_latest_run(df, group_cols, baseline_runs)
+    latest_runs = {k: ids[-1] for k, ids in run_ids_by_group(latest, group_cols).items()}
+    baseline_run_ids = run_ids_by_group(baseline, group_cols)
+    skipped = [k for k in latest_runs if k not in baseline_run_ids]
+
+    metrics = [m for m in metrics if m in df.columns and m in thresholds]
+    if baseline.empty or not metrics:
+        changes = pd.DataFrame(columns=["model", "variant", "metric", "baseline", "latest"])
+    else:
+        changes = changes_fn(latest, baseline, metrics)
+    changes = evaluate_regressions(changes, thresholds, lower_is_better)
+    return build_verdict(changes, skipped, thresholds, baseline_runs, latest_runs, baseline_run_ids)
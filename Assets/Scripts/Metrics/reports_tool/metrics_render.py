@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Metrics Render - Construção e serialização paralela dos gráficos dos reports
+
+Os gráficos de um report são independentes: cada um é construído (Plotly) e
+serializado (to_html) num worker de um pool de processos. A validação de
+figuras do Plotly é Python puro, então threads não ganhariam nada com o GIL.
+Os objetos grandes (DataFrame das execuções) vão num contexto enviado uma vez
+por worker, não a cada gráfico. As seções recebem marcadores no lugar dos
+gráficos e são preenchidas depois, na ordem em que foram montadas.
+
+Séries longas: acima de webgl_threshold pontos o trace vira Scattergl, e as
+linhas do tempo são reduzidas a display_points pontos por LTTB (Largest-
+Triangle-Three-Buckets) só para exibição; as estatísticas usam os dados todos.
+
+plotly.js (--plotlyjs): cdn (versão do plotly instalado), inline (uma cópia
+embutida no HTML, funciona offline) ou shared (uma cópia em cache na pasta
+acima do report, ex.: reports/ ao lado de reports/latest). Com --lazy-charts
+cada figura vai como JSON e só é criada quando entra na tela
+(IntersectionObserver).
+"""
+
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from html import escape
+
+import numpy as np
+
+# Configurações da renderização
+RENDER_CONFIG = {
+    "workers": 0,               # 0 = automático (núcleos, limitado por max_workers)
+    "max_workers": 8,
+    "parallel_min_rows": 20000,  # abaixo disso o custo de subir o pool não compensa
+    "webgl_threshold": 1000,    # pontos por trace acima dos quais usa Scattergl
+    "display_points": 2000,     # pontos exibidos por série temporal (LTTB)
+    "lazy_root_margin": "300px",  # antecedência com que um gráfico lazy é criado antes de entrar na tela
+}
+
+PLOTLYJS_MODES = ("cdn", "inline", "shared")
+
+# Cria cada gráfico lazy na primeira vez que ele se aproxima da área visível
+LAZY_LOADER_JS = """
+(function () {
+  function draw(el) {
+    var payload = document.getElementById(el.id + "-data");
+    if (!payload || el.dataset.drawn) { return; }
+    el.dataset.drawn = "1";
+    var fig = JSON.parse(payload.textContent);
+    Plotly.newPlot(el, fig.data, fig.layout, {responsive: true});
+  }
+  var charts = Array.prototype.slice.call(document.querySelectorAll(".lazy-chart"));
+  window.addEventListener("beforeprint", function () { charts.forEach(draw); });
+  if (!("IntersectionObserver" in window)) { charts.forEach(draw); return; }
+  var observer = new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      if (entry.isIntersecting) { observer.unobserve(entry.target); draw(entry.target); }
+    });
+  }, {rootMargin: "%(margin)s"});
+  charts.forEach(function (el) { observer.observe(el); });
+})();
+"""
+
+# Contexto do worker (objetos grandes compartilhados pelos gráficos)
+_context = {}
+
+
+class Shared:
+    """Referência a um objeto do contexto, resolvida dentro do worker"""
+    def __init__(self, key):
+        self.key = key
+
+
+def _init_worker(context):
+    global _context
+    _context = context
+
+
+def _resolve(value):
+    return _context[value.key] if isinstance(value, Shared) else value
+
+
+def _prebuilt(fig):
+    """Builder de uma figura já construída (ex.: vinda do FigureRegistry)"""
+    return fig
+
+
+def chart_html(fig, div_id, lazy=False, **html_options):
+    """
+    HTML de um gráfico sem plotly.js
+
+    lazy: só um <div> reservando a altura e o JSON da figura num
+    <script type="application/json">; o LAZY_LOADER_JS cria o gráfico.
+    """
+    if not lazy:
+        return fig.to_html(include_plotlyjs=False, div_id=div_id, **html_options)
+    height = fig.layout.height or 450
+    payload = fig.to_json().replace("</", "<\\/")  # não fecha o <script> antes da hora
+    return (f'<div id="{div_id}" class="lazy-chart" style="width:100%;height:{height}px;"></div>'
+            f'<script type="application/json" id="{div_id}-data">{payload}</script>')
+
+
+def lazy_loader_script():
+    """<script> do carregamento lazy (uma vez por página, no fim do <body>)"""
+    return f"<script>{LAZY_LOADER_JS % {'margin': RENDER_CONFIG['lazy_root_margin']}}</script>"
+
+
+def plotlyjs_script(mode, out_dir):
+    """
+    <script> que carrega o plotly.js, na versão do plotly instalado
+
+    cdn: cdn.plot.ly; inline: cópia minificada embutida; shared: arquivo
+    plotly-<versão>.min.js gravado uma vez na pasta acima de out_dir e
+    referenciado por caminho relativo (reaproveitado por todos os reports).
+    """
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+    version = get_plotlyjs_version()
+    if mode == "inline":
+        return f'<script type="text/javascript">{get_plotlyjs()}</script>'
+    if mode == "shared":
+        out_dir = os.path.abspath(out_dir)
+        shared_dir = os.path.dirname(out_dir)
+        name = f"plotly-{version}.min.js"
+        path = os.path.join(shared_dir, name)
+        if not os.path.exists(path):
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(get_plotlyjs())
+            os.replace(tmp, path)  # atômico: reports gerados em paralelo não veem arquivo pela metade
+            print(f"[py] plotly.js compartilhado: {path}")
+        src = os.path.relpath(path, out_dir).replace(os.sep, "/")
+        return f'<script src="{escape(src)}" charset="utf-8"></script>'
+    return f'<script src="https://cdn.plot.ly/plotly-{version}.min.js" charset="utf-8"></script>'
+
+
+def _render_job(job):
+    """Constrói e serializa um gráfico; devolve (div_id, html, segundos de build, segundos de to_html)"""
+    div_id, builder, args, kwargs, html_options, lazy = job
+    start = time.perf_counter()
+    fig = builder(*[_resolve(a) for a in args], **{k: _resolve(v) for k, v in kwargs.items()})
+    built = time.perf_counter()
+    html = chart_html(fig, div_id, lazy, **html_options)
+    return div_id, html, built - start, time.perf_counter() - built
+
+
+def resolve_render_workers(workers, n_jobs, n_rows):
+    """Workers efetivos: 1 (sequencial) para poucos gráficos ou dados pequenos"""
+    if workers is None or workers <= 0:
+        if n_rows < RENDER_CONFIG["parallel_min_rows"]:
+            return 1
+        workers = min(RENDER_CONFIG["max_workers"], os.cpu_count() or 1)
+    return max(1, min(workers, n_jobs))
+
+
+class ChartRenderer:
+    """
+    Fila de gráficos de um report
+
+    chart() registra o gráfico e devolve um marcador para a seção; render()
+    constrói tudo (em paralelo quando compensa) e fill() troca os marcadores
+    pelo HTML de cada gráfico.
+    """
+    def __init__(self, context=None, workers=0, n_rows=0, lazy=False):
+        self.context = dict(context or {})
+        self.lazy = lazy
+        self.workers = workers
+        self.n_rows = n_rows
+        self.jobs = []
+        self.html = {}
+        self.timings = []   # [(div_id, build_s, to_html_s)] na ordem dos gráficos
+        self.wall_s = 0.0
+        self.used_workers = 1
+
+    def ref(self, key):
+        return Shared(key)
+
+    def chart(self, div_id, builder, *args, html_options=None, **kwargs):
+        """Agenda builder(*args, **kwargs).to_html(div_id=div_id); devolve o marcador"""
+        self.jobs.append((div_id, builder, args, kwargs, html_options or {}, self.lazy))
+        return self.placeholder(div_id)
+
+    def figure(self, div_id, fig, html_options=None):
+        """Agenda só a serialização de uma figura já construída; devolve o marcador"""
+        return self.chart(div_id, _prebuilt, fig, html_options=html_options)
+
+    @staticmethod
+    def placeholder(div_id):
+        return f"<!--chart:{div_id}-->"
+
+    def _run_sequential(self):
+        _init_worker(self.context)
+        try:
+            return [_render_job(job) for job in self.jobs]
+        finally:
+            _init_worker({})
+
+    def render(self):
+        """Constrói e serializa todos os gráficos agendados"""
+        start = time.perf_counter()
+        self.used_workers = resolve_render_workers(self.workers, len(self.jobs), self.n_rows)
+        results = None
+        if self.used_workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=self.used_workers, initializer=_init_worker,
+                                         initargs=(self.context,)) as pool:
+                    results = list(pool.map(_render_job, self.jobs))
+            except (BrokenProcessPool, OSError) as e:
+                print(f"[py] ⚠️ Pool de renderização falhou ({e}); gerando gráficos em sequência")
+                self.used_workers = 1
+        if results is None:
+            results = self._run_sequential()
+
+        self.html = {div_id: html for div_id, html, _, _ in results}
+        self.timings = [(div_id, build_s, html_s) for div_id, _, build_s, html_s in results]
+        self.wall_s = time.perf_counter() - start
+        return self.html
+
+    def fill(self, sections):
+        """Troca os marcadores das seções pelo HTML dos gráficos"""
+        filled = []
+        for section in sections:
+            for div_id, html in self.html.items():
+                marker = self.placeholder(div_id)
+                if marker in section:
+                    section = section.replace(marker, html)
+            filled.append(section)
+        return filled
+
+    def print_timings(self):
+        """Tempo de cada gráfico (build + to_html) e o tempo total de parede"""
+        for div_id, build_s, html_s in self.timings:
+            print(f"[py]   {div_id}: build {build_s * 1000:.0f} ms, to_html {html_s * 1000:.0f} ms")
+        total = sum(b + h for _, b, h in self.timings)
+        print(f"[py] ✓ {len(self.timings)} gráficos em {self.wall_s:.2f}s com {self.used_workers} worker(s) "
+              f"(soma dos gráficos {total:.2f}s)")
+
+    def timings_dict(self):
+        """Tempos para o data.json"""
+        return {
+            "workers": self.used_workers,
+            "wall_s": self.wall_s,
+            "charts": [{"div_id": d, "build_s": b, "to_html_s": h} for d, b, h in self.timings],
+        }
+
+
+def scatter_class(n_points):
+    """go.Scattergl para traces grandes (WebGL), go.Scatter (SVG) para os demais"""
+    import plotly.graph_objs as go
+    return go.Scattergl if n_points > RENDER_CONFIG["webgl_threshold"] else go.Scatter
+
+
+def _as_float(x):
+    """Eixo x como float64 (datas viram o inteiro interno; só a proporção importa)"""
+    import pandas as pd
+    if isinstance(x, (pd.Series, pd.Index)) and pd.api.types.is_datetime64_any_dtype(x.dtype):
+        return x.array.asi8.astype(np.float64)
+    return np.asarray(x, dtype=np.float64)
+
+
+def lttb_indices(x, y, n_out=None):
+    """
+    Largest-Triangle-Three-Buckets: índices dos pontos exibidos de uma série
+
+    O primeiro e o último ponto ficam; o interior é dividido em n_out - 2
+    baldes e de cada um fica o ponto que forma o maior triângulo com o ponto
+    escolhido no balde anterior e a média do balde seguinte. Preserva picos e
+    vales que uma amostragem uniforme perderia. Médias dos baldes por
+    reduceat; o laço é por balde (n_out), não por ponto.
+    """
+    n_out = RENDER_CONFIG["display_points"] if n_out is None else n_out
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), np.asarray(y, dtype=np.float64)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # balde i = [edges[i], edges[i + 1])
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    mean_x = np.append(mean_x[1:], x[n - 1])  # "próximo balde" do último é o último ponto
+    mean_y = np.append(mean_y[1:], y[n - 1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - mean_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (mean_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def display_indices(x, y, n_out=None):
+    """Índices exibidos de uma série: sem NaN em y e reduzidos por LTTB se passar de n_out"""
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(y))
+    if len(valid) == len(y):
+        return lttb_indices(x, y, n_out)
+    x = x.iloc[valid] if hasattr(x, "iloc") else np.asarray(x)[valid]
+    return valid[lttb_indices(x, y[valid], n_out)]
+
+
+def data_fingerprint(df):
+    """Hash do conteúdo de um DataFrame (colunas e valores, sem o índice)"""
+    import pandas as pd
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("|".join(map(str, df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class FigureRegistry:
+    """
+    Cache de figuras e agregados de um report, por (spec, fingerprint dos dados)
+
+    HTML, PNG e PDF pedem a mesma spec e recebem o mesmo objeto; o estilo de
+    cada formato entra em styled() como override de layout sobre uma cópia.
+    """
+    def __init__(self):
+        self.items = {}
+        self.hits = 0
+        self.misses = 0
+        self._fingerprints = {}  # id(df) -> (df, fingerprint); guarda o df para o id não ser reutilizado
+
+    def fingerprint(self, data):
+        if data is None:
+            return None
+        cached = self._fingerprints.get(id(data))
+        if cached is None or cached[0] is not data:
+            cached = (data, data_fingerprint(data))
+            self._fingerprints[id(data)] = cached
+        return cached[1]
+
+    def get(self, spec, builder, *args, data=None, **kwargs):
+        """builder(*args, **kwargs) memoizado; `data` é o DataFrame de que o resultado depende"""
+        key = (spec, self.fingerprint(data))
+        if key in self.items:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.items[key] = builder(*args, **kwargs)
+        return self.items[key]
+
+    def styled(self, spec, builder, *args, layout=None, data=None, **kwargs):
+        """Figura da spec com overrides de layout, sem alterar a versão em cache"""
+        fig = self.get(spec, builder, *args, data=data, **kwargs)
+        if not layout:
+            return fig
+        fig = type(fig)(fig)
+        fig.update_layout(**layout)
+        return fig
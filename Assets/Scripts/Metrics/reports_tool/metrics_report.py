@@ -1,5 +1,6 @@
 import argparse, os, sys, json, subprocess
 from datetime import datetime
+from functools import partial
 
 # Configurações centralizadas
 CONFIG = {
@@ -10,16 +11,18 @@ CONFIG = {
     "default_pdf_engine": "chrome",
     "max_fps_samples": 50,
     "min_frame_delta": 0.001,
-    "max_frame_delta": 1.0
+    "max_frame_delta": 1.0,
+    "stream_recent_rows": 200,  # execuções por grupo nas timelines do modo --stream --last-n 0
 }
 
 # Verificar dependências
 try:
     import pandas as pd
-    print("[py] ✓ pandas carregado")
+    import numpy as np
+    print("[py] ✓ pandas e numpy carregados")
 except ImportError as e:
-    print(f"[py] ❌ Erro ao carregar pandas: {e}")
-    print("[py] Instale com: pip install pandas")
+    print(f"[py] ❌ Erro ao carregar pandas/numpy: {e}")
+    print("[py] Instale com: pip install pandas numpy")
     sys.exit(1)
 
 try:
@@ -31,6 +34,15 @@ except ImportError as e:
     print("[py] Instale com: pip install plotly")
     sys.exit(1)
 
+from metrics_ingest import (load_benchmark_csv, concat_frames, load_csvs_parallel, resolve_workers,
+                            read_recent_rows, project_columns)
+from metrics_store import MetricsStore
+from metrics_stream import StreamingAggregator, TailBuffer, stream_csvs
+from metrics_render import (scatter_class, display_indices, chart_html, PLOTLYJS_MODES, plotlyjs_script,
+                            lazy_loader_script)
+from metrics_regression import (REGRESSION_CONFIG, parse_thresholds, check_regressions, write_verdict,
+                                print_verdict, missing_inputs, failed_inputs)
+
 def parse_args():
     ap = argparse.ArgumentParser()
     # Removido --csv e --auto-discover - agora usamos --csv-files
@@ -38,19 +50,39 @@ def parse_args():
     ap.add_argument("--out", required=True)
     ap.add_argument("--model", default="all")  # "all" ou nome de modelo
     ap.add_argument("--variants", default=f"{CONFIG['base_variant']},{CONFIG['draco_variant']},{CONFIG['meshopt_variant']}")
-    ap.add_argument("--last-n", type=int, default=CONFIG["default_last_n"])
+    ap.add_argument("--last-n", type=int, default=CONFIG["default_last_n"],
+                    help="Últimas N execuções por (model, variant); 0 = histórico completo")
     ap.add_argument("--html", action="store_true")
     ap.add_argument("--pdf", action="store_true")
     ap.add_argument("--open", action="store_true")
     ap.add_argument("--pdf-engine", default=CONFIG["default_pdf_engine"])  # "chrome" ou "wkhtml"
     ap.add_argument("--pdf-engine-path", default="")
+    ap.add_argument("--no-cache", action="store_true", help="Ignora o cache colunar e refaz o parse dos CSVs")
+    ap.add_argument("--workers", type=int, default=0, help="Workers para carregar os CSVs em paralelo (0 = automático)")
+    ap.add_argument("--stream", action="store_true", help="Lê os CSVs em blocos com memória limitada (históricos muito grandes)")
+    ap.add_argument("--chunk-mb", type=float, default=None, help="Tamanho dos blocos no modo --stream (MB)")
+    ap.add_argument("--db", default=None,
+                    help="Banco SQLite (metrics_store): importa os CSVs e filtra/agrega via consultas indexadas")
+    ap.add_argument("--full-scan", action="store_true",
+                    help="Carrega o histórico inteiro mesmo com --last-n (desativa a leitura reversa)")
+    ap.add_argument("--plotlyjs", choices=PLOTLYJS_MODES, default="cdn",
+                    help="Origem do plotly.js: cdn, inline (embutido, offline) ou shared (cópia em cache na pasta acima de --out)")
+    ap.add_argument("--lazy-charts", action="store_true",
+                    help="Gráficos como JSON, criados só quando entram na tela (abre relatórios grandes mais rápido)")
+    ap.add_argument("--check-regressions", action="store_true",
+                    help="Compara o último run_id de cada (model, variant) com a baseline e sai com código "
+                         f"{REGRESSION_CONFIG['exit_code']} se houver regressão (sem gráficos)")
+    ap.add_argument("--baseline-runs", type=int, default=REGRESSION_CONFIG["baseline_runs"],
+                    help="--check-regressions: run_ids anteriores que formam a baseline")
+    ap.add_argument("--regression-thresholds", default="",
+                    help="--check-regressions: piora máxima em %% (ex.: load_ms=10,mem_mb=5,fps_1pc_low=10)")
     return ap.parse_args()
 
 # Função discover_model_csvs() removida - não é mais necessária
 # O C# agora passa os caminhos diretamente via --csv-files
 
-def load_multiple_csvs(csv_paths):
-    """Carrega e combina múltiplos CSVs de modelos"""
+def load_multiple_csvs(csv_paths, use_cache=True, workers=0, columns=None):
+    """Carrega (em paralelo) e combina múltiplos CSVs de modelos"""
     print(f"[py] ========================================")
     print(f"[py] LOAD_MULTIPLE_CSVS - DIAGNÓSTICO")
     print(f"[py] ========================================")
@@ -69,15 +101,20 @@ def load_multiple_csvs(csv_paths):
             size = os.path.getsize(path)
             print(f"[py]      Tamanho: {size} bytes")
     
+    # Parse concorrente; diagnósticos impressos depois, na ordem dos arquivos
+    n_workers = resolve_workers(workers, len(csv_paths))
+    print(f"[py] Carregando {len(csv_paths)} CSVs com {n_workers} worker(s)")
+    loader = partial(load_benchmark_csv, columns=columns or REPORT_COLUMNS, use_cache=use_cache)
+    loaded, failures = load_csvs_parallel(csv_paths, loader, workers=n_workers)
+
     all_dfs = []
-    for csv_path in csv_paths:
-        try:
-            df = load_csv(csv_path)
-            if not df.empty:
-                all_dfs.append(df)
-                print(f"[py] Adicionado {len(df)} linhas de {csv_path}")
-        except Exception as e:
-            print(f"[py] Erro ao carregar {csv_path}: {e}")
+    for csv_path, df in loaded:
+        check_csv(df)
+        if not df.empty:
+            all_dfs.append(df)
+            print(f"[py] Adicionado {len(df)} linhas de {csv_path}")
+    for csv_path, e in failures:
+        print(f"[py] Erro ao carregar {csv_path}: {e}")
     
     if not all_dfs:
         print("[py] Nenhum CSV válido foi carregado")
@@ -88,7 +125,7 @@ def load_multiple_csvs(csv_paths):
         print("[py] ❌ Nenhum DataFrame válido foi criado")
         return pd.DataFrame()
     
-    combined_df = pd.concat(all_dfs, ignore_index=True)
+    combined_df = concat_frames(all_dfs)
     print(f"[py] ✅ Total combinado: {len(combined_df)} linhas de {len(all_dfs)} arquivos")
     
     # Log detalhado do DataFrame combinado
@@ -118,22 +155,10 @@ def load_multiple_csvs(csv_paths):
     
     return combined_df
 
-def load_csv(csv_path: str) -> pd.DataFrame:
-    try:
-        df = pd.read_csv(csv_path)
-        print(f"[py] CSV carregado: {df.shape[0]} linhas, {df.shape[1]} colunas")
-        print(f"[py] Colunas: {df.columns.tolist()}")
-    except Exception as e:
-        print(f"[py] Erro ao carregar CSV: {e}")
-        raise
-    
-    # Remove linhas vazias ou com dados inválidos
-    if 'timestamp' in df.columns:
-        df = df.dropna(subset=['timestamp']).copy()
-        df = df[df['timestamp'].str.strip() != ''].copy()
-    else:
-        print("[py] ⚠️ Coluna 'timestamp' não encontrada")
-        return df
+def check_csv(df: pd.DataFrame):
+    """Imprime o diagnóstico de um CSV carregado"""
+    print(f"[py] CSV carregado: {df.shape[0]} linhas, {df.shape[1]} colunas")
+    print(f"[py] Colunas: {df.columns.tolist()}")
     
     # Validação de dados - o CSV deve estar correto
     if 'model' in df.columns and 'variant' in df.columns:
@@ -148,29 +173,6 @@ def load_csv(csv_path: str) -> pd.DataFrame:
             print("[py] ⚠️ AVISO: Possível inconsistência detectada - variant contém valores numéricos e model contém nomes de variantes")
             print("[py] ⚠️ Verifique se os dados foram salvos corretamente no C#")
             print("[py] ⚠️ O script Python não corrige automaticamente mais - confie nos dados do CSV")
-    
-    # Compatibilidade com CSV antigo (sem run_id/fps_window_s/test_number)
-    for col in ["run_id", "fps_window_s", "test_number"]:
-        if col not in df.columns:
-            if col == "run_id":
-                # cria run_id por "lote" (timestamp truncado a minuto)
-                try:
-                    df["run_id"] = pd.to_datetime(df["timestamp"]).dt.strftime("%Y%m%d_%H%M")
-                except Exception:
-                    df["run_id"] = "run"
-            elif col == "fps_window_s":
-                df["fps_window_s"] = 5.0
-            elif col == "test_number":
-                df["test_number"] = 1  # Assumir teste único para dados antigos
-    # timestamp em datetime
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-    else:
-        df["timestamp"] = pd.Timestamp.utcnow()
-    # normaliza variantes
-    if "variant" in df.columns:
-        df["variant"] = df["variant"].str.lower()
-    return df
 
 def filter_scope(df: pd.DataFrame, model: str, variants, last_n: int) -> pd.DataFrame:
     print(f"[py] Filtrando: model='{model}', variants={variants}, last_n={last_n}")
@@ -190,103 +192,319 @@ def filter_scope(df: pd.DataFrame, model: str, variants, last_n: int) -> pd.Data
     
     df = df.sort_values("timestamp")
 
-    group_cols = ["model", "variant"] if "model" in df.columns else ["variant"]
-    # pega as últimas N por grupo, sem .apply (evita FutureWarning)
-    result = df.groupby(group_cols, group_keys=False).tail(last_n)
+    if last_n <= 0:
+        # --last-n 0: histórico completo (como --db e --stream)
+        result = df
+    else:
+        group_cols = ["model", "variant"] if "model" in df.columns else ["variant"]
+        # pega as últimas N por grupo, sem .apply (evita FutureWarning)
+        result = df.groupby(group_cols, group_keys=False, observed=True).tail(last_n)
     print(f"[py] Dados finais: {result.shape[0]} linhas")
     return result
 
+# métricas disponíveis
+METRIC_COLS = {
+    "load_ms": dict(label="Load", unit="ms", lower_is_better=True),
+    "mem_mb": dict(label="Mem",  unit="MB", lower_is_better=True),
+    "fps_avg": dict(label="FPS Avg",  unit="FPS", lower_is_better=False),
+    "fps_min": dict(label="FPS Min", unit="FPS", lower_is_better=False),
+    "fps_max": dict(label="FPS Max", unit="FPS", lower_is_better=False),
+    "fps_median": dict(label="FPS Median", unit="FPS", lower_is_better=False),
+    "fps_1pc_low": dict(label="FPS 1% low", unit="FPS", lower_is_better=False),
+}
+
+# Colunas agregadas por média em compute_aggregates (se existirem no CSV)
+AGG_METRICS = ["file_mb", "load_ms", "mem_mb", "fps_avg", "fps_min", "fps_max", "fps_median", "fps_1pc_low"]
+
+# Colunas lidas dos CSVs por este report (fps_samples, platform, scene... nunca são lidas)
+REPORT_COLUMNS = ["timestamp", "model", "variant"] + AGG_METRICS
+
+# Métricas da fronteira de Pareto entre variantes (file_mb: menor é melhor)
+PARETO_METRICS = ["file_mb", "load_ms", "mem_mb", "fps_avg"]
+
+# Colunas do modo --check-regressions (o run_id separa o último run da baseline)
+GATE_COLUMNS = ["timestamp", "run_id", "model", "variant"] + AGG_METRICS
+
 def compute_aggregates(df: pd.DataFrame):
-    # métricas disponíveis
-    cols = {
-        "load_ms": dict(label="Load", unit="ms", lower_is_better=True),
-        "mem_mb": dict(label="Mem",  unit="MB", lower_is_better=True),
-        "fps_avg": dict(label="FPS Avg",  unit="FPS", lower_is_better=False),
-        "fps_min": dict(label="FPS Min", unit="FPS", lower_is_better=False),
-        "fps_max": dict(label="FPS Max", unit="FPS", lower_is_better=False),
-        "fps_median": dict(label="FPS Median", unit="FPS", lower_is_better=False),
-        "fps_1pc_low": dict(label="FPS 1% low", unit="FPS", lower_is_better=False),
-    }
+    cols = METRIC_COLS
     group_cols = ["model","variant"] if "model" in df.columns else ["variant"]
     
-    # Agregação com as novas métricas de FPS
-    agg_dict = {}
-    
-    # Métricas básicas
-    if "file_mb" in df.columns:
-        agg_dict["file_mb"] = "mean"
-    if "load_ms" in df.columns:
-        agg_dict["load_ms"] = "mean"
-    if "mem_mb" in df.columns:
-        agg_dict["mem_mb"] = "mean"
-    if "fps_avg" in df.columns:
-        agg_dict["fps_avg"] = "mean"
-    
-    # Adicionar novas métricas de FPS se existirem
-    if "fps_min" in df.columns:
-        agg_dict["fps_min"] = "mean"
-    if "fps_max" in df.columns:
-        agg_dict["fps_max"] = "mean"
-    if "fps_median" in df.columns:
-        agg_dict["fps_median"] = "mean"
-    if "fps_1pc_low" in df.columns:
-        agg_dict["fps_1pc_low"] = "mean"
+    # Média de cada métrica presente no CSV
+    agg_dict = {m: "mean" for m in AGG_METRICS if m in df.columns}
     
     print(f"[py] Agregando com colunas: {list(agg_dict.keys())}")
-    agg = df.groupby(group_cols).agg(agg_dict).reset_index()
+    agg = df.groupby(group_cols, observed=True).agg(agg_dict).reset_index()
     
     # Adicionar contagem de amostras manualmente
     if "timestamp" in df.columns:
-        sample_counts = df.groupby(group_cols).size().reset_index(name='samples')
+        sample_counts = df.groupby(group_cols, observed=True).size().reset_index(name='samples')
         agg = agg.merge(sample_counts, on=group_cols, how='left')
 
-    # ganho% vs original (por modelo)
-    gain_cols = ["gain_load_ms", "gain_mem_mb", "gain_fps_avg", "gain_fps_min", "gain_fps_max", "gain_fps_median", "gain_fps_low"]
-    for col in gain_cols:
-        agg[col] = None
+    return add_gains(agg, cols), cols
+
+def gain_column(metric: str) -> str:
+    """Nome da coluna de ganho de uma métrica (fps_1pc_low mantém o nome histórico gain_fps_low)"""
+    return "gain_fps_low" if metric == "fps_1pc_low" else f"gain_{metric}"
+
+def add_gains(agg: pd.DataFrame, cols=None, base_variant=None) -> pd.DataFrame:
+    """
+    Adiciona as colunas gain_* (ganho% vs original, por modelo) à tabela agregada
+
+    Uma única passada vetorizada para todos os modelos, métricas e variantes:
+    cada linha recebe o índice da linha base do seu modelo e os ganhos saem de
+    aritmética de arrays. Métricas e direção (lower_is_better) vêm de METRIC_COLS.
+    Modelos sem exatamente uma linha base ficam sem ganho (NaN).
+    """
+    cols = cols or METRIC_COLS
+    base_variant = base_variant or CONFIG["base_variant"]
+    n = len(agg)
+
+    # Grupo de cada linha: o modelo (ou um grupo único, sem coluna "model")
+    if "model" in agg.columns:
+        codes, uniques = pd.factorize(agg["model"])
+        n_groups = len(uniques)
+    else:
+        codes, n_groups = np.zeros(n, dtype=np.int64), 1
+
+    base_rows = np.flatnonzero((agg["variant"] == base_variant).to_numpy(dtype=bool)) if n else np.empty(0, dtype=np.int64)
+    base_count = np.bincount(codes[base_rows], minlength=n_groups) if n_groups else np.zeros(0, dtype=np.int64)
+    base_of_group = np.full(n_groups, -1, dtype=np.int64)
+    base_of_group[codes[base_rows]] = base_rows
+    base_of_group[base_count != 1] = -1
+    row_base = base_of_group[codes] if n else np.empty(0, dtype=np.int64)
+    has_base = (codes >= 0) & (row_base >= 0)
+
+    metrics = [m for m in cols if m in agg.columns]
+    values = agg[metrics].to_numpy(dtype=np.float64, na_value=np.nan)
+    base = np.where(has_base[:, None], values[np.maximum(row_base, 0)], np.nan) if n else values
+    # menor é melhor: (base - valor) / base; maior é melhor: (valor - base) / base
+    sign = np.array([-1.0 if cols[m]["lower_is_better"] else 1.0 for m in metrics])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gains = sign * (values - base) / base * 100.0
+
+    for m in cols:
+        agg[gain_column(m)] = np.nan
+    for j, m in enumerate(metrics):
+        agg[gain_column(m)] = gains[:, j]
+    return agg
+
+def pareto_frontier(agg: pd.DataFrame, metrics=None) -> pd.DataFrame:
+    """
+    Ordenação não dominada das variantes de cada modelo sobre a tabela agregada
+
+    Uma variante domina outra do mesmo modelo se não é pior em nenhuma métrica
+    e é melhor em pelo menos uma (direção de METRIC_COLS; file_mb menor é
+    melhor; NaN conta como o pior valor). Todos os modelos de uma vez: as
+    variantes são dispostas num array (modelo × variante × métrica) e a matriz
+    de dominância sai de uma comparação com broadcast; as frentes são
+    removidas em camadas (poucas iterações, não uma por modelo).
+
+    Adiciona pareto_rank (0 = fronteira) e pareto_optimal (bool) ao agg.
+    """
+    metrics = [m for m in (metrics or PARETO_METRICS) if m in agg.columns]
+    agg = agg.copy()
+    agg["pareto_rank"] = -1
+    agg["pareto_optimal"] = False
+    if agg.empty or not metrics:
+        return agg
 
     if "model" in agg.columns:
-        for model_name, g in agg.groupby("model"):
-            orig = g[g["variant"]==CONFIG["base_variant"]]
-            if len(orig)==1:
-                o = orig.iloc[0]
-                idxs = g.index
-                # menor é melhor
-                agg.loc[idxs, "gain_load_ms"] = (o["load_ms"] - g["load_ms"]) / o["load_ms"] * 100.0
-                agg.loc[idxs, "gain_mem_mb"]  = (o["mem_mb"]  - g["mem_mb"])  / o["mem_mb"]  * 100.0
-                # maior é melhor
-                agg.loc[idxs, "gain_fps_avg"] = (g["fps_avg"] - o["fps_avg"]) / o["fps_avg"] * 100.0
-                if "fps_min" in g.columns and "fps_min" in o.index:
-                    agg.loc[idxs, "gain_fps_min"] = (g["fps_min"] - o["fps_min"]) / o["fps_min"] * 100.0
-                if "fps_max" in g.columns and "fps_max" in o.index:
-                    agg.loc[idxs, "gain_fps_max"] = (g["fps_max"] - o["fps_max"]) / o["fps_max"] * 100.0
-                if "fps_median" in g.columns and "fps_median" in o.index:
-                    agg.loc[idxs, "gain_fps_median"] = (g["fps_median"] - o["fps_median"]) / o["fps_median"] * 100.0
-                if "fps_1pc_low" in g.columns and "fps_1pc_low" in o.index:
-                    agg.loc[idxs, "gain_fps_low"] = (g["fps_1pc_low"] - o["fps_1pc_low"]) / o["fps_1pc_low"] * 100.0
+        codes, uniques = pd.factorize(agg["model"])
+        n_groups = len(uniques)
+    else:
+        codes, n_groups = np.zeros(len(agg), dtype=np.int64), 1
+    keep = np.flatnonzero(codes >= 0)
+    codes = codes[keep]
+    order = np.argsort(codes, kind="stable")
+    starts = np.searchsorted(codes[order], np.arange(n_groups))
+    slot = np.empty(len(keep), dtype=np.int64)
+    slot[order] = np.arange(len(keep)) - starts[codes[order]]
+    width = int(slot.max()) + 1
+
+    # Tudo como "menor é melhor"; NaN e posições vazias viram +inf
+    sign = np.array([1.0 if m == "file_mb" or METRIC_COLS.get(m, {}).get("lower_is_better", True) else -1.0
+                     for m in metrics])
+    values = agg[metrics].to_numpy(dtype=np.float64, na_value=np.nan)[keep] * sign
+    grid = np.full((n_groups, width, len(metrics)), np.inf)
+    grid[codes, slot] = np.where(np.isnan(values), np.inf, values)
+    present = np.zeros((n_groups, width), dtype=bool)
+    present[codes, slot] = True
+
+    # dominates[g, i, j]: a variante i domina a j no modelo g
+    a, b = grid[:, :, None, :], grid[:, None, :, :]
+    dominates = (a <= b).all(axis=-1) & (a < b).any(axis=-1)
+    dominates &= present[:, :, None] & present[:, None, :]
+
+    rank = np.full((n_groups, width), -1, dtype=np.int64)
+    remaining = present.copy()
+    level = 0
+    while remaining.any():
+        front = remaining & ~(dominates & remaining[:, :, None]).any(axis=1)
+        rank[front] = level
+        remaining &= ~front
+        level += 1
+
+    agg.iloc[keep, agg.columns.get_loc("pareto_rank")] = rank[codes, slot]
+    agg["pareto_optimal"] = agg["pareto_rank"] == 0
+    return agg
+
+def recent_scope(csv_paths, model: str, variants, last_n: int, workers=0) -> pd.DataFrame:
+    """
+    Caminho com last_n > 0 e um modelo específico: o filtro de model/variants
+    e o limite de N por (model, variant) vão para a leitura. Cada CSV é lido
+    de trás para frente só até ter as N execuções mais recentes de cada grupo
+    pedido. Resultado igual ao de filter_scope sobre o histórico completo.
+
+    Com model='all' os modelos não são conhecidos antes da leitura, então o
+    arquivo é lido inteiro (main usa o carregamento com cache nesse caso).
+    """
+    print(f"[py] Leitura reversa: model='{model}', variants={variants}, last_n={last_n}")
+    group_cols = ["model", "variant"]
+
+    def row_filter(chunk):
+        if model != "all":
+            chunk = chunk[chunk["model"] == model]
+        return chunk[chunk["variant"].isin(variants)]
+
+    # Com model='all' não há como saber quais modelos faltam: sem parada antecipada
+    group_values = {"variant": variants}
+    if model != "all":
+        group_values["model"] = [model]
+    loader = partial(read_recent_rows, last_n=last_n, row_filter=row_filter, group_cols=group_cols,
+                     group_values=group_values, columns=REPORT_COLUMNS)
+    loaded, failures = load_csvs_parallel(csv_paths, loader, workers=workers)
+    for csv_path, e in failures:
+        print(f"[py] Erro ao carregar {csv_path}: {e}")
+    for csv_path, df in loaded:
+        print(f"[py] {len(df)} linhas recentes de {csv_path}")
+
+    df = concat_frames([df for _, df in loaded], project_columns(REPORT_COLUMNS))
+    if df.empty:
+        return df
+    df = df.sort_values("timestamp", kind="stable")
+    result = df.groupby(group_cols, group_keys=False, observed=True).tail(last_n)
+    print(f"[py] Dados finais: {result.shape[0]} linhas")
+    return result
+
+def store_scope(db_path, csv_paths, model: str, variants, last_n: int):
+    """
+    Modo --db: os CSVs são importados no banco (idempotente: só linhas novas)
+    e o filtro/agregação rodam como consultas no SQLite
+
+    Returns:
+        (df_f, agg) - agg vem do SQLite com last_n <= 0; senão é None e sai
+        de compute_aggregates(df_f)
+    """
+    print(f"[py] Banco de métricas: {db_path}")
+    with MetricsStore(db_path) as store:
+        inserted, failures = store.import_csvs(csv_paths)
+        for csv_path, e in failures:
+            print(f"[py] Erro ao importar {csv_path}: {e}")
+        print(f"[py] {inserted} execuções novas importadas")
+
+        df_f = store.query_scope(model, variants, last_n, REPORT_COLUMNS)
+        agg = None
+        if last_n <= 0 and not df_f.empty:
+            agg = add_gains(store.aggregate_scope(model, variants, AGG_METRICS))
+    print(f"[py] Dados finais: {df_f.shape[0]} linhas")
+    return df_f, agg
+
+def stream_scope(csv_paths, model: str, variants, last_n: int, chunk_mb=None):
+    """
+    Modo --stream: filtra e agrega os CSVs em blocos, sem carregar o histórico inteiro
+
+    - last_n > 0: mantém só as últimas N linhas por (model, variant); o resto
+      do report segue igual ao modo normal
+    - last_n <= 0: agrega o histórico completo com acumuladores mescláveis; as
+      timelines usam apenas as execuções mais recentes de cada grupo
+
+    Returns:
+        (df_f, agg) - agg é None quando deve ser calculado por compute_aggregates(df_f)
+    """
+    print(f"[py] Modo streaming: model='{model}', variants={variants}, last_n={last_n}")
+    group_cols = ["model", "variant"]
+
+    def row_filter(chunk):
+        if model != "all":
+            chunk = chunk[chunk["model"] == model]
+        return chunk[chunk["variant"].isin(variants)]
+
+    if last_n > 0:
+        tail = TailBuffer(last_n, group_cols)
+        consumers = [tail]
+        aggregator = None
+    else:
+        tail = TailBuffer(CONFIG["stream_recent_rows"], group_cols)
+        aggregator = StreamingAggregator(group_cols, AGG_METRICS)
+        consumers = [aggregator, tail]
+
+    total, failures = stream_csvs(csv_paths, consumers, row_filter=row_filter, chunk_mb=chunk_mb,
+                                  columns=REPORT_COLUMNS)
+    for csv_path, e in failures:
+        print(f"[py] Erro ao carregar {csv_path}: {e}")
+    print(f"[py] Linhas lidas em streaming: {total}")
+
+    df_f = tail.result()
+    agg = add_gains(aggregator.aggregate_frame()) if aggregator is not None and aggregator.rows else None
+    print(f"[py] Dados finais: {df_f.shape[0]} linhas")
+    return df_f, agg
+
+def regression_changes(latest: pd.DataFrame, baseline: pd.DataFrame, metrics) -> pd.DataFrame:
+    """Médias do último run e da baseline por (model, variant), ambas via compute_aggregates"""
+    agg_latest, _ = compute_aggregates(latest)
+    agg_base, _ = compute_aggregates(baseline)
+    merged = agg_base.merge(agg_latest, on=["model", "variant"], suffixes=("_baseline", "_latest"))
+    return pd.concat([pd.DataFrame({
+        "model": merged["model"].astype(str),
+        "variant": merged["variant"].astype(str),
+        "metric": m,
+        "baseline": merged[f"{m}_baseline"].astype(np.float64),
+        "latest": merged[f"{m}_latest"].astype(np.float64),
+    }) for m in metrics], ignore_index=True)
+
+def run_regression_check(args, variants) -> int:
+    """
+    Modo --check-regressions: sem gráficos nem HTML
+
+    Lê o histórico (só as colunas necessárias, com cache colunar ou via --db),
+    compara o último run_id de cada (model, variant) com os --baseline-runs
+    anteriores e grava o veredito em --out. Retorna o código de saída.
+    """
+    thresholds = parse_thresholds(args.regression_thresholds)
+    if missing_inputs(args.csv_files):
+        return 1
+    if args.db:
+        with MetricsStore(args.db) as store:
+            inserted, failures = store.import_csvs(args.csv_files)
+            if failed_inputs(failures):
+                # Sem a importação completa o veredito sairia de dados antigos do banco
+                return 1
+            df = store.query_scope(args.model, variants, 0, GATE_COLUMNS)
     else:
-        # sem "model", compara tudo contra "original" global (se existir)
-        orig = agg[agg["variant"]==CONFIG["base_variant"]]
-        if len(orig)==1:
-            o = orig.iloc[0]
-            idxs = agg.index
-            agg.loc[idxs, "gain_load_ms"] = (o["load_ms"] - agg["load_ms"]) / o["load_ms"] * 100.0
-            agg.loc[idxs, "gain_mem_mb"]  = (o["mem_mb"]  - agg["mem_mb"])  / o["mem_mb"]  * 100.0
-            agg.loc[idxs, "gain_fps_avg"] = (agg["fps_avg"] - o["fps_avg"]) / o["fps_avg"] * 100.0
-            if "fps_min" in agg.columns and "fps_min" in o.index:
-                agg.loc[idxs, "gain_fps_min"] = (agg["fps_min"] - o["fps_min"]) / o["fps_min"] * 100.0
-            if "fps_max" in agg.columns and "fps_max" in o.index:
-                agg.loc[idxs, "gain_fps_max"] = (agg["fps_max"] - o["fps_max"]) / o["fps_max"] * 100.0
-            if "fps_median" in agg.columns and "fps_median" in o.index:
-                agg.loc[idxs, "gain_fps_median"] = (agg["fps_median"] - o["fps_median"]) / o["fps_median"] * 100.0
-            if "fps_1pc_low" in agg.columns and "fps_1pc_low" in o.index:
-                agg.loc[idxs, "gain_fps_low"] = (agg["fps_1pc_low"] - o["fps_1pc_low"]) / o["fps_1pc_low"] * 100.0
-
-    return agg, cols
+        loader = partial(load_benchmark_csv, columns=GATE_COLUMNS, use_cache=not args.no_cache)
+        loaded, failures = load_csvs_parallel(args.csv_files, loader, workers=args.workers)
+        if failed_inputs(failures):
+            return 1
+        df = concat_frames([df for _, df in loaded], project_columns(GATE_COLUMNS))
+        if not df.empty:
+            if args.model != "all":
+                df = df[df["model"] == args.model]
+            df = df[df["variant"].isin(variants)]
+    if df.empty or "run_id" not in df.columns:
+        print("[py] ❌ Nenhum dado para verificar regressões")
+        return 1
+
+    df = df.assign(model=df["model"].astype(str), variant=df["variant"].astype(str))
+    lower_is_better = {m for m, c in METRIC_COLS.items() if c["lower_is_better"]} | {"file_mb"}
+    verdict = check_regressions(df, ["model", "variant"], list(thresholds), regression_changes, thresholds,
+                                lower_is_better, args.baseline_runs)
+    verdict["model"] = args.model
+    print_verdict(verdict, write_verdict(args.out, verdict))
+    return verdict["exit_code"]
 
 def bar_chart(agg: pd.DataFrame, metric: str, variants_order, title: str, unit: str, color_map: dict):
     # média por variante (em todos os modelos do escopo)
-    by_var = agg.groupby("variant", as_index=False).mean(numeric_only=True)
+    by_var = agg.groupby("variant", as_index=False, observed=True).mean(numeric_only=True)
     
     # Cria um DataFrame com todas as variantes esperadas
     result_data = []
@@ -314,16 +532,18 @@ def bar_chart(agg: pd.DataFrame, metric: str, variants_order, title: str, unit:
 def timeline(df: pd.DataFrame, ycol: str, title: str, unit: str, by="index", color_map=None):
     # por variante, desenha linha vs ordem (index) OU data (timestamp real)
     fig = go.Figure()
-    for v, g in df.groupby("variant"):
+    for v, g in df.groupby("variant", observed=True):
         g2 = g.sort_values("timestamp").reset_index(drop=True)
         if by=="index":
-            x = g2.index + 1
+            x = pd.Series(g2.index + 1)
             x_title = "Execução (ordem)"
         else:
             x = g2["timestamp"]
             x_title = "Data/Hora"
-        fig.add_trace(go.Scatter(
-            x=x, y=g2[ycol], mode="lines+markers", name=v,
+        # históricos longos: série exibida reduzida por LTTB e desenhada em WebGL
+        shown = display_indices(x, g2[ycol])
+        fig.add_trace(scatter_class(len(shown))(
+            x=x.iloc[shown], y=g2[ycol].iloc[shown], mode="lines+markers", name=v,
             line=dict(width=2, color=color_map.get(v,"#888888") if color_map else None)
         ))
     fig.update_layout(
@@ -337,6 +557,70 @@ def timeline(df: pd.DataFrame, ycol: str, title: str, unit: str, by="index", col
     )
     return fig
 
+def pareto_relative(agg: pd.DataFrame, metrics=None, base_variant=None) -> pd.DataFrame:
+    """Métricas de cada variante em % da variante base do mesmo modelo (escala comum a todos os modelos)"""
+    metrics = [m for m in (metrics or PARETO_METRICS) if m in agg.columns]
+    base_variant = base_variant or CONFIG["base_variant"]
+    base = agg[agg["variant"] == base_variant].drop_duplicates("model").set_index("model")[metrics]
+    base_values = base.reindex(agg["model"]).to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rel = agg[metrics].to_numpy(dtype=np.float64, na_value=np.nan) / base_values * 100.0
+    return pd.DataFrame(rel, columns=metrics, index=agg.index)
+
+def pareto_chart(agg: pd.DataFrame, variants_order, color_map: dict):
+    """Fronteira do catálogo: tamanho × load relativos à base; preenchido = na fronteira do modelo"""
+    rel = pareto_relative(agg)
+    fig = go.Figure()
+    for v in variants_order:
+        rows = (agg["variant"] == v).to_numpy()
+        for optimal in (True, False):
+            sel = rows & (agg["pareto_optimal"].to_numpy() == optimal)
+            if not sel.any():
+                continue
+            sub, r = agg[sel], rel[sel]
+            hover = sub["model"].astype(str) + "<br>" + v
+            for m in rel.columns:
+                hover = hover + f"<br>{m}: " + r[m].round(1).astype(str) + "%"
+            fig.add_trace(go.Scatter(
+                x=r.get("file_mb"), y=r.get("load_ms"),
+                mode="markers", name=f"{v} ({'fronteira' if optimal else 'dominada'})",
+                marker=dict(size=10 if optimal else 7, color=color_map.get(v, "#888"),
+                            symbol="circle" if optimal else "x-thin-open", line=dict(width=1)),
+                text=hover, hovertemplate="%{text}<extra></extra>"
+            ))
+    fig.update_layout(title="Fronteira de Pareto do catálogo (relativo à base do modelo)",
+                      xaxis_title="Tamanho do arquivo (% da base)", yaxis_title="Tempo de carregamento (% da base)",
+                      template="plotly_white", margin=dict(l=40,r=20,t=60,b=40), height=460,
+                      legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0))
+    return fig
+
+def pareto_summary_chart(agg: pd.DataFrame, variants_order, color_map: dict):
+    """Em quantos modelos cada variante está na fronteira de Pareto"""
+    counts = agg[agg["pareto_optimal"]].groupby("variant", observed=True).size()
+    models = agg["model"].nunique() if "model" in agg.columns else 1
+    y = [int(counts.get(v, 0)) for v in variants_order]
+    fig = go.Figure(go.Bar(x=variants_order, y=y, text=[f"{c}/{models}" for c in y], textposition="auto",
+                           marker_color=[color_map.get(v, "#888") for v in variants_order]))
+    fig.update_layout(title="Modelos em que a variante é Pareto-ótima", xaxis_title="Variante",
+                      yaxis_title="Modelos", template="plotly_white", margin=dict(l=40,r=20,t=60,b=40), height=360)
+    return fig
+
+def pareto_table(agg: pd.DataFrame, variants_order):
+    """Por modelo: variantes na fronteira (candidatas a enviar) e dominadas"""
+    order = {v: i for i, v in enumerate(variants_order)}
+    ranked = agg.assign(_order=agg["variant"].map(order)).sort_values(["model", "_order"], kind="stable")
+    grouped = ranked.groupby("model", observed=True, sort=True)
+    front = grouped.apply(lambda g: ", ".join(g.loc[g["pareto_optimal"], "variant"].astype(str)), include_groups=False)
+    dominated = grouped.apply(lambda g: ", ".join(g.loc[~g["pareto_optimal"], "variant"].astype(str)) or "—",
+                              include_groups=False)
+    fig = go.Figure(go.Table(
+        header=dict(values=["Modelo", "Fronteira de Pareto", "Dominadas"], align="left"),
+        cells=dict(values=[front.index.astype(str).tolist(), front.tolist(), dominated.tolist()], align="left")
+    ))
+    fig.update_layout(title="Variantes Pareto-ótimas por modelo (file_mb, load_ms, mem_mb, fps_avg)",
+                      margin=dict(l=10,r=10,t=60,b=10), height=min(800, 120 + 28 * len(front)))
+    return fig
+
 def color_theme():
     return {
         "bg": "#FAFAFE",
@@ -366,15 +650,13 @@ def shutil_which(cmd):
     from shutil import which
     return which(cmd) is not None
 
-def figs_to_html_blocks(figs):
-    """Gera blocos HTML: o 1º inclui plotly.js via CDN, os demais não."""
-    blocks = []
-    for i, fig in enumerate(figs):
-        include = "cdn" if i == 0 else False  # 100% standalone + leve
-        blocks.append(pio.to_html(fig, full_html=False, include_plotlyjs=include))
-    return blocks
+def figs_to_html_blocks(figs, lazy=False):
+    """Gera blocos HTML sem plotly.js (carregado uma vez no <head>); lazy = JSON criado ao rolar a página."""
+    if lazy:
+        return [chart_html(fig, f"chart_{i}", lazy=True) for i, fig in enumerate(figs)]
+    return [pio.to_html(fig, full_html=False, include_plotlyjs=False) for fig in figs]
 
-def build_html(title, blocks, theme):
+def build_html(title, blocks, theme, plotlyjs="", lazy=False):
     css = f"""
     body {{ background:{theme['bg']}; color:{theme['text']}; font-family: -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Inter, Arial, sans-serif; }}
     .wrap {{ max-width: 1100px; margin: 24px auto; padding: 0 12px; }}
@@ -389,6 +671,7 @@ def build_html(title, blocks, theme):
 <meta charset="utf-8">
 <title>{title}</title>
 <style>{css}</style>
+{plotlyjs}
 </head>
 <body>
 <div class="wrap">
@@ -397,10 +680,10 @@ def build_html(title, blocks, theme):
     <div class="block">{blocks[0]}</div>
     <div class="block">{blocks[1]}</div>
     <div class="block">{blocks[2]}</div>
-    <div class="block full">{blocks[3]}</div>
-    <div class="block full">{blocks[4]}</div>
+    {"".join(f'<div class="block full">{b}</div>' for b in blocks[3:])}
   </div>
 </div>
+{lazy_loader_script() if lazy else ""}
 </body>
 </html>"""
 
@@ -441,38 +724,74 @@ def main():
         print("[py] ❌ Nenhum arquivo CSV foi fornecido.")
         return 1
 
-    try:
-        # A função load_multiple_csvs já aceita uma lista de caminhos
-        df = load_multiple_csvs(args.csv_files) 
-    except Exception as e:
-        print(f"[py] ❌ Erro ao carregar CSVs: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-
     variants = [v.strip().lower() for v in args.variants.split(",") if v.strip()]
-    print(f"[py] ========================================")
-    print(f"[py] FILTRO DE DADOS - DIAGNÓSTICO")
-    print(f"[py] ========================================")
-    print(f"[py] DataFrame antes do filtro:")
-    print(f"[py] - Shape: {df.shape}")
-    print(f"[py] - Modelo solicitado: {args.model}")
-    print(f"[py] - Variantes solicitadas: {variants}")
-    print(f"[py] - Last N: {args.last_n}")
+    stream_agg = None
+
+    if args.check_regressions:
+        try:
+            return run_regression_check(args, variants)
+        except Exception as e:
+            print(f"[py] ❌ Erro na verificação de regressões: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+
+    if args.db:
+        try:
+            df_f, stream_agg = store_scope(args.db, args.csv_files, args.model, variants, args.last_n)
+        except Exception as e:
+            print(f"[py] ❌ Erro no banco de métricas: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+    elif args.stream:
+        try:
+            df_f, stream_agg = stream_scope(args.csv_files, args.model, variants, args.last_n, args.chunk_mb)
+        except Exception as e:
+            print(f"[py] ❌ Erro no modo streaming: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+    elif args.last_n > 0 and not args.full_scan and args.model != "all":
+        try:
+            df_f = recent_scope(args.csv_files, args.model, variants, args.last_n, args.workers)
+        except Exception as e:
+            print(f"[py] ❌ Erro na leitura reversa: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+    else:
+        try:
+            # A função load_multiple_csvs já aceita uma lista de caminhos
+            df = load_multiple_csvs(args.csv_files, use_cache=not args.no_cache, workers=args.workers)
+        except Exception as e:
+            print(f"[py] ❌ Erro ao carregar CSVs: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+
+        print(f"[py] ========================================")
+        print(f"[py] FILTRO DE DADOS - DIAGNÓSTICO")
+        print(f"[py] ========================================")
+        print(f"[py] DataFrame antes do filtro:")
+        print(f"[py] - Shape: {df.shape}")
+        print(f"[py] - Modelo solicitado: {args.model}")
+        print(f"[py] - Variantes solicitadas: {variants}")
+        print(f"[py] - Last N: {args.last_n}")
     
-    if not df.empty:
-        print(f"[py] - Modelos disponíveis no DF: {df['model'].unique().tolist() if 'model' in df.columns else 'N/A'}")
-        print(f"[py] - Variantes disponíveis no DF: {df['variant'].unique().tolist() if 'variant' in df.columns else 'N/A'}")
+        if not df.empty:
+            print(f"[py] - Modelos disponíveis no DF: {df['model'].unique().tolist() if 'model' in df.columns else 'N/A'}")
+            print(f"[py] - Variantes disponíveis no DF: {df['variant'].unique().tolist() if 'variant' in df.columns else 'N/A'}")
     
-    try:
-        df_f = filter_scope(df, args.model, variants, args.last_n)
-        print(f"[py] DataFrame após filtro:")
-        print(f"[py] - Shape: {df_f.shape}")
-    except Exception as e:
-        print(f"[py] ❌ Erro ao filtrar dados: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
+        try:
+            df_f = filter_scope(df, args.model, variants, args.last_n)
+            print(f"[py] DataFrame após filtro:")
+            print(f"[py] - Shape: {df_f.shape}")
+        except Exception as e:
+            print(f"[py] ❌ Erro ao filtrar dados: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
     
     if df_f.empty:
         print("[py] ========================================")
@@ -488,7 +807,10 @@ def main():
         print("[py] 4. DataFrame original está vazio")
         return 1
 
-    agg, meta = compute_aggregates(df_f)
+    if stream_agg is not None:
+        agg, meta = stream_agg, METRIC_COLS
+    else:
+        agg, meta = compute_aggregates(df_f)
 
     theme = color_theme()
     cmap = {
@@ -508,10 +830,22 @@ def main():
     figs.append(timeline(df_f, "fps_avg", "FPS por execução (ordem)", "FPS", by="index", color_map=cmap))
     figs.append(timeline(df_f, "fps_avg", "FPS ao longo do tempo", "FPS", by="time",  color_map=cmap))
 
+    # Fronteira de Pareto por modelo (file_mb, load_ms, mem_mb, fps_avg)
+    if "model" in agg.columns and any(m in agg.columns for m in PARETO_METRICS):
+        agg = pareto_frontier(agg)
+        print(f"[py] Pareto: {int(agg['pareto_optimal'].sum())} variantes na fronteira de {agg['model'].nunique()} modelos")
+        figs.append(pareto_chart(agg, variants, cmap))
+        figs.append(pareto_summary_chart(agg, variants, cmap))
+        figs.append(pareto_table(agg, variants))
+
     model_for_title = "Global" if args.model == "all" else args.model
     title = f"Relatório de Métricas — {model_for_title} — {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-    html_blocks = figs_to_html_blocks(figs)
-    html = build_html(title, html_blocks, theme)
+    # O PDF é impresso do HTML por um navegador headless, que não rola a página
+    lazy = args.lazy_charts and not args.pdf
+    if args.lazy_charts and args.pdf:
+        print("[py] ⚠️ --lazy-charts ignorado com --pdf (o PDF é impresso a partir do HTML)")
+    html_blocks = figs_to_html_blocks(figs, lazy)
+    html = build_html(title, html_blocks, theme, plotlyjs_script(args.plotlyjs, args.out), lazy)
 
     html_path = os.path.join(args.out, "report.html")
     with open(html_path, "w", encoding="utf-8") as f:
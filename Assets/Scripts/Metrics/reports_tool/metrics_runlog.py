@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Metrics Run Log - Formato binário de registros fixos para os benchmarks
+
+Alternativa ao benchmarks.csv para históricos grandes: o parse de texto é o
+custo dominante dos reports e quase todos os campos são numéricos.
+
+Layout do arquivo (little-endian):
+
+- Cabeçalho (64 bytes): magic, versão, tamanho do registro, máximo de
+  amostras de FPS, número de registros e posição/tamanho do dicionário
+- Registros: um por execução, todos do mesmo tamanho. Números em binário
+  (timestamp int64 em µs, métricas float32), strings como índices uint32 no
+  dicionário e as amostras de FPS num bloco fixo de float32
+- Dicionário: strings internadas (uint32 tamanho + bytes UTF-8), no fim do arquivo
+
+O leitor faz mmap do arquivo e expõe as colunas como views numpy.frombuffer,
+sem cópia. Anexar execuções escreve só os registros novos e o dicionário,
+numa ordem em que o arquivo continua legível se o processo for interrompido.
+
+Uso (conversão dos CSVs existentes):
+    python metrics_runlog.py --csv-files <Models>/<modelo>/benchmark/benchmarks.csv
+"""
+
+import os
+import sys
+import mmap
+import struct
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from metrics_ingest import (CANONICAL_COLUMNS, CATEGORY_COLUMNS, FLOAT_COLUMNS, RUNLOG_EXTENSION,
+                            parse_benchmark_csv, project_columns)
+from fps_samples import decode_fps_samples, RaggedArray
+
+# Configurações do formato
+RUNLOG_CONFIG = {
+    "max_samples": 50,     # MetricsConfig.MAX_FPS_SAMPLES_IN_CSV
+}
+
+MAGIC = b"PDRUNLOG"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHHIIQQQ")
+HEADER_SIZE = 64
+
+NA_STRING = 0xFFFFFFFF                   # índice de string ausente
+NA_TEST_NUMBER = np.iinfo(np.int32).min  # test_number ausente
+NA_OK = 255                              # ok ausente
+
+
+def record_dtype(max_samples):
+    """Dtype (packed) de um registro; a ordem dos campos segue o CSV V3"""
+    fields = [("timestamp", "<i8")]
+    for col in CANONICAL_COLUMNS[1:]:
+        if col in CATEGORY_COLUMNS:
+            fields.append((col, "<u4"))
+        elif col in FLOAT_COLUMNS:
+            fields.append((col, "<f4"))
+        elif col == "test_number":
+            fields.append((col, "<i4"))
+        elif col == "ok":
+            fields.append((col, "u1"))
+        elif col == "fps_samples":
+            fields.append(("fps_samples_n", "<u2"))
+            fields.append((col, "<f4", (max_samples,)))
+    return np.dtype(fields)
+
+
+def runlog_path_for(csv_path):
+    """benchmarks.csv -> benchmarks.runlog (mesma pasta)"""
+    return os.path.splitext(csv_path)[0] + RUNLOG_EXTENSION
+
+
+# =====================================================================
+# DICIONÁRIO DE STRINGS
+# =====================================================================
+
+def _encode_dictionary(strings):
+    parts = [struct.pack("<I", len(strings))]
+    for s in strings:
+        data = s.encode("utf-8")
+        parts.append(struct.pack("<I", len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def _decode_dictionary(data):
+    (count,) = struct.unpack_from("<I", data, 0)
+    strings, pos = [], 4
+    for _ in range(count):
+        (n,) = struct.unpack_from("<I", data, pos)
+        strings.append(bytes(data[pos + 4:pos + 4 + n]).decode("utf-8"))
+        pos += 4 + n
+    return strings
+
+
+def _intern(values, strings, index):
+    """Índices das strings de `values` no dicionário (novas strings são acrescentadas)"""
+    cat = pd.Categorical(values)
+    ids = []
+    for s in cat.categories:
+        s = str(s)
+        if s not in index:
+            index[s] = len(strings)
+            strings.append(s)
+        ids.append(index[s])
+    ids = np.asarray(ids + [NA_STRING], dtype=np.uint32)
+    return ids[cat.codes]  # código -1 (NA) cai no último elemento
+
+
+# =====================================================================
+# ESCRITA
+# =====================================================================
+
+def _encode_records(df, strings, index, max_samples):
+    """Converte um frame canônico em registros binários"""
+    records = np.zeros(len(df), dtype=record_dtype(max_samples))
+    if not len(df):
+        return records
+
+    records["timestamp"] = df["timestamp"].to_numpy(dtype="datetime64[us]").astype(np.int64)
+    for col in CATEGORY_COLUMNS:
+        records[col] = _intern(df[col], strings, index)
+    for col in FLOAT_COLUMNS:
+        records[col] = df[col].to_numpy(dtype=np.float32, na_value=np.nan)
+    records["test_number"] = df["test_number"].to_numpy(dtype=np.int64, na_value=NA_TEST_NUMBER)
+    ok = df["ok"].astype("boolean")
+    records["ok"] = np.where(ok.isna().to_numpy(), NA_OK, ok.fillna(False).to_numpy(dtype=np.uint8))
+
+    ragged = decode_fps_samples(df["fps_samples"])
+    pos = np.arange(len(ragged.values)) - ragged.offsets[ragged.row_ids]
+    keep = pos < max_samples
+    samples = np.full((len(df), max_samples), np.nan, dtype=np.float32)
+    samples[ragged.row_ids[keep], pos[keep]] = ragged.values[keep]
+    records["fps_samples"] = samples
+    records["fps_samples_n"] = np.minimum(ragged.counts, max_samples)
+    return records
+
+
+def _write_header(f, record_size, max_samples, n_records, dict_offset, dict_length):
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, HEADER_SIZE, record_size, max_samples,
+                         n_records, dict_offset, dict_length)
+    f.seek(0)
+    f.write(header.ljust(HEADER_SIZE, b"\0"))
+
+
+def _read_header(data):
+    magic, version, header_size, record_size, max_samples, n, dict_offset, dict_length = \
+        HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Arquivo não é um run log de benchmark")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Versão de run log não suportada: {version}")
+    return {
+        "header_size": header_size, "record_size": record_size, "max_samples": max_samples,
+        "n_records": n, "dict_offset": dict_offset, "dict_length": dict_length,
+    }
+
+
+def write_runlog(path, df, max_samples=None):
+    """Cria (ou sobrescreve) um run log a partir de um frame canônico"""
+    max_samples = max_samples or RUNLOG_CONFIG["max_samples"]
+    strings, index = [], {}
+    records = _encode_records(df, strings, index, max_samples)
+    dictionary = _encode_dictionary(strings)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        _write_header(f, records.dtype.itemsize, max_samples, len(records),
+                      HEADER_SIZE + records.nbytes, len(dictionary))
+        f.write(records.tobytes())
+        f.write(dictionary)
+    os.replace(tmp_path, path)
+
+
+def _sync(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def append_runlog(path, df):
+    """
+    Anexa execuções a um run log (cria o arquivo se não existir)
+
+    Só os registros novos e o dicionário são escritos, e o cabeçalho sempre
+    aponta para dados completos, mesmo se o processo parar no meio:
+
+    1. o dicionário novo (o antigo + strings novas, mesmos índices) vai para
+       depois do dicionário atual e da área dos registros novos
+    2. o cabeçalho passa a apontar para ele (ainda com o número antigo de
+       registros)
+    3. os registros novos são escritos logo após os existentes, por cima do
+       dicionário antigo, que já não é usado
+    4. o cabeçalho recebe o novo número de registros
+
+    Entre os registros e o dicionário pode sobrar espaço morto; write_runlog
+    (ex.: a conversão do CSV) recria o arquivo compacto.
+    """
+    if not os.path.exists(path):
+        write_runlog(path, df)
+        return
+    with open(path, "r+b") as f:
+        info = _read_header(f.read(HEADER_SIZE))
+        f.seek(info["dict_offset"])
+        strings = _decode_dictionary(f.read(info["dict_length"]))
+        index = {s: i for i, s in enumerate(strings)}
+
+        records = _encode_records(df, strings, index, info["max_samples"])
+        if len(records) == 0:
+            return
+        dictionary = _encode_dictionary(strings)
+        records_end = info["header_size"] + info["n_records"] * info["record_size"]
+        dict_offset = max(records_end + records.nbytes, info["dict_offset"] + info["dict_length"])
+
+        f.seek(dict_offset)
+        f.write(dictionary)
+        f.truncate()
+        _sync(f)
+        _write_header(f, info["record_size"], info["max_samples"], info["n_records"],
+                      dict_offset, len(dictionary))
+        _sync(f)
+
+        f.seek(records_end)
+        f.write(records.tobytes())
+        _sync(f)
+        _write_header(f, info["record_size"], info["max_samples"], info["n_records"] + len(records),
+                      dict_offset, len(dictionary))
+        _sync(f)
+
+
+# =====================================================================
+# LEITURA
+# =====================================================================
+
+class RunLog:
+    """Run log aberto via mmap; as colunas são views sem cópia sobre o arquivo"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        info = _read_header(self._mm)
+        self.max_samples = info["max_samples"]
+        dtype = record_dtype(self.max_samples)
+        if dtype.itemsize != info["record_size"]:
+            raise ValueError("Tamanho de registro incompatível com esta versão do leitor")
+        self.records = np.frombuffer(self._mm, dtype=dtype, count=info["n_records"],
+                                     offset=info["header_size"])
+        self.strings = _decode_dictionary(
+            memoryview(self._mm)[info["dict_offset"]:info["dict_offset"] + info["dict_length"]])
+
+    def __len__(self):
+        return len(self.records)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.records = None
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # ainda há views exportadas; o mmap fecha quando forem coletadas
+
+    def column(self, name, start=0, stop=None):
+        """View numpy (sem cópia) de um campo dos registros"""
+        return self.records[name][start:stop]
+
+    def fps_samples_ragged(self, start=0, stop=None):
+        """Amostras de FPS como RaggedArray, sem nenhum parse de texto"""
+        counts = self.column("fps_samples_n", start, stop).astype(np.int64)
+        samples = self.column("fps_samples", start, stop)
+        mask = np.arange(self.max_samples)[None, :] < counts[:, None]
+        return RaggedArray(samples[mask], np.concatenate(([0], np.cumsum(counts))))
+
+    def _categorical(self, ids):
+        codes_used, codes = np.unique(ids, return_inverse=True)
+        valid = codes_used != NA_STRING
+        categories = [self.strings[i] for i in codes_used[valid]]
+        remap = np.where(valid, np.cumsum(valid) - 1, -1)
+        return pd.Categorical.from_codes(remap[codes], categories=categories)
+
+    def _samples_strings(self, start, stop):
+        """Reconstrói as strings "v1;v2;..." (só quando a coluna é pedida)"""
+        counts = self.column("fps_samples_n", start, stop).tolist()
+        samples = self.column("fps_samples", start, stop)
+        # Poucos valores distintos (2 casas decimais): formata cada um uma vez só
+        uniq, inverse = np.unique(samples, return_inverse=True)
+        text = np.array([np.format_float_positional(v, trim="-") for v in uniq], dtype=object)
+        grid = text[inverse.reshape(samples.shape)].tolist()
+        out = [";".join(row[:n]) if n else pd.NA for row, n in zip(grid, counts)]
+        return pd.array(out, dtype="string")
+
+    def to_frame(self, columns=None, start=0, stop=None):
+        """
+        Frame canônico (mesmos dtypes do parse_benchmark_csv) de um intervalo de registros
+
+        timestamp e as métricas float32 são views do mmap (nenhuma cópia);
+        categóricas, test_number, ok e fps_samples são decodificados.
+
+        Args:
+            columns: Projeção de colunas (None = todas)
+            start, stop: Intervalo de registros (ordem do arquivo)
+        """
+        out = {}
+        for col in project_columns(columns):
+            values = self.column(col, start, stop)
+            if col == "timestamp":
+                out[col] = values.view("datetime64[us]")
+            elif col in CATEGORY_COLUMNS:
+                out[col] = self._categorical(values)
+            elif col in FLOAT_COLUMNS:
+                out[col] = values
+            elif col == "test_number":
+                out[col] = pd.array(np.where(values == NA_TEST_NUMBER, None, values), dtype="Int32")
+            elif col == "ok":
+                out[col] = pd.array(np.where(values == NA_OK, None, values == 1), dtype="boolean")
+            elif col == "fps_samples":
+                out[col] = self._samples_strings(start, stop)
+        # copy=False: o construtor não consolida as colunas num bloco novo
+        return pd.DataFrame(out, copy=False)
+
+
+def read_runlog(path, columns=None):
+    """Lê um run log inteiro como frame canônico"""
+    with RunLog(path) as log:
+        return log.to_frame(columns)
+
+
+# =====================================================================
+# CONVERSÃO
+# =====================================================================
+
+def convert_csv_to_runlog(csv_path, out_path=None):
+    """Converte um benchmarks.csv (qualquer layout V1/V2/V3) para run log"""
+    out_path = out_path or runlog_path_for(csv_path)
+    df = parse_benchmark_csv(csv_path)
+    write_runlog(out_path, df)
+    return out_path, len(df)
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Converte benchmarks.csv para o formato run log binário")
+    ap.add_argument("--csv-files", nargs='+', required=True, help="Lista de caminhos para os arquivos CSV")
+    ap.add_argument("--out-dir", default=None, help="Diretório de saída (padrão: ao lado de cada CSV)")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    failed = 0
+    for csv_path in args.csv_files:
+        out_path = None
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+            name = os.path.basename(runlog_path_for(csv_path))
+            model = os.path.basename(os.path.dirname(os.path.dirname(os.path.abspath(csv_path))))
+            out_path = os.path.join(args.out_dir, f"{model}_{name}" if model else name)
+        try:
+            out_path, n = convert_csv_to_runlog(csv_path, out_path)
+            size_kb = os.path.getsize(out_path) / 1024
+            print(f"[py] ✓ {csv_path} -> {out_path} ({n} execuções, {size_kb:.1f} KB)")
+        except Exception as e:
+            failed += 1
+            print(f"[py] ❌ Erro ao converter {csv_path}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Metrics Stats - Estatísticas agrupadas calculadas em uma única passada
+
+Todas as métricas de todos os grupos (variantes) são empilhadas num único
+array e ordenadas uma vez (lexsort por métrica, grupo e valor). Média,
+desvio, extremos e qualquer lista de percentis saem dos segmentos ordenados
+por aritmética de índices, sem máscara nem ordenação por grupo/métrica.
+
+Também calcula a incerteza das diferenças entre variantes: intervalos
+bootstrap (reamostragem em lote) e teste t de Welch, sem depender de scipy,
+e quantas execuções são necessárias para atingir uma precisão alvo.
+"""
+
+import math
+import warnings
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+# Percentis do VariantStats (q25, mediana, q75, p1, p99)
+DEFAULT_PERCENTILES = (0.25, 0.5, 0.75, 0.01, 0.99)
+
+
+def percentile_key(q):
+    """Chave de um percentil no resumo (mesma do MetricAccumulator.summary)"""
+    return f"q{q}"
+
+
+def _segment_quantiles(sorted_vals, starts, valid, qs):
+    """Percentis (interpolação linear, como o pandas) de segmentos ordenados"""
+    result = np.full((len(starts), len(qs)), np.nan)
+    has = valid > 0
+    if not has.any() or len(qs) == 0:
+        return result
+    pos = qs[None, :] * (valid[has][:, None] - 1)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.ceil(pos).astype(np.int64)
+    base = starts[has][:, None]
+    v_lo = sorted_vals[base + lo]
+    v_hi = sorted_vals[base + hi]
+    result[has] = v_lo + (v_hi - v_lo) * (pos - lo)
+    return result
+
+
+def grouped_summaries(df, group_col, metrics, percentiles=DEFAULT_PERCENTILES):
+    """
+    Resumo estatístico de cada (grupo, métrica) em uma passada
+
+    Args:
+        df: DataFrame com a coluna de grupo e as métricas
+        group_col: Coluna que define os grupos (ex.: "variant")
+        metrics: Métricas a resumir (as ausentes no df são ignoradas)
+        percentiles: Quantis em [0, 1]; qualquer quantidade, sem custo extra de varredura
+
+    Returns:
+        {grupo: {métrica: {"count", "mean", "std", "min", "max", "q<p>"...}}}
+        count é o número de linhas do grupo; as estatísticas ignoram NaN
+        (como Series.mean/quantile) e std usa ddof=1
+    """
+    metrics = [m for m in metrics if m in df.columns]
+    if df.empty or not metrics:
+        return {}
+
+    codes, groups = pd.factorize(df[group_col], sort=False)
+    keep = codes >= 0
+    codes = codes[keep]
+    n_groups, n_metrics = len(groups), len(metrics)
+    qs = np.asarray(percentiles, dtype=np.float64)
+
+    # Empilha as métricas: segmento (métrica, grupo) = métrica * n_groups + grupo
+    values = df.loc[keep, metrics].to_numpy(dtype=np.float64, na_value=np.nan).T.ravel()
+    segment = (np.arange(n_metrics)[:, None] * n_groups + codes[None, :]).ravel()
+    n_segments = n_metrics * n_groups
+
+    nan = np.isnan(values)
+    order = np.lexsort((values, nan, segment))   # NaN no fim de cada segmento
+    sorted_vals = values[order]
+
+    rows = np.bincount(segment, minlength=n_segments)
+    valid = np.bincount(segment[~nan], minlength=n_segments)
+    starts = np.concatenate(([0], np.cumsum(rows)[:-1]))
+
+    clean = np.where(nan, 0.0, values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(segment, weights=clean, minlength=n_segments) / valid
+        dev = np.where(nan, 0.0, values - mean[segment])
+        ss = np.bincount(segment, weights=dev * dev, minlength=n_segments)
+        std = np.where(valid > 1, np.sqrt(ss / (valid - 1)), np.nan)
+    std = np.where(rows > 1, std, 0.0)
+
+    has = valid > 0
+    vmin = np.where(has, sorted_vals[np.minimum(starts, len(sorted_vals) - 1)], np.nan)
+    vmax = np.where(has, sorted_vals[np.maximum(starts + valid - 1, 0)], np.nan)
+    quant = _segment_quantiles(sorted_vals, starts, valid, qs)
+
+    summaries = {}
+    for g, group in enumerate(groups):
+        per_metric = {}
+        for j, metric in enumerate(metrics):
+            s = j * n_groups + g
+            summary = {
+                "count": int(rows[s]),
+                "mean": float(mean[s]),
+                "std": float(std[s]),
+                "min": float(vmin[s]),
+                "max": float(vmax[s]),
+            }
+            for q, v in zip(qs.tolist(), quant[s].tolist()):
+                summary[percentile_key(q)] = float(v)
+            per_metric[metric] = summary
+        summaries[group] = per_metric
+    return summaries
+
+
+# =====================================================================
+# OUTLIERS ROBUSTOS
+# =====================================================================
+
+def grouped_outliers(df, group_cols, metrics, mad_threshold=3.5, iqr_k=1.5, min_count=5):
+    """
+    Execuções atípicas de cada (grupo, métrica) em uma passada, por critérios
+    robustos que o próprio outlier não distorce
+
+    - MAD: z-score modificado 0.6745·(x - mediana)/MAD acima de mad_threshold
+      (Iglewicz-Hoaglin); com MAD = 0 usa o desvio absoluto médio × 1.2533
+    - IQR: fora das cercas de Tukey [q1 - k·IQR, q3 + k·IQR]
+
+    Medianas e quartis saem de uma ordenação dos segmentos (métrica, grupo)
+    empilhados, e a MAD de uma segunda ordenação dos desvios, como em
+    grouped_summaries. Grupos com menos de min_count valores não são marcados.
+
+    Returns:
+        {"score", "median", "mad", "iqr"}: arrays (linhas × métricas) com o
+        z-score modificado, a mediana do grupo e as marcas de cada critério
+    """
+    metrics = [m for m in metrics if m in df.columns]
+    n_rows, n_metrics = len(df), len(metrics)
+    result = {"score": np.full((n_rows, n_metrics), np.nan), "median": np.full((n_rows, n_metrics), np.nan),
+              "mad": np.zeros((n_rows, n_metrics), dtype=bool), "iqr": np.zeros((n_rows, n_metrics), dtype=bool)}
+    if df.empty or not metrics:
+        return result
+
+    group_cols = [c for c in group_cols if c in df.columns]
+    if group_cols:
+        codes = df.groupby(group_cols, observed=True, sort=False).ngroup().to_numpy(dtype=np.int64)
+    else:
+        codes = np.zeros(n_rows, dtype=np.int64)
+    n_groups = int(codes.max()) + 1 if (codes >= 0).any() else 0
+    keep = np.flatnonzero(codes >= 0)
+    if n_groups == 0:
+        return result
+
+    # Empilha as métricas: segmento (métrica, grupo) = métrica * n_groups + grupo
+    values = df[metrics].to_numpy(dtype=np.float64, na_value=np.nan)[keep].T.ravel()
+    segment = (np.arange(n_metrics)[:, None] * n_groups + codes[keep][None, :]).ravel()
+    n_segments = n_metrics * n_groups
+
+    nan = np.isnan(values)
+    rows = np.bincount(segment, minlength=n_segments)
+    valid = np.bincount(segment[~nan], minlength=n_segments)
+    starts = np.concatenate(([0], np.cumsum(rows)[:-1]))
+
+    order = np.lexsort((values, nan, segment))   # NaN no fim de cada segmento
+    q1, med, q3 = _segment_quantiles(values[order], starts, valid, np.array([0.25, 0.5, 0.75])).T
+
+    dev = np.abs(values - med[segment])
+    order = np.lexsort((dev, nan, segment))
+    mad = _segment_quantiles(dev[order], starts, valid, np.array([0.5]))[:, 0]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_ad = np.bincount(segment, weights=np.where(nan, 0.0, dev), minlength=n_segments) / valid
+        scale = np.where(mad > 0, mad / 0.6744897501960817, mean_ad * 1.2533141373155001)
+        score = (values - med[segment]) / scale[segment]
+        score = np.where(scale[segment] > 0, score, 0.0)
+        spread = iqr_k * (q3 - q1)
+        outside_iqr = (values < (q1 - spread)[segment]) | (values > (q3 + spread)[segment])
+
+    enough = (valid >= min_count)[segment] & ~nan
+    shape = (n_metrics, len(keep))
+    for key, data in (("score", np.where(~nan, score, np.nan)), ("median", med[segment]),
+                      ("mad", enough & (np.abs(score) > mad_threshold)), ("iqr", enough & outside_iqr)):
+        result[key][keep] = data.reshape(shape).T
+    return result
+
+
+# =====================================================================
+# SIGNIFICÂNCIA DAS DIFERENÇAS ENTRE VARIANTES
+# =====================================================================
+
+def _betacf(a, b, x, iterations=300, eps=1e-14):
+    """Fração contínua da beta incompleta (Lentz), vetorizada"""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = np.ones_like(x)
+    d = 1.0 - qab * x / qap
+    d = 1.0 / np.where(np.abs(d) < tiny, tiny, d)
+    h = d.copy()
+    for m in range(1, iterations + 1):
+        m2 = 2 * m
+        for aa in (m * (b - m) * x / ((qam + m2) * (a + m2)),
+                   -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))):
+            d = 1.0 + aa * d
+            d = 1.0 / np.where(np.abs(d) < tiny, tiny, d)
+            c = 1.0 + aa / c
+            c = np.where(np.abs(c) < tiny, tiny, c)
+            delta = d * c
+            h = h * delta
+        if np.all(np.abs(delta - 1.0) < eps):
+            break
+    return h
+
+
+def _betainc(a, b, x):
+    """Beta incompleta regularizada I_x(a, b) (elemento a elemento)"""
+    a, b, x = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (a, b, x)))
+    out = np.full(x.shape, np.nan)
+    inside = (x > 0) & (x < 1)
+    out[x <= 0] = 0.0
+    out[x >= 1] = 1.0
+    if inside.any():
+        ai, bi, xi = a[inside], b[inside], x[inside]
+        lgamma = np.vectorize(math.lgamma, otypes=[np.float64])
+        front = np.exp(lgamma(ai + bi) - lgamma(ai) - lgamma(bi) + ai * np.log(xi) + bi * np.log1p(-xi))
+        direct = xi < (ai + 1) / (ai + bi + 2)
+        out[inside] = np.where(direct,
+                               front * _betacf(ai, bi, xi) / ai,
+                               1.0 - front * _betacf(bi, ai, 1.0 - xi) / bi)
+    return out
+
+
+def student_t_two_sided_p(t, dof):
+    """p-valor bilateral da distribuição t de Student"""
+    t = np.asarray(t, dtype=np.float64)
+    dof = np.asarray(dof, dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return _betainc(dof / 2.0, 0.5, dof / (dof + t * t))
+
+
+def welch_p_value(n_a, mean_a, var_a, n_b, mean_b, var_b):
+    """
+    p-valor bilateral do teste t de Welch (variâncias diferentes, graus de
+    liberdade de Welch-Satterthwaite); arrays com broadcast, todos os pares
+    variante × métrica de uma vez
+    """
+    n_a, mean_a, var_a, n_b, mean_b, var_b = (np.asarray(v, dtype=np.float64)
+                                              for v in (n_a, mean_a, var_a, n_b, mean_b, var_b))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        se2_a, se2_b = var_a / n_a, var_b / n_b
+        t = (mean_b - mean_a) / np.sqrt(se2_a + se2_b)
+        dof = (se2_a + se2_b) ** 2 / (se2_a ** 2 / (n_a - 1) + se2_b ** 2 / (n_b - 1))
+    p = student_t_two_sided_p(t, dof)
+    # Médias idênticas sem variância: nenhuma diferença a detectar
+    return np.where((se2_a + se2_b == 0) & (mean_a == mean_b), 1.0, p)
+
+
+def bootstrap_means(values, n_boot, rng, max_elements=4_000_000):
+    """
+    Médias bootstrap de um grupo: (n_boot × métricas)
+
+    Uma única matriz de índices de reamostragem por grupo, compartilhada entre
+    as métricas (preserva a correlação entre elas); gerada em lotes para
+    limitar a memória em grupos grandes.
+    """
+    n, n_metrics = values.shape
+    out = np.empty((n_boot, n_metrics))
+    batch = max(1, max_elements // max(1, n * n_metrics))
+    mean = np.mean if not np.isnan(values).any() else np.nanmean
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # reamostra só com NaN
+        for start in range(0, n_boot, batch):
+            stop = min(n_boot, start + batch)
+            idx = rng.integers(0, n, size=(stop - start, n))
+            out[start:stop] = mean(values[idx], axis=1)
+    return out
+
+
+def compare_significance(df, group_col, base, others, metrics, n_boot=2000, confidence=0.95, seed=0,
+                         max_bootstrap_rows=5000):
+    """
+    Incerteza de diff_pct (média da variante vs média da base) para cada
+    variante × métrica: intervalo bootstrap percentil e teste t de Welch
+
+    Args:
+        df: Frame com as execuções
+        group_col: Coluna da variante
+        base: Variante de referência
+        others: Variantes comparadas com a base
+        metrics: Métricas
+        n_boot: Número de reamostragens bootstrap (0 = só o teste de Welch)
+        confidence: Nível de confiança do intervalo
+        seed: Semente do gerador (resultados reprodutíveis)
+        max_bootstrap_rows: Acima disso (base ou variante) o IC vem da
+            aproximação normal (método delta), equivalente para amostras
+            grandes e sem o custo de reamostrar o histórico inteiro
+
+    Returns:
+        {(variante, métrica): {"ci_low", "ci_high", "p_value", "significant", "n_base", "n"}}
+    """
+    metrics = [m for m in metrics if m in df.columns]
+    if df.empty or not metrics:
+        return {}
+
+    # Separa os grupos com uma ordenação estável (sem máscara por variante)
+    codes, groups = pd.factorize(df[group_col], sort=False)
+    values = df[metrics].to_numpy(dtype=np.float64, na_value=np.nan)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(groups) + 1))
+    index = {g: i for i, g in enumerate(groups)}
+    if base not in index:
+        return {}
+    others = [g for g in others if g in index and g != base]
+    if not others:
+        return {}
+
+    def rows(g):
+        i = index[g]
+        return values[order[bounds[i]:bounds[i + 1]]]
+
+    names = [base] + others
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        per_group = [rows(g) for g in names]
+        n = np.array([np.sum(~np.isnan(v), axis=0) for v in per_group], dtype=np.float64)
+        mean = np.array([np.nanmean(v, axis=0) for v in per_group])
+        var = np.array([np.nanvar(v, axis=0, ddof=1) for v in per_group])
+
+    p = welch_p_value(n[:1], mean[:1], var[:1], n[1:], mean[1:], var[1:])
+
+    alpha = 1.0 - confidence
+    ci = np.full((len(others), 2, len(metrics)), np.nan)
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    rng = np.random.default_rng(seed)
+    boot_base = None
+    for k, v in enumerate(per_group[1:]):
+        if len(v) < 2 or len(per_group[0]) < 2:
+            continue
+        if n_boot > 0 and max(len(v), len(per_group[0])) <= max_bootstrap_rows:
+            if boot_base is None:
+                boot_base = bootstrap_means(per_group[0], n_boot, rng)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                diff_pct = (bootstrap_means(v, n_boot, rng) - boot_base) / boot_base * 100.0
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                ci[k] = np.nanpercentile(diff_pct, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+        else:
+            # Método delta para a razão das médias: var(r) ≈ (se_v² + r²·se_b²) / mb²
+            with np.errstate(invalid="ignore", divide="ignore"):
+                ratio = mean[k + 1] / mean[0]
+                sd = np.sqrt(var[k + 1] / n[k + 1] + ratio ** 2 * var[0] / n[0]) / np.abs(mean[0])
+            ci[k] = [(ratio - 1 - z * sd) * 100.0, (ratio - 1 + z * sd) * 100.0]
+
+    results = {}
+    for k, g in enumerate(others):
+        for j, metric in enumerate(metrics):
+            results[(g, metric)] = {
+                "ci_low": float(ci[k, 0, j]),
+                "ci_high": float(ci[k, 1, j]),
+                "p_value": float(p[k, j]),
+                "significant": int(bool(p[k, j] < alpha)),
+                "n_base": int(n[0, j]),
+                "n": int(n[k + 1, j]),
+            }
+    return results
+
+
+def summary_significance(summaries, base, others, metrics, confidence=0.95):
+    """
+    Teste de Welch a partir de resumos já calculados (count, mean, std), como
+    os do modo --stream; sem as execuções não há bootstrap (IC = NaN)
+
+    Args:
+        summaries: {grupo: {métrica: {"count", "mean", "std", ...}}}
+
+    Returns:
+        Mesmo formato de compare_significance
+    """
+    if base not in summaries:
+        return {}
+    others = [g for g in others if g in summaries and g != base]
+    metrics = [m for m in metrics if m in summaries[base] and all(m in summaries[g] for g in others)]
+    if not others or not metrics:
+        return {}
+
+    names = [base] + others
+    n = np.array([[summaries[g][m]["count"] for m in metrics] for g in names], dtype=np.float64)
+    mean = np.array([[summaries[g][m]["mean"] for m in metrics] for g in names], dtype=np.float64)
+    var = np.array([[summaries[g][m]["std"] for m in metrics] for g in names], dtype=np.float64) ** 2
+    p = welch_p_value(n[:1], mean[:1], var[:1], n[1:], mean[1:], var[1:])
+
+    alpha = 1.0 - confidence
+    return {(g, metric): {"ci_low": float("nan"), "ci_high": float("nan"),
+                          "p_value": float(p[k, j]), "significant": int(bool(p[k, j] < alpha)),
+                          "n_base": int(n[0, j]), "n": int(n[k + 1, j])}
+            for k, g in enumerate(others) for j, metric in enumerate(metrics)}
+
+
+# =====================================================================
+# TAMANHO DE AMOSTRA
+# =====================================================================
+
+def runs_for_ci_width(std, mean, target_pct, confidence=0.95):
+    """
+    Execuções para que a meia-largura do IC da média fique em ±target_pct% da
+    média: n = (z·s / (w·|média|))²  (aproximação normal; arrays com broadcast)
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    std, mean = np.asarray(std, dtype=np.float64), np.asarray(mean, dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.ceil((z * std / (target_pct / 100.0 * np.abs(mean))) ** 2)
+
+
+def runs_for_effect(std_base, std_other, mean_base, mde_pct, confidence=0.95, power=0.8):
+    """
+    Execuções por variante para detectar uma diferença de mde_pct% da média da
+    base com o poder pedido (teste bilateral, variâncias diferentes):
+    n = (z_α/2 + z_β)² · (s_base² + s_outra²) / δ²
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2) + NormalDist().inv_cdf(power)
+    std_base, std_other, mean_base = (np.asarray(v, dtype=np.float64) for v in (std_base, std_other, mean_base))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        delta = mde_pct / 100.0 * np.abs(mean_base)
+        return np.ceil(z ** 2 * (std_base ** 2 + std_other ** 2) / delta ** 2)
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Metrics Store - Banco SQLite local com todos os benchmarks
+
+Um único banco atende todos os modelos. Os CSVs por modelo
+(StreamingAssets/Models/<modelo>/benchmark/benchmarks.csv) e o CSV legado
+(persistentDataPath/Benchmarks/benchmarks.csv) são importados de forma
+idempotente:
+
+- CSV inalterado desde a última importação (tamanho/mtime): nada é lido
+- CSV cresceu com o mesmo prefixo (append do Metrics.WriteCsv): só a cauda
+  nova passa pelo parser
+- CSV reescrito: parse completo; as linhas do arquivo substituem as da
+  versão anterior dele
+
+Cada execução é guardada uma vez (chave única timestamp, run_id,
+test_number, model, variant), mas a tabela run_sources registra todos os
+arquivos que a contêm: uma execução presente no CSV legado e no CSV do
+modelo só sai do banco quando nenhum dos dois a contém mais.
+
+Os índices (model, variant, timestamp) e (run_id, test_number) fazem os
+filtros dos reports virarem buscas no índice: as últimas N execuções de um
+grupo são uma leitura de intervalo, sem varrer o histórico.
+
+Uso:
+    python metrics_store.py --db metrics.sqlite --models-dir Assets/StreamingAssets/Models
+    python metrics_store.py --db metrics.sqlite --csv-files a.csv b.csv --legacy
+"""
+
+import io
+import os
+import sys
+import glob
+import sqlite3
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from metrics_ingest import (CANONICAL_COLUMNS, CATEGORY_COLUMNS, FLOAT_COLUMNS, parse_benchmark_csv,
+                            project_columns, csv_signature, is_runlog, read_runlog,
+                            _bytes_hasher, _prefix_anchors, _prefix_hasher, _read_complete_lines)
+
+# Configurações do banco
+STORE_CONFIG = {
+    "db_name": "metrics.sqlite",
+    "models_dir": "Models",          # MetricsConfig.MODELS_DIR_NAME
+    "benchmark_dir": "benchmark",    # MetricsConfig.BENCHMARK_DIR_NAME
+    "csv_name": "benchmarks.csv",    # MetricsConfig.CSV_FILENAME
+    "legacy_dir": "Benchmarks",      # MetricsConfig.BENCHMARKS_DIR_NAME
+}
+
+# Tipos SQLite das colunas canônicas (timestamp em µs, horário local do Unity)
+SQL_TYPES = {
+    "timestamp": "INTEGER NOT NULL",
+    "test_number": "INTEGER",
+    "fps_samples": "TEXT",
+    "ok": "INTEGER",
+    **{c: "TEXT" for c in CATEGORY_COLUMNS},
+    **{c: "REAL" for c in FLOAT_COLUMNS},
+}
+
+# Chave única de uma execução (a mesma linha pode vir de vários CSVs)
+RUN_KEY = ("timestamp", "run_id", "test_number", "model", "variant")
+
+SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    {", ".join(f"{c} {SQL_TYPES[c]}" for c in CANONICAL_COLUMNS)},
+    source TEXT,
+    UNIQUE (timestamp, run_id, test_number, model, variant)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_model_variant_ts ON runs (model, variant, timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_run_test ON runs (run_id, test_number);
+CREATE INDEX IF NOT EXISTS idx_runs_source ON runs (source);
+CREATE TABLE IF NOT EXISTS run_sources (
+    {", ".join(f"{c} {SQL_TYPES[c]}" for c in RUN_KEY)},
+    source TEXT NOT NULL,
+    PRIMARY KEY ({", ".join(RUN_KEY)}, source)
+);
+CREATE INDEX IF NOT EXISTS idx_run_sources_source ON run_sources (source);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER,
+    offset INTEGER,
+    header_hash TEXT,
+    prefix_hash TEXT
+);
+"""
+
+
+# =====================================================================
+# CAMINHOS
+# =====================================================================
+
+def discover_model_csvs(models_dir):
+    """CSVs por modelo: <Models>/<modelo>/benchmark/benchmarks.csv"""
+    pattern = os.path.join(models_dir, "*", STORE_CONFIG["benchmark_dir"], STORE_CONFIG["csv_name"])
+    return sorted(glob.glob(pattern))
+
+
+def legacy_csv_path(persistent_data_path):
+    """CSV legado do fallback: persistentDataPath/Benchmarks/benchmarks.csv"""
+    return os.path.join(persistent_data_path, STORE_CONFIG["legacy_dir"], STORE_CONFIG["csv_name"])
+
+
+def default_persistent_data_path(project_root):
+    """
+    Application.persistentDataPath do projeto (companyName/productName do
+    ProjectSettings.asset), nos locais padrão do Unity para cada plataforma
+    """
+    settings = {}
+    try:
+        with open(os.path.join(project_root, "ProjectSettings", "ProjectSettings.asset"), encoding="utf-8") as f:
+            for line in f:
+                key, _, value = line.strip().partition(":")
+                if key in ("companyName", "productName") and key not in settings:
+                    settings[key] = value.strip()
+    except OSError:
+        return None
+    if len(settings) < 2:
+        return None
+
+    company, product = settings["companyName"], settings["productName"]
+    if sys.platform.startswith("win"):
+        base = os.path.join(os.path.expanduser("~"), "AppData", "LocalLow")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Application Support")
+    else:
+        base = os.path.join(os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config")), "unity3d")
+    return os.path.join(base, company, product)
+
+
+# =====================================================================
+# CONVERSÃO FRAME <-> SQL
+# =====================================================================
+
+def _to_rows(df, source):
+    """Linhas para INSERT (NA -> NULL) na ordem canônica + source"""
+    out = {}
+    for col in CANONICAL_COLUMNS:
+        s = df[col]
+        if col == "timestamp":
+            out[col] = s.to_numpy(dtype="datetime64[us]").astype(np.int64).tolist()
+        elif col in FLOAT_COLUMNS:
+            values = s.to_numpy(dtype=np.float64, na_value=np.nan)
+            out[col] = [None if v != v else v for v in values.tolist()]
+        else:
+            out[col] = s.astype(object).where(s.notna(), None).tolist()
+    out["ok"] = [None if v is None else int(v) for v in out["ok"]]
+    out["source"] = [source] * len(df)
+    return list(zip(*out.values()))
+
+
+def _parse_csv_bytes(data):
+    return parse_benchmark_csv(io.BytesIO(data))
+
+
+def _to_frame(rows, columns):
+    """Resultado de uma consulta -> frame com os dtypes do parse_benchmark_csv"""
+    df = pd.DataFrame.from_records(rows, columns=list(columns))
+    for col in columns:
+        if col == "timestamp":
+            df[col] = df[col].to_numpy(dtype=np.int64).astype("datetime64[us]")
+        elif col in CATEGORY_COLUMNS:
+            df[col] = df[col].astype("category")
+        elif col in FLOAT_COLUMNS:
+            df[col] = df[col].astype(np.float32)
+        elif col == "test_number":
+            df[col] = df[col].astype("Int32")
+        elif col == "ok":
+            df[col] = df[col].astype("boolean")
+        elif col == "fps_samples":
+            df[col] = df[col].astype("string")
+    return df
+
+
+# =====================================================================
+# BANCO
+# =====================================================================
+
+class MetricsStore:
+    """Banco SQLite de benchmarks com importação idempotente e consultas dos reports"""
+    def __init__(self, db_path):
+        self.db_path = db_path
+        parent = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(parent, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA_SQL)
+        self._backfill_run_sources()
+
+    def _backfill_run_sources(self):
+        """Bancos anteriores à run_sources: cada execução pertence à sua coluna source"""
+        if self.conn.execute("SELECT 1 FROM run_sources LIMIT 1").fetchone() is not None:
+            return
+        key = ", ".join(RUN_KEY)
+        with self.conn:
+            self.conn.execute(f"INSERT OR IGNORE INTO run_sources ({key}, source) "
+                              f"SELECT {key}, source FROM runs WHERE source IS NOT NULL")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    # ----------------------------------------------------------------
+    # Importação
+    # ----------------------------------------------------------------
+
+    def _insert(self, df, source, update=False):
+        """
+        Insere as execuções e registra `source` como dono de todas elas
+
+        update=True (arquivo reescrito): execuções que já existem recebem os
+        valores do arquivo; senão são mantidas como estão.
+
+        Returns:
+            Número de execuções novas no banco
+        """
+        if df.empty:
+            return 0
+        rows = _to_rows(df, source)
+        columns = list(CANONICAL_COLUMNS) + ["source"]
+        placeholders = ", ".join("?" * len(columns))
+        if update:
+            values = [c for c in CANONICAL_COLUMNS if c not in RUN_KEY]
+            conflict = (f"ON CONFLICT ({', '.join(RUN_KEY)}) DO UPDATE SET "
+                        + ", ".join(f"{c} = excluded.{c}" for c in values))
+        else:
+            conflict = "ON CONFLICT DO NOTHING"
+        last = self.conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM runs").fetchone()[0]
+        self.conn.executemany(
+            f"INSERT INTO runs ({', '.join(columns)}) VALUES ({placeholders}) {conflict}", rows)
+
+        key_index = [columns.index(c) for c in RUN_KEY]
+        self.conn.executemany(
+            f"INSERT OR IGNORE INTO run_sources ({', '.join(RUN_KEY)}, source) "
+            f"VALUES ({', '.join('?' * (len(RUN_KEY) + 1))})",
+            [tuple(row[i] for i in key_index) + (source,) for row in rows])
+        return self.conn.execute("SELECT COUNT(*) FROM runs WHERE rowid > ?", (last,)).fetchone()[0]
+
+    def _drop_source(self, source):
+        """Tira `source` de todas as execuções (a reimportação registra de novo as que ele ainda contém)"""
+        self.conn.execute("DELETE FROM run_sources WHERE source = ?", (source,))
+
+    def _delete_orphans(self):
+        """Remove as execuções que nenhum arquivo contém mais"""
+        match = " AND ".join(f"s.{c} IS runs.{c}" for c in RUN_KEY)
+        self.conn.execute(f"DELETE FROM runs WHERE NOT EXISTS (SELECT 1 FROM run_sources s WHERE {match})")
+
+    def _save_source(self, path, offset, hasher=None):
+        sig = csv_signature(path, offset, hasher)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sources (path, size, mtime_ns, offset, header_hash, prefix_hash) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (sig["path"], sig["size"], sig["mtime_ns"], offset, sig["header_hash"], sig["prefix_hash"]))
+
+    def import_csv(self, csv_path):
+        """
+        Importa um CSV de benchmark (ou run log); reimportar não duplica linhas
+
+        Append: só a cauda nova é inserida. Arquivo reescrito (prefixo mudou,
+        ex.: upsert de linhas) ou run log: o arquivo deixa de ser dono das
+        execuções da versão anterior e as atuais são inseridas/atualizadas na
+        mesma transação; execuções que saíram do arquivo só saem do banco se
+        nenhum outro arquivo importado ainda as contém.
+
+        Returns:
+            Número de linhas inseridas
+        """
+        path = os.path.abspath(csv_path)
+        st = os.stat(path)
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, offset, header_hash, prefix_hash FROM sources WHERE path = ?",
+            (path,)).fetchone()
+
+        if row is not None and st.st_size == row[0] and st.st_mtime_ns == row[1]:
+            return 0
+
+        replace, hasher = True, None
+        if not is_runlog(path) and row is not None and st.st_size >= row[2]:
+            hasher = _prefix_hasher(path, row[2])
+        if is_runlog(path):
+            df, offset = read_runlog(path), st.st_size
+        elif (hasher is not None
+                and _prefix_anchors(path, row[2], hasher) == {"header_hash": row[3], "prefix_hash": row[4]}):
+            # Append: só a cauda nova passa pelo parser
+            with open(path, "rb") as f:
+                header = f.readline()
+            tail = _read_complete_lines(path, row[2])
+            df = _parse_csv_bytes(header + tail) if tail else None
+            offset = row[2] + len(tail)
+            hasher.update(tail)
+            replace = False
+        else:
+            data = _read_complete_lines(path, 0)
+            df, offset = _parse_csv_bytes(data), len(data)
+            hasher = _bytes_hasher(data)
+
+        with self.conn:
+            if replace:
+                self._drop_source(path)
+            inserted = self._insert(df, path, update=replace) if df is not None else 0
+            if replace:
+                self._delete_orphans()
+            self._save_source(path, offset, hasher)
+        return inserted
+
+    def import_csvs(self, csv_paths):
+        """
+        Importa vários CSVs
+
+        Returns:
+            (linhas inseridas, lista de (caminho, exceção))
+        """
+        total, failures = 0, []
+        for path in csv_paths:
+            try:
+                n = self.import_csv(path)
+                total += n
+                if n:
+                    print(f"[py] ✓ {path}: +{n} execuções no banco")
+            except Exception as e:
+                failures.append((path, e))
+        return total, failures
+
+    # ----------------------------------------------------------------
+    # Consultas
+    # ----------------------------------------------------------------
+
+    def models(self):
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT model FROM runs ORDER BY model")]
+
+    def _where(self, model, variants):
+        clauses, params = [], []
+        if model != "all":
+            clauses.append("model = ?")
+            params.append(model)
+        if variants:
+            clauses.append(f"variant IN ({', '.join('?' * len(variants))})")
+            params.extend(variants)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query_scope(self, model, variants, last_n, columns=None):
+        """
+        Equivalente a filter_scope: execuções de model/variants, as últimas N por
+        (model, variant) quando last_n > 0 (uma busca por grupo no índice);
+        last_n <= 0 devolve o histórico completo
+
+        Returns:
+            Frame canônico (só `columns`) ordenado por timestamp
+        """
+        columns = project_columns(columns)
+        select = ", ".join(columns)
+        if last_n > 0:
+            models = [model] if model != "all" else self.models()
+            rows = []
+            for m in models:
+                for v in variants:
+                    rows += self.conn.execute(
+                        f"SELECT {select} FROM (SELECT {select} FROM runs WHERE model = ? AND variant = ? "
+                        f"ORDER BY timestamp DESC LIMIT ?) ORDER BY timestamp",
+                        (m, v, last_n)).fetchall()
+        else:
+            where, params = self._where(model, variants)
+            rows = self.conn.execute(f"SELECT {select} FROM runs{where}", params).fetchall()
+        df = _to_frame(rows, columns)
+        return df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+    def aggregate_scope(self, model, variants, metrics):
+        """
+        Médias por (model, variant) calculadas no SQLite (formato do
+        compute_aggregates antes dos ganhos, com a contagem em 'samples')
+        """
+        where, params = self._where(model, variants)
+        select = ", ".join(f"AVG({m}) AS {m}" for m in metrics)
+        rows = self.conn.execute(
+            f"SELECT model, variant, {select}, COUNT(*) AS samples FROM runs{where} "
+            f"GROUP BY model, variant ORDER BY model, variant", params).fetchall()
+        return pd.DataFrame.from_records(rows, columns=["model", "variant"] + list(metrics) + ["samples"])
+
+
+# =====================================================================
+# CLI DE IMPORTAÇÃO
+# =====================================================================
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Importa os CSVs de benchmark para o banco SQLite")
+    ap.add_argument("--db", required=True, help="Caminho do banco SQLite")
+    ap.add_argument("--csv-files", nargs='*', default=[], help="Lista de caminhos para os arquivos CSV")
+    ap.add_argument("--models-dir", default=None, help="Pasta StreamingAssets/Models (importa todos os modelos)")
+    ap.add_argument("--legacy", action="store_true", help="Inclui o CSV legado de persistentDataPath/Benchmarks")
+    ap.add_argument("--persistent-data-path", default=None,
+                    help="persistentDataPath do Unity (padrão: deduzido do ProjectSettings)")
+    ap.add_argument("--project-root", default=None, help="Raiz do projeto Unity (para deduzir o persistentDataPath)")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    paths = list(args.csv_files)
+    if args.models_dir:
+        paths += discover_model_csvs(args.models_dir)
+    if args.legacy:
+        pdp = args.persistent_data_path or default_persistent_data_path(args.project_root or os.getcwd())
+        legacy = legacy_csv_path(pdp) if pdp else None
+        if legacy and os.path.exists(legacy):
+            paths.append(legacy)
+        else:
+            print(f"[py] ⚠️ CSV legado não encontrado: {legacy}")
+
+    if not paths:
+        print("[py] ❌ Nenhum CSV para importar")
+        return 1
+
+    with MetricsStore(args.db) as store:
+        total, failures = store.import_csvs(paths)
+        for path, e in failures:
+            print(f"[py] ❌ Erro ao importar {path}: {e}")
+        n = store.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+    print(f"[py] ✓ {total} execuções novas; {n} no banco ({args.db})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Metrics Stream - Agregação em memória limitada para históricos grandes
+
+Usado pelo modo --stream dos reports. O CSV é lido em blocos (sempre
+terminando em fim de linha) e cada bloco passa pelo mesmo parser tipado do
+metrics_ingest. Nenhum momento o histórico completo fica em memória:
+
+- StreamingAggregator: acumuladores por grupo (model, variant) mescláveis
+  entre blocos — contagem, média/M2 (Chan), mínimo, máximo e um sketch de
+  quantis com erro relativo limitado
+- TailBuffer: mantém apenas as últimas N linhas (por grupo ou no total)
+"""
+
+import io
+import math
+
+import numpy as np
+import pandas as pd
+
+from metrics_ingest import parse_benchmark_csv, concat_frames, is_runlog
+
+# Configurações do modo streaming
+STREAM_CONFIG = {
+    "chunk_mb": 64,                  # tamanho de cada bloco lido do CSV
+    "relative_accuracy": 0.005,      # erro relativo máximo dos quantis (0.5%)
+}
+
+
+# =====================================================================
+# LEITURA EM BLOCOS
+# =====================================================================
+
+def iter_csv_chunks(csv_path, chunk_mb=None, columns=None):
+    """
+    Lê um CSV de benchmark (ou run log) em blocos e devolve frames canônicos
+
+    Args:
+        csv_path: Caminho do CSV
+        chunk_mb: Tamanho aproximado de cada bloco em MB
+        columns: Projeção de colunas (None = todas)
+
+    Yields:
+        DataFrame canônico de cada bloco
+    """
+    chunk_bytes = int((chunk_mb or STREAM_CONFIG["chunk_mb"]) * 1024 * 1024)
+    if is_runlog(csv_path):
+        from metrics_runlog import RunLog
+        with RunLog(csv_path) as log:
+            rows = max(1, chunk_bytes // log.records.dtype.itemsize)
+            for start in range(0, len(log), rows):
+                yield log.to_frame(columns, start, start + rows)
+        return
+
+    with open(csv_path, "rb") as f:
+        first = f.readline()
+        header = first if first.lstrip(b"\xef\xbb\xbf").startswith(b"timestamp,") else b""
+        pending = b"" if header else first
+        while True:
+            block = f.read(chunk_bytes)
+            if block and not block.endswith(b"\n"):
+                block += f.readline()  # completa a última linha do bloco
+            block = pending + block
+            pending = b""
+            if not block:
+                break
+            yield parse_benchmark_csv(io.BytesIO(header + block), columns=columns)
+
+
+# =====================================================================
+# SKETCH DE QUANTIS
+# =====================================================================
+
+class QuantileSketch:
+    """
+    Sketch de quantis com erro relativo limitado (buckets logarítmicos, estilo DDSketch)
+
+    O estado é um histograma esparso {bucket: contagem}, então dois sketches
+    se mesclam somando contagens. Valores <= 0 vão para um bucket zero separado.
+    """
+    def __init__(self, relative_accuracy=None):
+        alpha = relative_accuracy or STREAM_CONFIG["relative_accuracy"]
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        positive = values[values > 0]
+        self.zero_count += int(len(values) - len(positive))
+        self.count += int(len(values))
+        if len(positive):
+            keys, counts = np.unique(np.ceil(np.log(positive) / self.log_gamma).astype(np.int64),
+                                     return_counts=True)
+            for k, c in zip(keys.tolist(), counts.tolist()):
+                self.buckets[k] = self.buckets.get(k, 0) + c
+
+    def merge(self, other):
+        for k, c in other.buckets.items():
+            self.buckets[k] = self.buckets.get(k, 0) + c
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def _value_at_rank(self, keys, cum, rank):
+        """Valor representativo do bucket que contém a amostra de ordem `rank`"""
+        if rank < self.zero_count:
+            return 0.0
+        i = min(int(np.searchsorted(cum[1:], rank, side="right")), len(keys) - 1)
+        return float(2 * self.gamma ** keys[i] / (self.gamma + 1))
+
+    def quantiles(self, qs):
+        """Quantis aproximados (mesma convenção do pandas: interpolação em q * (n - 1))"""
+        if self.count == 0:
+            return [float("nan")] * len(qs)
+        keys = np.array(sorted(self.buckets), dtype=np.int64)
+        counts = np.array([self.buckets[k] for k in keys], dtype=np.int64)
+        cum = np.concatenate(([self.zero_count], self.zero_count + np.cumsum(counts)))
+        result = []
+        for q in qs:
+            rank = q * (self.count - 1)
+            lo, hi = math.floor(rank), math.ceil(rank)
+            v_lo = self._value_at_rank(keys, cum, lo)
+            v_hi = self._value_at_rank(keys, cum, hi) if hi != lo else v_lo
+            result.append(v_lo + (v_hi - v_lo) * (rank - lo))
+        return result
+
+
+# =====================================================================
+# ACUMULADORES
+# =====================================================================
+
+class MetricAccumulator:
+    """Estado mesclável de uma métrica em um grupo"""
+    def __init__(self, relative_accuracy=None):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def merge_moments(self, count, mean, m2, vmin, vmax):
+        """Combina momentos parciais (fórmula paralela de Chan)"""
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, vmin)
+        self.max = max(self.max, vmax)
+
+    def merge(self, other):
+        self.merge_moments(other.count, other.mean, other.m2, other.min, other.max)
+        self.sketch.merge(other.sketch)
+
+    def summary(self, percentiles=(0.25, 0.5, 0.75, 0.01, 0.99)):
+        """Resumo no formato do VariantStats (std com ddof=1, como o pandas)"""
+        if self.count == 0:
+            return None
+        qs = self.sketch.quantiles(percentiles)
+        # O sketch tem erro relativo; os extremos exatos limitam os quantis
+        qs = [min(max(v, self.min), self.max) for v in qs]
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0,
+            "min": self.min,
+            "max": self.max,
+            **{f"q{p}": v for p, v in zip(percentiles, qs)},
+        }
+
+
+class StreamingAggregator:
+    """Agregação por grupo alimentada bloco a bloco"""
+    def __init__(self, group_cols, metrics, relative_accuracy=None):
+        self.group_cols = list(group_cols)
+        self.metrics = list(metrics)
+        self.relative_accuracy = relative_accuracy
+        self.groups = {}   # chave do grupo -> {métrica: MetricAccumulator}
+        self.rows = {}     # chave do grupo -> número de linhas
+
+    def _key(self, key):
+        return key if isinstance(key, tuple) else (key,)
+
+    def update(self, chunk):
+        if chunk.empty:
+            return
+        metrics = [m for m in self.metrics if m in chunk.columns]
+        grouped = chunk.groupby(self.group_cols, observed=True)
+        for key, n in grouped.size().items():
+            key = self._key(key)
+            self.rows[key] = self.rows.get(key, 0) + int(n)
+
+        moments = grouped[metrics].agg(["count", "mean", "var", "min", "max"])
+        for key, row in moments.iterrows():
+            accs = self.groups.setdefault(self._key(key), {})
+            for m in metrics:
+                n = int(row[(m, "count")])
+                if n == 0:
+                    continue
+                var = row[(m, "var")] if n > 1 else 0.0
+                acc = accs.setdefault(m, MetricAccumulator(self.relative_accuracy))
+                acc.merge_moments(n, float(row[(m, "mean")]), float(var) * (n - 1),
+                                  float(row[(m, "min")]), float(row[(m, "max")]))
+
+        values = {m: chunk[m].to_numpy(dtype=np.float64, na_value=np.nan) for m in metrics}
+        for key, idx in grouped.indices.items():
+            accs = self.groups.setdefault(self._key(key), {})
+            for m in metrics:
+                accs.setdefault(m, MetricAccumulator(self.relative_accuracy)).sketch.add(values[m][idx])
+
+    def merge(self, other):
+        for key, n in other.rows.items():
+            self.rows[key] = self.rows.get(key, 0) + n
+        for key, accs in other.groups.items():
+            mine = self.groups.setdefault(key, {})
+            for m, acc in accs.items():
+                mine.setdefault(m, MetricAccumulator(self.relative_accuracy)).merge(acc)
+
+    def aggregate_frame(self):
+        """Tabela equivalente ao groupby(...).mean() do compute_aggregates + 'samples'"""
+        records = []
+        for key in sorted(self.rows):
+            rec = dict(zip(self.group_cols, key))
+            accs = self.groups.get(key, {})
+            for m in self.metrics:
+                acc = accs.get(m)
+                rec[m] = acc.mean if acc is not None and acc.count else np.nan
+            rec["samples"] = self.rows[key]
+            records.append(rec)
+        return pd.DataFrame(records, columns=self.group_cols + self.metrics + ["samples"])
+
+    def summaries(self, percentiles=None):
+        """{chave do grupo: {métrica: resumo}} para estatísticas detalhadas"""
+        kwargs = {"percentiles": percentiles} if percentiles is not None else {}
+        return {key: {m: acc.summary(**kwargs) for m, acc in accs.items() if acc.count}
+                for key, accs in self.groups.items()}
+
+
+# =====================================================================
+# ÚLTIMAS N LINHAS
+# =====================================================================
+
+class TailBuffer:
+    """Mantém apenas as N linhas mais recentes (por timestamp), por grupo ou no total"""
+    def __init__(self, last_n, group_cols=None):
+        self.last_n = last_n
+        self.group_cols = list(group_cols) if group_cols else None
+        self.frame = None
+
+    def update(self, chunk):
+        if chunk.empty:
+            return
+        frame = concat_frames([self.frame, chunk], chunk.columns) if self.frame is not None else chunk
+        frame = frame.sort_values("timestamp", kind="stable")
+        if self.group_cols:
+            frame = frame.groupby(self.group_cols, group_keys=False, observed=True).tail(self.last_n)
+        else:
+            frame = frame.tail(self.last_n)
+        self.frame = frame.reset_index(drop=True)
+
+    def result(self):
+        return self.frame if self.frame is not None else concat_frames([])
+
+
+def stream_csvs(csv_paths, consumers, row_filter=None, chunk_mb=None, columns=None):
+    """
+    Percorre todos os CSVs em blocos, entregando cada bloco aos consumidores
+
+    Args:
+        csv_paths: Lista de caminhos
+        consumers: Objetos com método update(chunk) (StreamingAggregator, TailBuffer)
+        row_filter: Função opcional (chunk) -> chunk filtrado
+        chunk_mb: Tamanho dos blocos
+        columns: Projeção de colunas (None = todas)
+
+    Returns:
+        (total de linhas lidas, lista de (caminho, exceção))
+    """
+    total, failures = 0, []
+    for path in csv_paths:
+        try:
+            for chunk in iter_csv_chunks(path, chunk_mb, columns):
+                total += len(chunk)
+                if row_filter is not None:
+                    chunk = row_filter(chunk)
+                for consumer in consumers:
+                    consumer.update(chunk)
+        except Exception as e:
+            failures.append((path, e))
+    return total, failures
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Metrics Trends - Tendências e pontos de mudança por grupo (model, variant)
+
+- grouped_trends: reta de mínimos quadrados de cada grupo × métrica em forma
+  fechada (somas por bincount), sem laço em Python por grupo
+- detect_change_points: segmentação binária sobre a estatística CUSUM de
+  mudança de média; aponta a primeira execução depois de cada mudança (ex.:
+  atualização do Unity ou do conversor que piorou load_ms ou FPS)
+"""
+
+import numpy as np
+import pandas as pd
+
+# Configurações da detecção de pontos de mudança
+TREND_CONFIG = {
+    "penalty": 3.0,       # ganho mínimo de uma divisão: penalty · log(n) · σ²
+    "min_segment": 3,     # execuções mínimas de cada lado de uma mudança
+    "max_change_points": 5,  # por grupo × métrica
+}
+
+
+def _sorted_groups(df, group_cols, order_col):
+    """Ordena por grupo e por order_col; devolve (frame ordenado, códigos, chaves, limites)"""
+    codes = np.zeros(len(df), dtype=np.int64)
+    keys = [()]
+    if group_cols:
+        codes = df.groupby(list(group_cols), observed=True, sort=False).ngroup().to_numpy(dtype=np.int64)
+        df = df[codes >= 0]          # chave com NA fica fora
+        codes = codes[codes >= 0]
+        _, first = np.unique(codes, return_index=True)
+        keys = list(zip(*(df[c].to_numpy()[first].tolist() for c in group_cols)))
+    order_values = df[order_col].to_numpy() if order_col in df.columns else np.arange(len(df))
+    order = np.lexsort((np.arange(len(df)), order_values, codes))
+    codes = codes[order]
+    bounds = np.searchsorted(codes, np.arange(len(keys) + 1))
+    return df.iloc[order], codes, keys, bounds
+
+
+def grouped_trends(df, group_cols, metrics, order_col="timestamp"):
+    """
+    Tendência linear de cada (grupo, métrica) em uma passada
+
+    x é a posição da execução dentro do grupo (0, 1, 2... na ordem de
+    order_col), como no polyfit sobre o índice; NaN são ignorados.
+
+    Returns:
+        {chave_do_grupo: {métrica: {"slope", "intercept", "count",
+        "first_value", "last_value", "total_change"}}}
+    """
+    metrics = [m for m in metrics if m in df.columns]
+    if df.empty or not metrics:
+        return {}
+
+    ordered, codes, keys, bounds = _sorted_groups(df, group_cols, order_col)
+    n_groups = len(keys)
+    x = (np.arange(len(ordered)) - bounds[codes]).astype(np.float64)
+    values = ordered[metrics].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    results = {key: {} for key in keys}
+    for j, metric in enumerate(metrics):
+        y = values[:, j]
+        valid = ~np.isnan(y)
+        c, xv, yv = codes[valid], x[valid], y[valid]
+
+        # Somas por grupo: n, Σx, Σy, Σx², Σxy
+        n = np.bincount(c, minlength=n_groups).astype(np.float64)
+        sx = np.bincount(c, weights=xv, minlength=n_groups)
+        sy = np.bincount(c, weights=yv, minlength=n_groups)
+        sxx = np.bincount(c, weights=xv * xv, minlength=n_groups)
+        sxy = np.bincount(c, weights=xv * yv, minlength=n_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            denom = n * sxx - sx * sx
+            slope = np.where(denom > 0, (n * sxy - sx * sy) / denom, np.nan)
+            intercept = np.where(n > 0, (sy - slope * sx) / n, np.nan)
+
+        # Primeiro e último valor válido de cada grupo
+        rows = np.flatnonzero(valid)
+        first = np.searchsorted(c, np.arange(n_groups), side="left")
+        last = np.searchsorted(c, np.arange(n_groups), side="right") - 1
+        has = n > 0
+        first_value = np.where(has, y[rows[np.minimum(first, len(rows) - 1)]] if len(rows) else np.nan, np.nan)
+        last_value = np.where(has, y[rows[np.maximum(last, 0)]] if len(rows) else np.nan, np.nan)
+
+        for g, key in enumerate(keys):
+            if n[g] < 2:
+                continue
+            results[key][metric] = {
+                "slope": float(slope[g]),
+                "intercept": float(intercept[g]),
+                "count": int(n[g]),
+                "first_value": float(first_value[g]),
+                "last_value": float(last_value[g]),
+                "total_change": float(last_value[g] - first_value[g]),
+            }
+    return {key: per_metric for key, per_metric in results.items() if per_metric}
+
+
+def _noise_variance(y):
+    """σ² robusto a partir das diferenças sucessivas (MAD), insensível às próprias mudanças"""
+    if len(y) < 3:
+        return float(np.var(y))
+    diffs = np.abs(np.diff(y))
+    sigma = np.median(diffs) / (0.6744897501960817 * np.sqrt(2.0))
+    if sigma == 0:
+        sigma = np.std(diffs) / np.sqrt(2.0)
+    return float(sigma * sigma)
+
+
+def detect_change_points(y, penalty=None, min_segment=None, max_points=None):
+    """
+    Mudanças de média numa série (segmentação binária)
+
+    Em cada segmento [s, e) o ganho de dividir em k é a estatística CUSUM
+    (k - s)(e - k)/(e - s) · (média_esq - média_dir)², calculada para todos os
+    k de uma vez a partir da soma acumulada. A melhor divisão é aceita se o
+    ganho passar de penalty · log(n) · σ².
+
+    Returns:
+        Lista ordenada de (índice da primeira execução depois da mudança,
+        média antes, média depois), com médias do segmento vizinho
+    """
+    penalty = TREND_CONFIG["penalty"] if penalty is None else penalty
+    min_segment = TREND_CONFIG["min_segment"] if min_segment is None else min_segment
+    max_points = TREND_CONFIG["max_change_points"] if max_points is None else max_points
+
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n < 2 * min_segment:
+        return []
+    threshold = penalty * np.log(n) * _noise_variance(y)
+    if threshold <= 0:
+        threshold = np.finfo(np.float64).tiny
+    csum = np.concatenate(([0.0], np.cumsum(y)))
+
+    splits = []
+    pending = [(0, n)]
+    while pending and len(splits) < max_points:
+        best = None
+        for s, e in pending:
+            k = np.arange(s + min_segment, e - min_segment + 1)
+            if len(k) == 0:
+                continue
+            left = (csum[k] - csum[s]) / (k - s)
+            right = (csum[e] - csum[k]) / (e - k)
+            gain = (k - s) * (e - k) / (e - s) * (left - right) ** 2
+            i = int(np.argmax(gain))
+            if gain[i] > threshold and (best is None or gain[i] > best[0]):
+                best = (gain[i], int(k[i]), s, e)
+        if best is None:
+            break
+        _, k, s, e = best
+        splits.append(k)
+        pending.remove((s, e))
+        pending += [(s, k), (k, e)]
+
+    bounds = [0] + sorted(splits) + [n]
+    return [(bounds[i], float((csum[bounds[i]] - csum[bounds[i - 1]]) / (bounds[i] - bounds[i - 1])),
+             float((csum[bounds[i + 1]] - csum[bounds[i]]) / (bounds[i + 1] - bounds[i])))
+            for i in range(1, len(bounds) - 1)]
+
+
+def _json_value(v):
+    """Valor de uma coluna informativa (timestamp, run_id...) pronto para JSON"""
+    if v is None or v is pd.NA or v is pd.NaT or (isinstance(v, float) and np.isnan(v)):
+        return None
+    if isinstance(v, pd.Timestamp):
+        return v.isoformat()
+    if isinstance(v, (int, float, str)):
+        return v
+    return str(v)
+
+
+def grouped_change_points(df, group_cols, metrics, order_col="timestamp", info_cols=("run_id", "test_number"),
+                          **options):
+    """
+    Pontos de mudança de cada (grupo, métrica)
+
+    Returns:
+        {chave_do_grupo: {métrica: [{"index", order_col, *info_cols, "before",
+        "after", "shift", "shift_pct"}]}}; só grupos/métricas com mudanças
+    """
+    metrics = [m for m in metrics if m in df.columns]
+    if df.empty or not metrics:
+        return {}
+
+    ordered, _, keys, bounds = _sorted_groups(df, group_cols, order_col)
+    info_cols = [c for c in (order_col,) + tuple(info_cols) if c in ordered.columns]
+    info = {c: ordered[c].tolist() for c in info_cols}
+    values = ordered[metrics].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    results = {}
+    for g, key in enumerate(keys):
+        start, stop = bounds[g], bounds[g + 1]
+        for j, metric in enumerate(metrics):
+            y = values[start:stop, j]
+            rows = np.flatnonzero(~np.isnan(y))
+            points = []
+            for k, before, after in detect_change_points(y[rows], **options):
+                row = start + rows[k]
+                point = {"index": int(rows[k])}
+                for c in info_cols:
+                    point[c] = _json_value(info[c][row])
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    shift_pct = (after - before) / before * 100.0 if before != 0 else float("nan")
+                point.update(before=before, after=after, shift=after - before, shift_pct=float(shift_pct))
+                points.append(point)
+            if points:
+                results.setdefault(key, {})[metric] = points
+    return results
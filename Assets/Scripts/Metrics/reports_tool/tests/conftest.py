@@ -0,0 +1,32 @@
+"""
+Fixtures dos testes do reports_tool
+
+Os módulos do reports_tool se importam pelo nome (from metrics_ingest import
+...), então a pasta pai entra no sys.path. Rodar com:
+
+    python -m pytest Assets/Scripts/Metrics/reports_tool/tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CSV_HEADER = ("timestamp,run_id,test_number,platform,unity_version,scene,model,variant,file_mb,load_ms,"
+              "mem_mb,fps_avg,fps_min,fps_max,fps_median,fps_1pc_low,fps_samples,fps_window_s,ok")
+
+
+def bench_line(i, model="suzanne", variant="original", scene="ModelViewer", fps=60.0):
+    """Uma linha V3 como o Metrics.WriteCsv grava (strings entre aspas)"""
+    minute, second = divmod(i, 60)
+    return (f'2025-10-15T{10 + minute // 60:02d}:{minute % 60:02d}:{second:02d}-03:00,"20251015_191027",{i + 1},'
+            f'"LinuxEditor","6000.2.4f1","{scene}","{model}","{variant}",0.019,56.084,389.23,'
+            f'{fps:.2f},50.27,69.92,60.12,56.64,"{fps:.2f};61.5;59",5,true')
+
+
+def write_csv(path, lines, header=True):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if header:
+            f.write(CSV_HEADER + "\n")
+        f.writelines(line + "\n" for line in lines)
+    return str(path)
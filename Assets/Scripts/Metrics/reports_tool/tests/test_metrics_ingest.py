@@ -0,0 +1,81 @@
+import os
+
+import pandas as pd
+
+from conftest import bench_line, write_csv
+from metrics_ingest import load_benchmark_csv, parse_benchmark_csv
+
+# Bem mais que 128KB: a edição no meio fica longe dos primeiros e dos últimos 64KB
+N_LINES = 2000
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def _assert_cache_matches_parse(path):
+    cached = load_benchmark_csv(path)
+    pd.testing.assert_frame_equal(cached.reset_index(drop=True), parse_benchmark_csv(path).reset_index(drop=True),
+                                  check_categorical=False)
+    return cached
+
+
+def test_append_parses_only_the_tail(tmp_path, capsys):
+    lines = [bench_line(i) for i in range(N_LINES)]
+    path = write_csv(tmp_path / "benchmarks.csv", lines)
+    load_benchmark_csv(path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(bench_line(N_LINES, variant="draco") + "\n")
+
+    df = _assert_cache_matches_parse(path)
+    assert len(df) == N_LINES + 1
+    assert "Cache incremental" in capsys.readouterr().out
+
+
+def test_same_size_rewrite_mid_file_is_detected(tmp_path, capsys):
+    lines = [bench_line(i) for i in range(N_LINES)]
+    path = write_csv(tmp_path / "benchmarks.csv", lines)
+    assert os.path.getsize(path) > 4 * 65536
+    load_benchmark_csv(path)
+
+    mid = N_LINES // 2
+    lines[mid] = bench_line(mid, fps=30.0)
+    write_csv(path, lines)
+    _bump_mtime(path)
+
+    df = _assert_cache_matches_parse(path)
+    assert df["fps_avg"].iloc[mid] == 30.0
+    out = capsys.readouterr().out
+    assert "mesmo tamanho e mtime novo" in out
+    assert "CSV reescrito" in out
+
+
+def test_touch_without_changes_keeps_cache(tmp_path, capsys):
+    path = write_csv(tmp_path / "benchmarks.csv", [bench_line(i) for i in range(10)])
+    load_benchmark_csv(path)
+    _bump_mtime(path)
+
+    _assert_cache_matches_parse(path)
+    assert "conteúdo inalterado" in capsys.readouterr().out
+
+
+def test_truncation_is_detected(tmp_path, capsys):
+    lines = [bench_line(i) for i in range(N_LINES)]
+    path = write_csv(tmp_path / "benchmarks.csv", lines)
+    load_benchmark_csv(path)
+    write_csv(path, lines[:N_LINES // 3])
+
+    df = _assert_cache_matches_parse(path)
+    assert len(df) == N_LINES // 3
+    assert "CSV reescrito" in capsys.readouterr().out
+
+
+def test_quoted_comma_does_not_drop_the_row(tmp_path):
+    lines = [bench_line(0), bench_line(1, scene="Level, 1"), bench_line(2)]
+    path = write_csv(tmp_path / "benchmarks.csv", lines)
+
+    df = parse_benchmark_csv(path)
+    assert len(df) == 3
+    assert df["scene"].tolist() == ["ModelViewer", "Level, 1", "ModelViewer"]
+    assert df["fps_avg"].notna().all()
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from conftest import bench_line, write_csv
+from fps_samples import decode_fps_samples
+from metrics_ingest import parse_benchmark_csv
+from metrics_runlog import RunLog, append_runlog, read_runlog, write_runlog
+
+
+def _csv_frame(tmp_path, n=50):
+    lines = [bench_line(i, model="ab"[i % 2], variant=("original", "draco")[i % 3 == 0], fps=55 + i % 9)
+             for i in range(n)]
+    return parse_benchmark_csv(write_csv(tmp_path / "benchmarks.csv", lines))
+
+
+def _assert_same(out, expected):
+    out, expected = out.reset_index(drop=True), expected.reset_index(drop=True)
+    pd.testing.assert_frame_equal(out.drop(columns="fps_samples"), expected.drop(columns="fps_samples"),
+                                  check_categorical=False)
+    # Os valores voltam iguais; só a formatação do texto pode mudar ("61.0" -> "61")
+    a, b = decode_fps_samples(out["fps_samples"]), decode_fps_samples(expected["fps_samples"])
+    np.testing.assert_array_equal(a.offsets, b.offsets)
+    np.testing.assert_array_equal(a.values.astype(np.float32), b.values.astype(np.float32))
+
+
+def test_write_append_read_round_trip(tmp_path):
+    df = _csv_frame(tmp_path)
+    path = str(tmp_path / "benchmarks.runlog")
+    write_runlog(path, df.iloc[:30])
+    append_runlog(path, df.iloc[30:45])
+    append_runlog(path, df.iloc[45:])
+
+    _assert_same(read_runlog(path), df)
+
+
+def test_numeric_columns_are_views_of_the_mmap(tmp_path):
+    path = str(tmp_path / "benchmarks.runlog")
+    write_runlog(path, _csv_frame(tmp_path))
+
+    with RunLog(path) as log:
+        df = log.to_frame(["timestamp", "fps_avg", "load_ms"])
+        for col in ("timestamp", "fps_avg", "load_ms"):
+            assert np.shares_memory(df[col].to_numpy(), log.column(col))
@@ -0,0 +1,55 @@
+import os
+
+from conftest import bench_line, write_csv
+from metrics_store import MetricsStore
+
+
+def _lines(model, n, start=0):
+    return [bench_line(start + i, model=model) for i in range(n)]
+
+
+def test_shared_rows_survive_rewrite_of_one_source(tmp_path):
+    rows_a, rows_b = _lines("a", 72), _lines("b", 10, start=100)
+    legacy = write_csv(tmp_path / "legacy.csv", rows_a + rows_b)
+    model_a = write_csv(tmp_path / "model_a.csv", rows_a)
+
+    with MetricsStore(str(tmp_path / "m.sqlite")) as store:
+        store.import_csvs([legacy, model_a])
+        write_csv(legacy, rows_b + _lines("b", 1, start=200))
+        _, failures = store.import_csvs([legacy, model_a])
+
+        assert failures == []
+        assert len(store.query_scope("a", ["original"], 0)) == 72
+        assert len(store.query_scope("b", ["original"], 0)) == 11
+
+
+def test_rows_removed_from_every_source_leave_the_db(tmp_path):
+    path = write_csv(tmp_path / "a.csv", _lines("a", 20))
+    with MetricsStore(str(tmp_path / "m.sqlite")) as store:
+        store.import_csv(path)
+        write_csv(path, _lines("a", 15))
+        store.import_csv(path)
+        assert len(store.query_scope("a", ["original"], 0)) == 15
+
+
+def test_rewrite_updates_values(tmp_path):
+    path = write_csv(tmp_path / "a.csv", [bench_line(0, model="a", fps=60.0)])
+    with MetricsStore(str(tmp_path / "m.sqlite")) as store:
+        store.import_csv(path)
+        write_csv(path, [bench_line(0, model="a", fps=30.0), bench_line(1, model="a")])
+        assert store.import_csv(path) == 1
+        df = store.query_scope("a", ["original"], 0)
+        assert df["fps_avg"].tolist() == [30.0, 60.0]
+
+
+def test_same_size_rewrite_mid_file_is_reimported(tmp_path):
+    lines = _lines("a", 2000)
+    path = write_csv(tmp_path / "a.csv", lines)
+    with MetricsStore(str(tmp_path / "m.sqlite")) as store:
+        store.import_csv(path)
+        lines[1000] = bench_line(1000, model="a", fps=30.0)
+        write_csv(path, lines)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        store.import_csv(path)
+        assert store.query_scope("a", ["original"], 0)["fps_avg"].iloc[1000] == 30.0